@@ -8,7 +8,7 @@ from datetime import datetime
 # 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from modules.search_engine import NaverPlaceSearchEngine
-from modules.data_manager import DataManager
+from modules.streamlit_cache import get_data_manager, get_result_cache
 
 # 로깅 설정
 logging.basicConfig(
@@ -17,9 +17,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# 데이터 관리자 초기화
-data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
-data_manager = DataManager(data_dir)
+# 데이터 관리자 (재실행 사이에 공유, 파일이 바뀔 때만 다시 읽음)
+data_manager = get_data_manager()
 
 def run_search(keyword, shop_name):
     """
@@ -34,9 +33,12 @@ def run_search(keyword, shop_name):
     """
     st.info(f"'{keyword}'에서 '{shop_name}' 검색 중... 잠시만 기다려주세요.")
     
-    # 검색 엔진 초기화 및 검색 실행
-    search_engine = NaverPlaceSearchEngine()
-    result = search_engine.search(keyword, shop_name)
+    # 검색 엔진 초기화 및 검색 실행 (종료 시 학습한 상태 저장)
+    with NaverPlaceSearchEngine(
+        state_file=os.path.join(data_manager.data_dir, 'search_engine_state.json'),
+        cache=get_result_cache()
+    ) as search_engine:
+        result = search_engine.search(keyword, shop_name)
     
     # 검색 결과 저장
     if result["success"]:
@@ -44,13 +46,21 @@ def run_search(keyword, shop_name):
         company_id = data_manager.add_company(shop_name)
         keyword_id = data_manager.add_keyword(keyword)
         
-        # 검색 결과 저장
-        data_manager.add_search_result(
+        # 검색 결과 저장 (캐시된 결과가 이미 기록되어 있으면 중복 저장하지 않음)
+        already_saved = result.get("cached") and not data_manager.get_search_results(
             company_id=company_id,
             keyword_id=keyword_id,
-            rank=result["rank"],
-            search_time=result["search_time"]
-        )
+            start_time=result["search_time"],
+            end_time=result["search_time"]
+        ).empty
+        
+        if not already_saved:
+            data_manager.add_search_result(
+                company_id=company_id,
+                keyword_id=keyword_id,
+                rank=result["rank"],
+                search_time=result["search_time"]
+            )
     
     return result
 
@@ -81,6 +91,10 @@ def main():
                     st.success(result["message"])
                 else:
                     st.error(result["message"])
+                
+                if result.get("cached"):
+                    cache_stats = get_result_cache().get_stats()
+                    st.caption(f"{result['search_time']}에 가져온 검색 결과를 사용했습니다. (캐시 적중 {cache_stats['hits']}회, 미스 {cache_stats['misses']}회)")
         
         # 최근 검색 결과 표시
         st.subheader("최근 검색 결과")
@@ -91,8 +105,7 @@ def main():
             results = results.sort_values(by='search_time', ascending=False).head(10)
             
             # 회사명과 키워드 텍스트 추가
-            results['company_name'] = results['company_id'].apply(data_manager.get_company_name)
-            results['keyword_text'] = results['keyword_id'].apply(data_manager.get_keyword_text)
+            results = data_manager.enrich_results(results)
             
             # 표시할 열 선택 및 순서 변경
             display_results = results[['search_time', 'keyword_text', 'company_name', 'rank']]
@@ -162,8 +175,7 @@ def main():
             
             if not results.empty:
                 # 회사명과 키워드 텍스트 추가
-                results['company_name'] = results['company_id'].apply(data_manager.get_company_name)
-                results['keyword_text'] = results['keyword_id'].apply(data_manager.get_keyword_text)
+                results = data_manager.enrich_results(results)
                 
                 # 표시할 열 선택 및 순서 변경
                 display_results = results[['search_time', 'keyword_text', 'company_name', 'rank']]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+벤치마크/부하 테스트용 네이버 플레이스 페이지 픽스처
+
+네이버 지도 검색 페이지와 목록(iframe) 페이지의 구조(선택자, 광고 표시, 부가 정보 마크업)를
+본떠서 HTML을 만듭니다. 직접 실행하면 benchmarks/fixtures/ 아래의 기본 픽스처 파일을 다시 만듭니다.
+"""
+
+import os
+import html
+import random
+import urllib.parse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+BRANDS = ["준오헤어", "이가자헤어비스", "박승철헤어스투디오", "리안헤어", "블루클럽", "차홍룸", "미랑컬헤어", "설렘헤어"]
+BRANCHES = ["의정부역점", "의정부점", "민락점", "신곡점", "가능역점", "녹양점", "호원점", "장암점"]
+CATEGORIES = ["미용실", "헤어샵", "네일아트", "두피관리"]
+
+def sample_place_names(count, seed=0):
+    """
+    픽스처에 넣을 상호명 목록 생성
+
+    Args:
+        count (int): 상호명 수
+        seed (int): 난수 시드
+
+    Returns:
+        list: 서로 다른 상호명 목록
+    """
+    rng = random.Random(seed)
+    names = []
+    seen = set()
+
+    while len(names) < count:
+        name = f"{rng.choice(BRANDS)} {rng.choice(BRANCHES)}"
+        if name in seen:
+            name = f"{name} {len(names) + 1}호"
+        seen.add(name)
+        names.append(name)
+
+    return names
+
+def _place_item(name, rank, is_ad, layout, rng):
+    escaped = html.escape(name)
+    category = rng.choice(CATEGORIES)
+    review_count = rng.randint(0, 5000)
+    ad_badge = '<span class="gU6bV _DHlh">광고</span>' if is_ad else ''
+
+    if layout == "legacy":
+        # 예전 레이아웃 (목록 컨테이너 id 없이 li.UEzoS, span.TYaxT)
+        return (
+            f'<li class="UEzoS rTjJo" data-laim-exp-id="{rank}">'
+            f'<div class="CHC5F"><a href="#" class="tzwk0" role="button">'
+            f'<div class="bSoi3"><span class="TYaxT">{escaped}</span><span class="KCMnt">{category}</span></div>'
+            f'</a>{ad_badge}</div>'
+            f'<div class="MVx6e"><span class="h69bs">리뷰 {review_count}</span></div>'
+            f'</li>'
+        )
+
+    return (
+        f'<li class="VLTHu OW9LQ" data-laim-exp-id="{rank}">'
+        f'<div class="qbGlu"><div class="ouxiq">'
+        f'<a href="#" class="place_bluelink tWIhh" role="button"><span class="O_Uah">{escaped}</span><span class="lxSbY">{category}</span></a>'
+        f'{ad_badge}'
+        f'</div>'
+        f'<div class="Dr_06"><span class="pV9oO">영업 중</span><span class="Lh3u8">리뷰 {review_count}</span>'
+        f'<span class="Pb4bU">경기 의정부시 시민로 {rng.randint(1, 400)}</span></div>'
+        f'<div class="JZ6JM"><div class="place_thumb"><img src="https://example.invalid/{rank}.jpg" alt=""></div></div>'
+        f'</div></li>'
+    )
+
+def build_place_list_html(place_names, ad_every=6, layout="current", seed=0):
+    """
+    목록(iframe) 페이지 HTML 생성
+
+    Args:
+        place_names (list): 순위 순서대로의 상호명 목록 (광고 항목은 별도로 끼워 넣음)
+        ad_every (int): 광고 항목을 끼워 넣는 간격 (0이면 광고 없음)
+        layout (str): 'current'(목록 컨테이너 id 사용) 또는 'legacy'
+        seed (int): 난수 시드
+
+    Returns:
+        str: 목록 페이지 HTML
+    """
+    rng = random.Random(seed)
+    items = []
+    rank = 0
+
+    for index, name in enumerate(place_names):
+        if ad_every and index % ad_every == 0:
+            items.append(_place_item(f"{rng.choice(BRANDS)} 광고점", -1, True, layout, rng))
+        rank += 1
+        items.append(_place_item(name, rank, False, layout, rng))
+
+    head = (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>네이버 플레이스</title>'
+        + ''.join(f'<link rel="stylesheet" href="https://example.invalid/css/{i}.css">' for i in range(8))
+        + '<script>window.__APOLLO_STATE__ = {' + ','.join(f'"Place:{i}": {{"id": "{i}"}}' for i in range(200)) + '};</script>'
+        + '</head><body>'
+    )
+    filter_bar = '<div class="place_filter">' + ''.join(f'<a class="filter_item" href="#">필터 {i}</a>' for i in range(20)) + '</div>'
+
+    if layout == "legacy":
+        body = f'<div class="place_section"><div class="_1EKsQ"><ul class="list_legacy">{"".join(items)}</ul></div></div>'
+    else:
+        body = f'<div class="Ryr1F" id="_pcmap_list_scroll_container"><ul>{"".join(items)}</ul></div>'
+
+    footer = '<div class="footer">' + ''.join(f'<a href="#">링크 {i}</a>' for i in range(30)) + '</div>'
+    return head + filter_bar + body + footer + '</body></html>'
+
+def build_map_search_html(iframe_src):
+    """
+    네이버 지도 검색 페이지 HTML 생성 (검색 결과 iframe 포함)
+
+    Args:
+        iframe_src (str): 검색 결과 iframe URL
+
+    Returns:
+        str: 검색 페이지 HTML
+    """
+    scripts = ''.join(
+        f'<script>/* bundle {i} */ var m{i} = [' + ','.join(str(j) for j in range(300)) + '];</script>'
+        for i in range(20)
+    )
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>네이버 지도</title>' + scripts + '</head>'
+        '<body><div id="app-root"><div class="map_container"><div id="baseMap"></div></div>'
+        f'<div class="search_panel"><iframe id="searchIframe" name="searchIframe" src="{html.escape(iframe_src)}" title="Naver Place Search"></iframe></div>'
+        f'<iframe id="entryIframe" src="about:blank"></iframe>'
+        '</div></body></html>'
+    )
+
+def default_iframe_src(keyword, base_url="https://pcmap.place.naver.com"):
+    """기본 목록 페이지 URL (검색어와 지도 좌표 파라미터 포함)"""
+    query = urllib.parse.quote(keyword, safe="")
+    return f"{base_url}/place/list?query={query}&x=127.0473&y=37.7381&clientX=127.0473&clientY=37.7381&display=70&ts=1700000000000"
+
+def write_default_fixtures():
+    """benchmarks/fixtures/ 아래에 기본 픽스처 파일 생성"""
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    keyword = "의정부 미용실"
+    names = sample_place_names(50)
+
+    files = {
+        "map_search.html": build_map_search_html(default_iframe_src(keyword)),
+        "place_list.html": build_place_list_html(names),
+        "place_list_legacy.html": build_place_list_html(names, layout="legacy"),
+        "place_names.txt": "\n".join(names) + "\n",
+    }
+
+    for name, content in files.items():
+        with open(os.path.join(FIXTURES_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    return sorted(files)
+
+def load_fixture(name):
+    """픽스처 파일 읽기"""
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+if __name__ == "__main__":
+    for name in write_default_fixtures():
+        print(os.path.join(FIXTURES_DIR, name))
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+오프라인 성능 벤치마크
+네트워크 없이 픽스처 HTML과 합성 검색 기록으로 검색 엔진과 데이터 관리자의 주요 경로를 측정합니다.
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --quick --compare bench.json
+
+결과는 JSON으로 저장되며, --compare로 이전 결과와 비교해서 허용 범위보다 느려진 항목이 있으면
+종료 코드 1을 반환합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime, timedelta
+
+# 모듈 경로 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+import pandas as pd
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from benchmarks.fixtures import load_fixture
+from modules.search_engine import NaverPlaceSearchEngine
+from modules.name_matcher import NameMatcher
+from modules.data_manager import create_data_manager
+from modules.downsampling import downsample, DOWNSAMPLE_METHODS
+
+def measure(fn, repeat=5, number=1):
+    """
+    함수 실행 시간 측정
+
+    Args:
+        fn (callable): 측정할 함수
+        repeat (int): 반복 측정 횟수
+        number (int): 한 번 측정할 때 연속 호출 횟수
+
+    Returns:
+        dict: 호출 1회당 최소/중앙값 시간(초)
+    """
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+
+    return {"min": min(samples), "median": statistics.median(samples)}
+
+def available_parsers():
+    parsers = []
+    for parser in ("lxml", "html.parser"):
+        try:
+            BeautifulSoup("", parser)
+            parsers.append(parser)
+        except FeatureNotFound:
+            pass
+    return parsers
+
+def bench_parse(repeat):
+    """파서/파싱 모드별 검색 페이지와 목록 페이지 파싱 처리량"""
+    outer_html = load_fixture("map_search.html")
+    list_html = load_fixture("place_list.html")
+    legacy_html = load_fixture("place_list_legacy.html")
+    results = []
+
+    for parser in available_parsers():
+        for mode in ("fast", "full"):
+            engine = NaverPlaceSearchEngine(parser=parser, parse_mode=mode)
+            cases = [
+                ("parse.outer", lambda: engine._find_iframe_src(outer_html)),
+                ("parse.list", lambda: engine._select_place_items(list_html)),
+                ("parse.list_legacy", lambda: engine._select_place_items(legacy_html)),
+            ]
+            for name, fn in cases:
+                timing = measure(fn, repeat=repeat, number=5)
+                results.append({
+                    "name": name,
+                    "params": {"parser": parser, "mode": mode},
+                    "seconds": timing["median"],
+                    "min_seconds": timing["min"],
+                    "pages_per_sec": 1 / timing["median"]
+                })
+            engine.close()
+
+    return results
+
+def bench_selectors(repeat):
+    """목록 항목 하나당 광고 판별 + 상호명 선택자 비용"""
+    results = []
+
+    for fixture in ("place_list.html", "place_list_legacy.html"):
+        engine = NaverPlaceSearchEngine(parse_mode="full")
+        items = engine._select_place_items(load_fixture(fixture))
+        timing = measure(lambda: engine._extract_place_names(items), repeat=repeat, number=5)
+        results.append({
+            "name": "selectors.per_item",
+            "params": {"fixture": fixture, "items": len(items)},
+            "seconds": timing["median"] / len(items),
+            "min_seconds": timing["min"] / len(items)
+        })
+        engine.close()
+
+    return results
+
+def bench_match(repeat):
+    """가져온 상호명 목록에서 업체 순위를 찾는 비용 (업체 수별)"""
+    place_names = load_fixture("place_names.txt").splitlines()
+    results = []
+
+    for policy in ("exact", "contains", "fuzzy"):
+        for company_count in (1, 10, 100):
+            # 절반은 목록에 있는 업체, 절반은 없는 업체 (매처는 실행마다 한 번 만드는 것처럼 미리 생성)
+            targets = place_names[:company_count // 2] + [f"없는 업체 {i}" for i in range(company_count - company_count // 2)]
+            engine = NaverPlaceSearchEngine(name_matcher=NameMatcher(targets, policy=policy))
+            engine._fetch_first_page = lambda keyword: (place_names, None, "https://pcmap.place.naver.com/place/list")
+            timing = measure(lambda: engine.search_many("의정부 미용실", targets, max_scrolls=1), repeat=repeat, number=20)
+            results.append({
+                "name": "match.search_many",
+                "params": {"policy": policy, "companies": company_count, "places": len(place_names)},
+                "seconds": timing["median"],
+                "min_seconds": timing["min"]
+            })
+            engine.close()
+
+    return results
+
+def bench_downsample(sizes, repeat):
+    """순위 변화 그래프에 보낼 점을 2000개로 줄이는 비용 (키워드 10개 계열)"""
+    results = []
+
+    for size in sizes:
+        rng = random.Random(size)
+        rank = 50
+        ranks = []
+        for _ in range(size):
+            rank = min(max(rank + rng.randint(-2, 2), 1), 300)
+            ranks.append(rank)
+        frame = pd.DataFrame({
+            "search_time": pd.date_range("2023-01-01", periods=size, freq="min"),
+            "rank": ranks,
+            "keyword_id": [index % 10 for index in range(size)]
+        })
+
+        for method in DOWNSAMPLE_METHODS:
+            timing = measure(lambda: downsample(frame, "search_time", "rank", 2000, group="keyword_id", method=method), repeat=repeat)
+            results.append({
+                "name": "downsample",
+                "params": {"method": method, "rows": size},
+                "seconds": timing["median"],
+                "min_seconds": timing["min"]
+            })
+
+    return results
+
+def write_synthetic_history(data_dir, rows, companies=20, keywords=50, seed=0):
+    """합성 검색 기록과 업체/키워드 CSV 생성"""
+    os.makedirs(data_dir, exist_ok=True)
+    rng = random.Random(seed)
+    created_at = "2024-01-01 00:00:00"
+
+    pd.DataFrame({
+        "id": range(1, companies + 1),
+        "name": [f"업체 {i}" for i in range(1, companies + 1)],
+        "created_at": created_at
+    }).to_csv(os.path.join(data_dir, "companies.csv"), index=False)
+
+    pd.DataFrame({
+        "id": range(1, keywords + 1),
+        "text": [f"키워드 {i}" for i in range(1, keywords + 1)],
+        "created_at": created_at
+    }).to_csv(os.path.join(data_dir, "keywords.csv"), index=False)
+
+    # 하루에 모든 조합을 한 번씩 검색한 기록
+    combinations = companies * keywords
+    start = datetime(2024, 1, 1, 14, 0, 0)
+    search_times = [
+        (start + timedelta(days=index // combinations, seconds=index % combinations)).strftime("%Y-%m-%d %H:%M:%S")
+        for index in range(rows)
+    ]
+    pd.DataFrame({
+        "id": range(1, rows + 1),
+        "company_id": [index % companies + 1 for index in range(rows)],
+        "keyword_id": [(index // companies) % keywords + 1 for index in range(rows)],
+        "rank": [rng.choice([-1] + list(range(1, 71))) for _ in range(rows)],
+        "search_time": search_times
+    }).to_csv(os.path.join(data_dir, "search_results.csv"), index=False)
+
+def bench_storage(sizes, backends, repeat, work_dir):
+    """검색 기록 크기별 추가/일괄 추가/필터 조회 비용"""
+    results = []
+
+    for rows in sizes:
+        for backend in backends:
+            data_dir = os.path.join(work_dir, f"{backend}_{rows}")
+            write_synthetic_history(data_dir, rows)
+
+            started = time.perf_counter()
+            data_manager = create_data_manager(data_dir, backend)
+            open_seconds = time.perf_counter() - started
+            params = {"backend": backend, "rows": rows}
+
+            results.append({"name": "storage.open", "params": params, "seconds": open_seconds})
+
+            # 첫 추가 (ID 계산 포함)와 이후 추가
+            started = time.perf_counter()
+            data_manager.add_search_result(1, 1, 5)
+            results.append({"name": "storage.add_search_result.first", "params": params, "seconds": time.perf_counter() - started})
+
+            timing = measure(lambda: data_manager.add_search_result(2, 3, 7), repeat=repeat, number=50)
+            results.append({"name": "storage.add_search_result", "params": params, "seconds": timing["median"], "min_seconds": timing["min"]})
+
+            records = [{"company_id": 1 + i % 20, "keyword_id": 1 + i % 50, "rank": i % 70 + 1} for i in range(100)]
+            timing = measure(lambda: data_manager.add_search_results(records), repeat=max(repeat // 2, 1))
+            results.append({"name": "storage.add_search_results", "params": dict(params, batch=len(records)), "seconds": timing["median"], "min_seconds": timing["min"]})
+
+            # 필터 조회: 새 인스턴스의 첫 조회(cold)와 같은 인스턴스의 반복 조회(warm)
+            def cold_read():
+                create_data_manager(data_dir, backend).get_search_results(company_id=3, keyword_id=7)
+
+            timing = measure(cold_read, repeat=repeat)
+            results.append({"name": "storage.get_search_results.cold", "params": params, "seconds": timing["median"], "min_seconds": timing["min"]})
+
+            data_manager.get_search_results(company_id=3, keyword_id=7)
+            timing = measure(lambda: data_manager.get_search_results(company_id=3, keyword_id=7), repeat=repeat, number=5)
+            results.append({"name": "storage.get_search_results.warm", "params": params, "seconds": timing["median"], "min_seconds": timing["min"]})
+
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    return results
+
+def result_key(result):
+    return result["name"] + json.dumps(result.get("params", {}), sort_keys=True, ensure_ascii=False)
+
+def compare(results, baseline_path, tolerance):
+    """
+    이전 결과와 비교
+
+    Returns:
+        list: (항목, 이전 시간, 현재 시간, 비율) 중 허용 범위보다 느려진 항목
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {result_key(result): result for result in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result_key(result))
+        if previous is None or previous["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append((result_key(result), previous["seconds"], result["seconds"], ratio))
+
+    return regressions
+
+def environment():
+    """실행 환경 정보"""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=parent_dir, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        revision = None
+
+    versions = {}
+    for package in ("pandas", "bs4", "lxml", "soupsieve"):
+        try:
+            versions[package] = __import__(package).__version__
+        except (ImportError, AttributeError):
+            versions[package] = None
+
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": versions,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="네트워크 없이 검색/저장 경로의 성능을 측정합니다.")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="합성 검색 기록 행 수 목록 (쉼표로 구분, 기본값: 10000,100000,1000000)")
+    parser.add_argument("--backends", default="csv,sqlite",
+                        help="측정할 저장소 종류 (쉼표로 구분, 기본값: csv,sqlite)")
+    parser.add_argument("--only", default="parse,selectors,match,storage,downsample",
+                        help="실행할 벤치마크 묶음 (쉼표로 구분)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수 (기본값: 5)")
+    parser.add_argument("--quick", action="store_true", help="작은 기록(10000행)과 적은 반복으로 빠르게 실행")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="비교 시 허용할 속도 저하 비율 (기본값: 0.25)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [10000] if args.quick else [int(size) for size in args.sizes.split(",") if size]
+    repeat = 3 if args.quick else args.repeat
+    groups = set(args.only.split(","))
+
+    # 검색 엔진 로그가 측정에 섞이지 않도록 끔
+    logging.disable(logging.CRITICAL)
+
+    results = []
+    if "parse" in groups:
+        results += bench_parse(repeat)
+    if "selectors" in groups:
+        results += bench_selectors(repeat)
+    if "match" in groups:
+        results += bench_match(repeat)
+    if "downsample" in groups:
+        results += bench_downsample(sizes, repeat)
+    if "storage" in groups:
+        work_dir = tempfile.mkdtemp(prefix="rank_tracker_bench_")
+        try:
+            results += bench_storage(sizes, args.backends.split(","), repeat, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {"environment": environment(), "results": results}
+
+    for result in results:
+        params = ", ".join(f"{key}={value}" for key, value in result.get("params", {}).items())
+        print(f"{result['name']:<36} {params:<48} {result['seconds'] * 1000:10.3f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for key, previous, current, ratio in regressions:
+            print(f"느려짐: {key} {previous * 1000:.3f} ms → {current * 1000:.3f} ms ({ratio:.2f}배)")
+        if regressions:
+            return 1
+        print("허용 범위를 넘게 느려진 항목이 없습니다.")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
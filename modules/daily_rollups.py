@@ -0,0 +1,109 @@
+import math
+
+import pandas as pd
+
+ROLLUP_KEYS = ['company_id', 'keyword_id', 'day']
+ROLLUP_COLUMNS = ROLLUP_KEYS + [
+    'samples', 'found', 'best_rank', 'worst_rank', 'rank_sum', 'last_rank', 'last_time', 'last_id'
+]
+
+def normalize_rollups(rollups):
+    """저장소에서 읽은 일별 집계의 열 형식 맞추기"""
+    if rollups.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    rollups = rollups[ROLLUP_COLUMNS].copy()
+    for column in ('company_id', 'keyword_id', 'samples', 'found', 'last_rank', 'last_id'):
+        rollups[column] = rollups[column].astype(int)
+    for column in ('best_rank', 'worst_rank', 'rank_sum'):
+        rollups[column] = rollups[column].astype(float)
+    rollups['day'] = rollups['day'].astype(str)
+    rollups['last_time'] = rollups['last_time'].astype(str)
+    return rollups
+
+def rollup_results(results):
+    """
+    검색 결과를 (업체, 키워드, 날짜)별로 집계
+
+    최고/최저 순위와 순위 합계는 순위를 찾은 기록(rank > 0)만으로 계산하고,
+    마지막 순위는 그 날 마지막으로 검색한 결과(못 찾았으면 -1)입니다.
+
+    Args:
+        results (pandas.DataFrame): id, company_id, keyword_id, rank, search_time 열을 가진 검색 결과
+
+    Returns:
+        pandas.DataFrame: 일별 집계 (ROLLUP_COLUMNS)
+    """
+    if results.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    frame = results[['id', 'company_id', 'keyword_id', 'rank', 'search_time']].copy()
+    for column in ('id', 'company_id', 'keyword_id', 'rank'):
+        frame[column] = frame[column].astype(int)
+    frame['search_time'] = frame['search_time'].astype(str)
+    frame['day'] = frame['search_time'].str[:10]
+    frame['found_rank'] = frame['rank'].where(frame['rank'] > 0)
+
+    rollups = frame.sort_values(['search_time', 'id'], kind='stable').groupby(ROLLUP_KEYS).agg(
+        samples=('rank', 'size'),
+        found=('found_rank', 'count'),
+        best_rank=('found_rank', 'min'),
+        worst_rank=('found_rank', 'max'),
+        rank_sum=('found_rank', 'sum'),
+        last_rank=('rank', 'last'),
+        last_time=('search_time', 'last'),
+        last_id=('id', 'max')
+    ).reset_index()
+
+    return normalize_rollups(rollups)
+
+def index_rollups(rollups):
+    """일별 집계를 (업체, 키워드, 날짜) → [samples, found, best_rank, worst_rank, rank_sum, last_rank, last_time, last_id] dict로 변환"""
+    rollups = normalize_rollups(rollups)
+    columns = [rollups[column].tolist() for column in ROLLUP_COLUMNS]
+    return {row[:3]: list(row[3:]) for row in zip(*columns)}
+
+def rollups_from_index(index):
+    """index_rollups() 형식의 dict를 일별 집계 DataFrame으로 변환 (키 순서)"""
+    if not index:
+        return normalize_rollups(pd.DataFrame())
+
+    rollups = pd.DataFrame([key + tuple(values) for key, values in index.items()], columns=ROLLUP_COLUMNS)
+    return normalize_rollups(rollups.sort_values(ROLLUP_KEYS, kind='stable').reset_index(drop=True))
+
+def add_to_rollups(index, rows):
+    """
+    검색 결과 행을 일별 집계에 더하기
+
+    pandas를 거치지 않고 바뀐 키만 계산하므로 몇 행씩 자주 추가할 때 사용합니다.
+    마지막 순위는 (검색 시각, ID)가 가장 늦은 결과의 순위이므로 행 순서와 관계없이 같은 집계가 됩니다.
+
+    Args:
+        index (dict): index_rollups() 형식의 일별 집계 (바로 수정됨)
+        rows (iterable): [id, company_id, keyword_id, rank, search_time] 목록
+
+    Returns:
+        list: 바뀐 (업체, 키워드, 날짜) 키
+    """
+    changed = {}
+
+    for result_id, company_id, keyword_id, rank, search_time in rows:
+        result_id, rank, search_time = int(result_id), int(rank), str(search_time)
+        key = (int(company_id), int(keyword_id), search_time[:10])
+
+        values = index.get(key)
+        if values is None:
+            values = index[key] = [0, 0, math.nan, math.nan, 0.0, rank, search_time, result_id]
+        elif (search_time, result_id) >= (values[6], values[7]):
+            values[5], values[6] = rank, search_time
+
+        values[0] += 1
+        if rank > 0:
+            values[1] += 1
+            values[2] = float(rank) if math.isnan(values[2]) else min(values[2], float(rank))
+            values[3] = float(rank) if math.isnan(values[3]) else max(values[3], float(rank))
+            values[4] += rank
+        values[7] = max(values[7], result_id)
+        changed[key] = None
+
+    return list(changed)
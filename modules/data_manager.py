@@ -1,11 +1,30 @@
 import os
+import math
 import pandas as pd
 import csv
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+from modules.history_archive import ParquetHistoryArchive, PYARROW_AVAILABLE
+from modules.history_compaction import compact_results, expand_results, INTERVAL_COLUMNS, CHECK_COLUMNS
+from modules.daily_rollups import (
+    ROLLUP_KEYS, ROLLUP_COLUMNS, rollup_results, index_rollups, rollups_from_index, add_to_rollups
+)
+
 class DataManager:
     """데이터 관리 클래스"""
     
+    RESULT_COLUMNS = ['id', 'company_id', 'keyword_id', 'rank', 'search_time']
+    
+    # 파일 변경 여부로 무효화되는 조회 결과 캐시의 최대 항목 수
+    FRAME_CACHE_SIZE = 32
+    
+    # 일별 집계 파일에서 같은 키의 예전 행이 이만큼 넘게 쌓이고 살아 있는 행보다 많아지면 파일을 다시 씀
+    ROLLUP_LOG_SLACK = 1000
+    
     def __init__(self, data_dir):
         """
         데이터 관리자 초기화
@@ -18,6 +37,27 @@ class DataManager:
         self.keywords_file = os.path.join(data_dir, 'keywords.csv')
         self.results_file = os.path.join(data_dir, 'search_results.csv')
         
+        # 압축한 검색 기록 (compact_history() 이후에는 results_file에 최근 기록만 남음)
+        self.intervals_file = os.path.join(data_dir, 'search_intervals.csv')
+        self.checks_file = os.path.join(data_dir, 'search_checks.csv')
+        
+        # (업체, 키워드, 날짜)별 집계 (검색 결과를 추가할 때 바뀐 행만 파일 끝에 추가, 같은 키는 마지막 행이 유효)
+        self.rollups_file = os.path.join(data_dir, 'daily_rollups.csv')
+        
+        # 검색 결과 ID 카운터 캐시 (파일이 외부에서 바뀌면 다시 계산)
+        self._next_result_id = None
+        self._results_signature = None
+        
+        # 일별 집계 캐시 (index_rollups 형식, 파일이 외부에서 바뀌면 다시 읽음)
+        self._rollup_index = None
+        self._rollup_last_id = 0
+        self._rollup_log_rows = 0
+        self._rollups_signature = None
+        
+        # 조회 결과 캐시 (원본 파일의 크기/수정 시각이 바뀌면 다시 읽음)
+        self._frame_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # 데이터 디렉토리 및 파일 초기화
         self._initialize_data_files()
     
@@ -42,7 +82,7 @@ class DataManager:
         if not os.path.exists(self.results_file):
             with open(self.results_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow(['id', 'company_id', 'keyword_id', 'rank', 'search_time'])
+                writer.writerow(self.RESULT_COLUMNS)
     
     def get_companies(self):
         """
@@ -51,10 +91,7 @@ class DataManager:
         Returns:
             pandas.DataFrame: 회사 정보
         """
-        try:
-            return pd.read_csv(self.companies_file)
-        except pd.errors.EmptyDataError:
-            return pd.DataFrame(columns=['id', 'name', 'created_at'])
+        return self._read_csv(self.companies_file, ['id', 'name', 'created_at']).copy()
     
     def get_keywords(self):
         """
@@ -63,34 +100,185 @@ class DataManager:
         Returns:
             pandas.DataFrame: 키워드 정보
         """
-        try:
-            return pd.read_csv(self.keywords_file)
-        except pd.errors.EmptyDataError:
-            return pd.DataFrame(columns=['id', 'text', 'created_at'])
+        return self._read_csv(self.keywords_file, ['id', 'text', 'created_at']).copy()
     
-    def get_search_results(self, company_id=None, keyword_id=None):
+    def get_search_results(self, company_id=None, keyword_id=None, start_time=None, end_time=None):
         """
         검색 결과 조회
         
         Args:
             company_id (int, optional): 회사 ID 필터
             keyword_id (int, optional): 키워드 ID 필터
+            start_time (str or datetime, optional): 이 시각 이후의 결과만 조회
+            end_time (str or datetime, optional): 이 시각 이전의 결과만 조회
             
         Returns:
             pandas.DataFrame: 검색 결과
         """
+        df = self._read_results()
+        
+        if company_id is not None:
+            df = df[df['company_id'] == company_id]
+        
+        if keyword_id is not None:
+            df = df[df['keyword_id'] == keyword_id]
+        
+        # 검색 시간은 'YYYY-MM-DD HH:MM:SS' 형식이므로 문자열 비교로 범위 필터링
+        if start_time is not None:
+            df = df[df['search_time'] >= self._format_time(start_time)]
+        
+        if end_time is not None:
+            df = df[df['search_time'] <= self._format_time(end_time)]
+        
+        # 캐시된 DataFrame을 호출한 쪽에서 수정하지 않도록 복사본 반환
+        return df.copy()
+    
+    def _read_results(self):
+        """
+        전체 검색 결과 (압축한 기록이 있으면 실행별 행으로 복원해서 최근 기록과 합침)
+        
+        반환값은 캐시와 공유되므로 수정하면 안 됩니다.
+        """
+        recent = self._read_csv(self.results_file, self.RESULT_COLUMNS)
+        if not self.is_history_compacted():
+            return recent
+        
+        def load():
+            compacted = self._read_compacted()
+            # 압축 도중 중단되어 최근 기록에 남은 행은 압축한 기록에 이미 있으므로 제외
+            last_id = self._compacted_last_id()
+            if last_id is not None and not recent.empty:
+                newer = recent[recent['id'] > last_id]
+            else:
+                newer = recent
+            if compacted.empty:
+                return newer
+            if newer.empty:
+                return compacted
+            return pd.concat([compacted, newer], ignore_index=True)
+        
+        signature = tuple(self._file_signature(path) for path in (self.results_file, self.intervals_file, self.checks_file))
+        return self._memoize('results', signature, load)
+    
+    def _read_compacted(self):
+        """압축한 기록을 실행별 검색 결과로 복원 (캐시 사용)"""
+        def load():
+            return expand_results(
+                self._load_csv(self.intervals_file, INTERVAL_COLUMNS),
+                self._load_csv(self.checks_file, CHECK_COLUMNS)
+            )
+        
+        signature = (self._file_signature(self.intervals_file), self._file_signature(self.checks_file))
+        return self._memoize('compacted', signature, load)
+    
+    def _compacted_last_id(self):
+        """압축한 기록의 마지막 검색 결과 ID (없으면 None)"""
+        compacted = self._read_compacted()
+        return None if compacted.empty else int(compacted['id'].max())
+    
+    def is_history_compacted(self):
+        """검색 기록을 순위 구간으로 압축해서 저장하고 있는지 확인"""
+        return os.path.exists(self.intervals_file) and os.path.exists(self.checks_file)
+    
+    def compact_history(self):
+        """
+        검색 기록을 순위가 바뀐 구간 단위로 압축
+        
+        순위가 그대로인 연속한 기록은 (업체, 키워드, 순위, first_seen, last_seen, 첫 기록 ID) 한 행으로 묶어 search_intervals.csv에,
+        검색 시각과 결과 ID는 키워드 검색 한 번당 한 행으로 search_checks.csv에 저장하고 search_results.csv는 비웁니다.
+        이후 기록은 search_results.csv에 계속 추가되며, 조회할 때는 압축한 기록을 실행별 행으로 복원해서 합칩니다.
+        
+        순위 구간 → 검색 기록 → 최근 기록 순서로 교체하므로, 중간에 중단되어도 조회 결과는 바뀌지 않습니다.
+        
+        Returns:
+            dict: 압축한 검색 결과 수, 순위 구간 수, 검색 기록 수
+        """
+        results = self.get_search_results()
+        self._write_compacted(results)
+        
+        intervals = self._load_csv(self.intervals_file, INTERVAL_COLUMNS)
+        checks = self._load_csv(self.checks_file, CHECK_COLUMNS)
+        return {"rows": len(results), "intervals": len(intervals), "checks": len(checks)}
+    
+    def _write_compacted(self, results):
+        """전체 검색 결과를 압축해서 저장하고 최근 기록 비우기"""
+        intervals, checks = compact_results(results)
+        self._replace_csv(self.intervals_file, intervals)
+        self._replace_csv(self.checks_file, checks)
+        self._replace_csv(self.results_file, pd.DataFrame(columns=self.RESULT_COLUMNS))
+    
+    def _replace_csv(self, path, frame):
+        """임시 파일에 쓴 뒤 이름을 바꿔서 CSV 파일 교체"""
+        fd, temp_path = tempfile.mkstemp(dir=self.data_dir, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+        os.close(fd)
         try:
-            df = pd.read_csv(self.results_file)
-            
-            if company_id is not None:
-                df = df[df['company_id'] == company_id]
-            
-            if keyword_id is not None:
-                df = df[df['keyword_id'] == keyword_id]
-            
-            return df
+            frame.to_csv(temp_path, index=False)
+            if os.path.exists(path):
+                shutil.copymode(path, temp_path)
+            else:
+                os.chmod(temp_path, 0o644)
+            with open(temp_path, 'rb+') as f:
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def _rewrite_results(self, results):
+        """검색 결과 전체를 다시 저장 (압축한 기록이 있으면 압축해서 저장)"""
+        if self.is_history_compacted():
+            self._write_compacted(results)
+        else:
+            results.to_csv(self.results_file, index=False)
+    
+    def _read_csv(self, path, columns):
+        """
+        CSV 파일 읽기 (파일 크기와 수정 시각이 같으면 이전에 읽은 DataFrame 재사용)
+        
+        반환값은 캐시와 공유되므로 수정하면 안 됩니다.
+        """
+        return self._memoize(('csv', path), self._file_signature(path), lambda: self._load_csv(path, columns))
+    
+    def _load_csv(self, path, columns):
+        try:
+            return pd.read_csv(path)
         except pd.errors.EmptyDataError:
-            return pd.DataFrame(columns=['id', 'company_id', 'keyword_id', 'rank', 'search_time'])
+            return pd.DataFrame(columns=columns)
+    
+    def _memoize(self, key, signature, loader):
+        """
+        변경 확인용 값(signature)이 같은 동안 loader 결과를 재사용
+        
+        Args:
+            key: 캐시 키
+            signature: 원본 파일의 변경 확인용 값 (None이면 캐시하지 않음)
+            loader (callable): 캐시가 없거나 오래되었을 때 호출할 함수
+        """
+        if signature is None:
+            return loader()
+        
+        with self._cache_lock:
+            cached = self._frame_cache.get(key)
+            if cached is not None and cached[0] == signature:
+                self._frame_cache.move_to_end(key)
+                return cached[1]
+        
+        value = loader()
+        
+        with self._cache_lock:
+            self._frame_cache[key] = (signature, value)
+            self._frame_cache.move_to_end(key)
+            while len(self._frame_cache) > self.FRAME_CACHE_SIZE:
+                self._frame_cache.popitem(last=False)
+        
+        return value
+    
+    def _format_time(self, value):
+        """datetime 또는 문자열을 저장 형식의 시간 문자열로 변환"""
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        return str(value)
     
     def add_company(self, name):
         """
@@ -125,6 +313,8 @@ class DataManager:
         else:
             pd.concat([companies, new_company]).to_csv(self.companies_file, index=False)
         
+        self._invalidate_name_cache()
+        
         return new_id
     
     def add_keyword(self, text):
@@ -160,6 +350,8 @@ class DataManager:
         else:
             pd.concat([keywords, new_keyword]).to_csv(self.keywords_file, index=False)
         
+        self._invalidate_name_cache()
+        
         return new_id
     
     def add_search_result(self, company_id, keyword_id, rank, search_time=None):
@@ -175,51 +367,402 @@ class DataManager:
         Returns:
             int: 생성된 결과 ID
         """
-        results = self.get_search_results()
-        
         # 새 ID 생성
-        new_id = 1 if results.empty else results['id'].max() + 1
+        new_id = self._get_next_result_id()
         
         # 검색 시간이 없으면 현재 시간 사용
         if search_time is None:
             search_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        # 새 검색 결과 추가
-        new_result = pd.DataFrame({
-            'id': [new_id],
-            'company_id': [company_id],
-            'keyword_id': [keyword_id],
-            'rank': [rank],
-            'search_time': [search_time]
-        })
+        # 파일 끝에 한 줄만 추가 (기존 기록을 다시 읽거나 쓰지 않음)
+        self._append_rows(self.results_file, self.RESULT_COLUMNS, [[new_id, company_id, keyword_id, rank, search_time]])
         
-        # 파일에 추가
-        if results.empty:
-            new_result.to_csv(self.results_file, index=False)
-        else:
-            pd.concat([results, new_result]).to_csv(self.results_file, index=False)
+        self._next_result_id = new_id + 1
+        self._results_signature = self._file_signature(self.results_file)
+        
+        self._update_daily_rollups([[new_id, company_id, keyword_id, rank, search_time]])
         
         return new_id
     
-    def get_company_name(self, company_id):
+    def add_search_results(self, records):
         """
-        회사 ID로 회사명 조회
+        검색 결과 여러 건을 한 번에 추가
+        
+        기존 파일을 임시 파일로 복사한 뒤 새 행을 덧붙이고 이름을 바꿔서 교체하므로,
+        중간에 실패해도 배치 전체가 기록되거나 전혀 기록되지 않습니다.
         
         Args:
-            company_id (int): 회사 ID
+            records (list): company_id, keyword_id, rank, search_time(선택) 키를 가진 dict 목록
             
         Returns:
-            str: 회사명
+            list: 생성된 결과 ID 목록
         """
-        companies = self.get_companies()
-        if companies.empty:
+        if not records:
+            return []
+        
+        first_id = self._get_next_result_id()
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        rows = []
+        for offset, record in enumerate(records):
+            rows.append([
+                first_id + offset,
+                record['company_id'],
+                record['keyword_id'],
+                record['rank'],
+                record.get('search_time') or now
+            ])
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.data_dir, prefix='.search_results.', suffix='.tmp')
+        os.close(fd)
+        try:
+            if os.path.exists(self.results_file):
+                shutil.copyfile(self.results_file, temp_path)
+                shutil.copymode(self.results_file, temp_path)
+            
+            self._append_rows(temp_path, self.RESULT_COLUMNS, rows)
+            
+            with open(temp_path, 'rb+') as f:
+                os.fsync(f.fileno())
+            
+            os.replace(temp_path, self.results_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        self._next_result_id = first_id + len(rows)
+        self._results_signature = self._file_signature(self.results_file)
+        
+        self._update_daily_rollups(rows)
+        
+        return [row[0] for row in rows]
+    
+    def get_daily_rollups(self, company_id=None, keyword_id=None, start_time=None, end_time=None):
+        """
+        (업체, 키워드, 날짜)별 집계 조회
+        
+        집계에 아직 반영되지 않은 검색 결과(예: 이전 버전으로 추가한 기록)가 있으면 먼저 반영합니다.
+        
+        Args:
+            company_id (int, optional): 회사 ID 필터
+            keyword_id (int, optional): 키워드 ID 필터
+            start_time (str or datetime, optional): 이 시각이 속한 날짜부터 조회
+            end_time (str or datetime, optional): 이 시각이 속한 날짜까지 조회
+            
+        Returns:
+            pandas.DataFrame: company_id, keyword_id, day(datetime), samples(검색 횟수), found(순위를 찾은 횟수),
+                best_rank, worst_rank, mean_rank(찾은 순위의 평균), last_rank, last_time 열
+        """
+        self.refresh_daily_rollups()
+        rollups = self._load_rollups()
+        
+        if company_id is not None:
+            rollups = rollups[rollups['company_id'] == int(company_id)]
+        
+        if keyword_id is not None:
+            rollups = rollups[rollups['keyword_id'] == int(keyword_id)]
+        
+        # 날짜는 'YYYY-MM-DD' 형식이므로 문자열 비교로 범위 필터링
+        if start_time is not None:
+            rollups = rollups[rollups['day'] >= self._format_time(start_time)[:10]]
+        
+        if end_time is not None:
+            rollups = rollups[rollups['day'] <= self._format_time(end_time)[:10]]
+        
+        rollups = rollups.copy()
+        rollups['mean_rank'] = rollups['rank_sum'] / rollups['found'].where(rollups['found'] > 0)
+        rollups['day'] = pd.to_datetime(rollups['day'])
+        rollups['last_time'] = pd.to_datetime(rollups['last_time'])
+        
+        return rollups.drop(columns=['rank_sum', 'last_id']).reset_index(drop=True)
+    
+    def refresh_daily_rollups(self):
+        """
+        집계에 반영되지 않은 검색 결과를 일별 집계에 반영
+        
+        집계에 반영한 마지막 결과 ID를 다음 결과 ID와 비교해서 같으면 검색 기록을 읽지 않고,
+        다르면 그보다 큰 ID의 결과만 더합니다. 검색 결과의 마지막 ID가 그보다 작아졌으면(파일을 바꾼 경우)
+        처음부터 다시 집계합니다.
+        
+        Returns:
+            int: 반영한 검색 결과 수
+        """
+        index = self._rollup_state()
+        last_id = self._rollup_last_id
+        max_id = self._get_next_result_id() - 1
+        
+        if max_id == last_id:
+            return 0
+        
+        # 캐시와 공유하는 전체 기록은 복사하지 않고 새 결과만 골라냄
+        results = self._read_results()
+        
+        if max_id < last_id:
+            self._write_rollups(index_rollups(rollup_results(results)))
+            return len(results)
+        
+        new_results = results[results['id'] > last_id]
+        if new_results.empty:
+            return 0
+        
+        if not index:
+            self._write_rollups(index_rollups(rollup_results(new_results)))
+        else:
+            self._update_daily_rollups(new_results[self.RESULT_COLUMNS].itertuples(index=False, name=None), checked=True)
+        return len(new_results)
+    
+    def _update_daily_rollups(self, rows, checked=False):
+        """
+        방금 추가한 검색 결과를 일별 집계에 반영
+        
+        집계가 바로 앞 ID까지 반영되어 있으면 추가한 행으로 바뀐 (업체, 키워드, 날짜) 행만 집계 파일 끝에 추가하고,
+        그렇지 않으면 빠진 결과까지 함께 반영합니다.
+        
+        Args:
+            rows (list): [id, company_id, keyword_id, rank, search_time] 목록
+            checked (bool): 빠진 결과가 없는지 이미 확인했으면 True
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        
+        index = self._rollup_state()
+        if not checked and min(int(row[0]) for row in rows) != self._rollup_last_id + 1:
+            self.refresh_daily_rollups()
+            return
+        
+        changed = add_to_rollups(index, rows)
+        self._rollup_last_id = max(self._rollup_last_id, max(int(row[0]) for row in rows))
+        
+        self._append_rows(self.rollups_file, ROLLUP_COLUMNS, [self._rollup_row(key, index[key]) for key in changed])
+        self._rollup_log_rows += len(changed)
+        self._rollups_signature = self._file_signature(self.rollups_file)
+        
+        # 예전 행이 많아지면 키마다 한 행만 남겨서 다시 씀 (추가 비용은 평균적으로 바뀐 행 수에 비례)
+        if self._rollup_log_rows > 2 * len(index) + self.ROLLUP_LOG_SLACK:
+            self._write_rollups(index)
+    
+    def _rollup_row(self, key, values):
+        """일별 집계 파일에 쓸 한 행 (순위 값은 정수로, 없으면 빈 칸)"""
+        row = list(key)
+        for value in values:
+            if isinstance(value, float):
+                value = '' if math.isnan(value) else int(value)
+            row.append(value)
+        return row
+    
+    def _rollup_state(self):
+        """
+        일별 집계 (index_rollups 형식, 반환값은 캐시와 공유됨)
+        
+        마지막으로 기록한 뒤 집계 파일이 바뀌지 않았다면 메모리의 값을 사용하고,
+        그렇지 않으면 파일을 읽어서 같은 키의 행은 마지막 행만 남깁니다.
+        """
+        signature = self._file_signature(self.rollups_file)
+        if self._rollup_index is not None and signature == self._rollups_signature:
+            return self._rollup_index
+        
+        if signature is None:
+            rollups = pd.DataFrame(columns=ROLLUP_COLUMNS)
+        else:
+            rollups = self._load_csv(self.rollups_file, ROLLUP_COLUMNS)
+        
+        self._rollup_log_rows = len(rollups)
+        self._rollup_index = index_rollups(rollups.drop_duplicates(ROLLUP_KEYS, keep='last'))
+        self._rollup_last_id = max((values[7] for values in self._rollup_index.values()), default=0)
+        self._rollups_signature = signature
+        return self._rollup_index
+    
+    def _load_rollups(self):
+        """저장된 일별 집계 (반환값은 캐시와 공유되므로 수정하면 안 됨)"""
+        index = self._rollup_state()
+        return self._memoize('rollups', self._rollups_signature, lambda: rollups_from_index(index))
+    
+    def _write_rollups(self, index):
+        """일별 집계 파일을 키마다 한 행으로 다시 쓰기"""
+        rollups = rollups_from_index(index)
+        for column in ('best_rank', 'worst_rank', 'rank_sum'):
+            rollups[column] = rollups[column].round().astype('Int64')
+        self._replace_csv(self.rollups_file, rollups[ROLLUP_COLUMNS])
+        
+        self._rollup_index = index
+        self._rollup_last_id = max((values[7] for values in index.values()), default=0)
+        self._rollup_log_rows = len(index)
+        self._rollups_signature = self._file_signature(self.rollups_file)
+    
+    def _drop_rollups(self, column, value):
+        """삭제한 업체 또는 키워드의 일별 집계 삭제"""
+        position = ROLLUP_KEYS.index(column)
+        index = self._rollup_state()
+        kept = {key: values for key, values in index.items() if key[position] != value}
+        if len(kept) != len(index):
+            self._write_rollups(kept)
+    
+    def _history_signature(self):
+        """검색 기록 저장소의 변경 확인용 값"""
+        if not self.is_history_compacted():
+            return self._file_signature(self.results_file)
+        
+        signatures = [self._file_signature(path) for path in (self.results_file, self.intervals_file, self.checks_file)]
+        if None in signatures:
             return None
+        return sum(signatures, ())
+    
+    def _get_history_archive(self):
+        """Parquet 보관소 객체 (pyarrow가 없으면 None)"""
+        if not PYARROW_AVAILABLE:
+            return None
+        return ParquetHistoryArchive(os.path.join(self.data_dir, 'history_archive'))
+    
+    def is_history_archive_fresh(self):
+        """
+        Parquet 보관소가 현재 검색 기록과 같은 내용인지 확인
+        
+        Returns:
+            bool: 마지막 내보내기 이후 검색 기록이 바뀌지 않았으면 True
+        """
+        archive = self._get_history_archive()
+        if archive is None or not archive.exists():
+            return False
+        
+        manifest = archive.read_manifest()
+        signature = self._history_signature()
+        return manifest is not None and signature is not None and manifest.get('source_signature') == list(signature)
+    
+    def export_history_archive(self, since=None):
+        """
+        검색 기록을 월별 Parquet 파일로 내보내기
+        
+        Args:
+            since (str or datetime, optional): 이 시각이 속한 월부터만 다시 씀.
+                그 이전 달의 기록이 마지막 내보내기 이후 바뀌지 않은 경우에만 사용해야 합니다.
+                
+        Returns:
+            int: 내보낸 행 수
+        """
+        archive = self._get_history_archive()
+        if archive is None:
+            raise ImportError("Parquet 보관소를 사용하려면 pyarrow를 설치해야 합니다. (pip install pyarrow)")
+        
+        # 기록을 읽기 전의 값을 저장해서, 내보내는 도중에 추가된 기록이 있으면 최신이 아닌 것으로 판단되게 함
+        signature = self._history_signature()
+        
+        if since is None or not archive.exists():
+            return archive.write(self.get_search_results(), signature)
+        
+        first_month = pd.Timestamp(since).to_period('M')
+        results = self.get_search_results(start_time=first_month.start_time.to_pydatetime())
+        
+        last_month = max(pd.Timestamp.now().to_period('M'), first_month)
+        if not results.empty:
+            last_month = max(last_month, pd.to_datetime(results['search_time']).max().to_period('M'))
+        months = [str(month) for month in pd.period_range(first_month, last_month, freq='M')]
+        
+        return archive.write(results, signature, months=months)
+    
+    def get_history(self, company_id=None, keyword_id=None, start_time=None, end_time=None, columns=None):
+        """
+        분석용 검색 기록 조회
+        
+        Parquet 보관소가 최신이면 필요한 월 파티션과 열만 읽고,
+        그렇지 않으면 get_search_results()로 조회합니다.
         
-        company = companies[companies['id'] == company_id]
-        if company.empty:
+        Args:
+            company_id (int, optional): 회사 ID 필터
+            keyword_id (int, optional): 키워드 ID 필터
+            start_time (str or datetime, optional): 이 시각 이후의 결과만 조회
+            end_time (str or datetime, optional): 이 시각 이전의 결과만 조회
+            columns (list, optional): 조회할 열 목록 (없으면 전체)
+            
+        Returns:
+            pandas.DataFrame: 검색 결과 (search_time은 datetime 형식)
+        """
+        if self.is_history_archive_fresh():
+            return self._get_history_archive().read(
+                company_id=company_id,
+                keyword_id=keyword_id,
+                start_time=start_time,
+                end_time=end_time,
+                columns=columns
+            )
+        
+        results = self.get_search_results(
+            company_id=company_id,
+            keyword_id=keyword_id,
+            start_time=start_time,
+            end_time=end_time
+        )
+        results = results.copy()
+        results['search_time'] = pd.to_datetime(results['search_time'])
+        
+        if columns is not None:
+            results = results[list(columns)]
+        
+        return results
+    
+    def _file_signature(self, path):
+        """파일 변경 여부 확인용 (크기, 수정 시각)"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
             return None
+        return (stat.st_size, stat.st_mtime_ns)
+    
+    def _get_next_result_id(self):
+        """
+        다음 검색 결과 ID 조회
+        
+        마지막으로 기록한 뒤 파일이 바뀌지 않았다면 캐시된 값을 사용하고,
+        그렇지 않으면 id 열만 읽어서 다시 계산합니다.
+        """
+        if self._next_result_id is not None and self._file_signature(self.results_file) == self._results_signature:
+            return self._next_result_id
+        
+        try:
+            ids = pd.read_csv(self.results_file, usecols=['id'])['id']
+        except pd.errors.EmptyDataError:
+            ids = pd.Series(dtype='int64')
+        
+        last_id = 0 if ids.empty else int(ids.max())
+        if self.is_history_compacted():
+            # 최근 기록을 비운 뒤에도 압축한 기록의 ID와 겹치지 않게 함
+            last_id = max(last_id, self._compacted_last_id() or 0)
+        
+        self._next_result_id = last_id + 1
+        self._results_signature = self._file_signature(self.results_file)
+        return self._next_result_id
+    
+    def _append_rows(self, path, columns, rows):
+        """CSV 파일 끝에 행 추가 (빈 파일이면 헤더부터 기록)"""
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        
+        needs_newline = False
+        if size > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) not in (b'\n', b'\r')
+        
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            if needs_newline:
+                f.write('\n')
+            
+            writer = csv.writer(f)
+            if size == 0:
+                writer.writerow(columns)
+            writer.writerows(rows)
+    
+    def get_company_name(self, company_id):
+        """
+        회사 ID로 회사명 조회
         
-        return company['name'].iloc[0]
+        Args:
+            company_id (int): 회사 ID
+            
+        Returns:
+            str: 회사명
+        """
+        return self.get_company_names().get(company_id)
     
     def get_keyword_text(self, keyword_id):
         """
@@ -231,15 +774,85 @@ class DataManager:
         Returns:
             str: 키워드 텍스트
         """
-        keywords = self.get_keywords()
-        if keywords.empty:
-            return None
+        return self.get_keyword_texts().get(keyword_id)
+    
+    def get_company_names(self):
+        """
+        회사 ID → 회사명 사전 조회 (캐시 사용)
         
-        keyword = keywords[keywords['id'] == keyword_id]
-        if keyword.empty:
-            return None
+        Returns:
+            dict: 회사 ID별 회사명
+        """
+        def load():
+            companies = self.get_companies()
+            return dict(zip(companies['id'].astype(int), companies['name']))
+        
+        return self._memoize('company_names', self._names_signature(), load)
+    
+    def get_keyword_texts(self):
+        """
+        키워드 ID → 키워드 텍스트 사전 조회 (캐시 사용)
+        
+        Returns:
+            dict: 키워드 ID별 키워드 텍스트
+        """
+        def load():
+            keywords = self.get_keywords()
+            return dict(zip(keywords['id'].astype(int), keywords['text']))
+        
+        return self._memoize('keyword_texts', self._names_signature(), load)
+    
+    def _names_signature(self):
+        """업체/키워드 저장소의 변경 확인용 값"""
+        return (self._file_signature(self.companies_file), self._file_signature(self.keywords_file))
+    
+    def _invalidate_name_cache(self):
+        """업체/키워드가 바뀌었을 때 이름 사전 캐시 비우기"""
+        with self._cache_lock:
+            self._frame_cache.pop('company_names', None)
+            self._frame_cache.pop('keyword_texts', None)
+    
+    def enrich_results(self, results):
+        """
+        검색 결과에 회사명(company_name)과 키워드 텍스트(keyword_text) 열 추가
+        
+        행마다 조회하지 않고 ID → 이름 사전으로 한 번에 매핑합니다.
+        
+        Args:
+            results (pandas.DataFrame): company_id 또는 keyword_id 열을 가진 검색 결과
+            
+        Returns:
+            pandas.DataFrame: 이름 열이 추가된 검색 결과 (원본은 바꾸지 않음)
+        """
+        results = results.copy()
+        
+        if 'company_id' in results.columns:
+            results['company_name'] = results['company_id'].map(self.get_company_names())
+        
+        if 'keyword_id' in results.columns:
+            results['keyword_text'] = results['keyword_id'].map(self.get_keyword_texts())
         
-        return keyword['text'].iloc[0]
+        return results
+    
+    def get_enriched_search_results(self, company_id=None, keyword_id=None, start_time=None, end_time=None):
+        """
+        회사명과 키워드 텍스트가 포함된 검색 결과 조회
+        
+        Args:
+            company_id (int, optional): 회사 ID 필터
+            keyword_id (int, optional): 키워드 ID 필터
+            start_time (str or datetime, optional): 이 시각 이후의 결과만 조회
+            end_time (str or datetime, optional): 이 시각 이전의 결과만 조회
+            
+        Returns:
+            pandas.DataFrame: company_name, keyword_text 열이 추가된 검색 결과
+        """
+        return self.enrich_results(self.get_search_results(
+            company_id=company_id,
+            keyword_id=keyword_id,
+            start_time=start_time,
+            end_time=end_time
+        ))
     
     def delete_company(self, company_id):
         """
@@ -261,12 +874,13 @@ class DataManager:
             return False
         
         new_companies.to_csv(self.companies_file, index=False)
+        self._invalidate_name_cache()
         
         # 관련 검색 결과도 삭제
         results = self.get_search_results()
         if not results.empty:
-            new_results = results[results['company_id'] != company_id]
-            new_results.to_csv(self.results_file, index=False)
+            self._rewrite_results(results[results['company_id'] != company_id])
+        self._drop_rollups('company_id', company_id)
         
         return True
     
@@ -290,11 +904,34 @@ class DataManager:
             return False
         
         new_keywords.to_csv(self.keywords_file, index=False)
+        self._invalidate_name_cache()
         
         # 관련 검색 결과도 삭제
         results = self.get_search_results()
         if not results.empty:
-            new_results = results[results['keyword_id'] != keyword_id]
-            new_results.to_csv(self.results_file, index=False)
+            self._rewrite_results(results[results['keyword_id'] != keyword_id])
+        self._drop_rollups('keyword_id', keyword_id)
         
         return True
+
+def create_data_manager(data_dir, backend=None):
+    """
+    저장소 종류에 맞는 데이터 관리자 생성
+    
+    Args:
+        data_dir (str): 데이터 디렉토리 경로
+        backend (str, optional): 'csv' 또는 'sqlite' (없으면 RANK_TRACKER_BACKEND 환경 변수, 기본값 'csv')
+        
+    Returns:
+        DataManager: 데이터 관리자
+    """
+    backend = (backend or os.environ.get('RANK_TRACKER_BACKEND') or 'csv').lower()
+    
+    if backend == 'csv':
+        return DataManager(data_dir)
+    
+    if backend == 'sqlite':
+        from modules.sqlite_data_manager import SQLiteDataManager
+        return SQLiteDataManager(data_dir)
+    
+    raise ValueError(f"지원하지 않는 저장소입니다: {backend}")
@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+def _as_float(values):
+    """datetime/숫자 열을 계산용 float 배열로 변환"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('int64').to_numpy(dtype=float)
+    return pd.to_numeric(values).to_numpy(dtype=float)
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets로 남길 점의 위치
+
+    첫 점과 마지막 점은 항상 남기고, 나머지는 threshold - 2개의 구간마다
+    앞에서 고른 점, 다음 구간의 평균점과 이루는 삼각형이 가장 큰 점 하나를 고릅니다.
+
+    Args:
+        x (numpy.ndarray): 정렬된 x 값
+        y (numpy.ndarray): y 값
+        threshold (int): 남길 점 수
+
+    Returns:
+        numpy.ndarray: 남길 점의 위치 (오름차순)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+
+        # 다음 구간의 평균점 (마지막 구간이면 마지막 점)
+        if end < next_end:
+            average_x = x[end:next_end].mean()
+            average_y = y[end:next_end].mean()
+        else:
+            average_x, average_y = x[n - 1], y[n - 1]
+
+        areas = np.abs(
+            (x[selected] - average_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (average_y - y[selected])
+        )
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+
+    indices[-1] = n - 1
+    return indices
+
+def minmax_indices(y, threshold):
+    """
+    구간별 최소/최대 점의 위치 (급등락을 놓치지 않음)
+
+    Args:
+        y (numpy.ndarray): y 값 (x 순서)
+        threshold (int): 남길 최대 점 수 (구간 하나에 2개)
+
+    Returns:
+        numpy.ndarray: 남길 점의 위치 (오름차순)
+    """
+    n = len(y)
+    buckets = threshold // 2
+    if threshold >= n or buckets < 1:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    indices = set()
+    for start, end in zip(edges[:-1], edges[1:]):
+        if start < end:
+            indices.add(start + int(np.argmin(y[start:end])))
+            indices.add(start + int(np.argmax(y[start:end])))
+    return np.array(sorted(indices), dtype=int)
+
+def _select_indices(x_values, y_values, threshold, method):
+    """값이 있는 점 중 남길 위치 (threshold가 3보다 작으면 고르게 띄운 점, 0이면 계열 전체 제외)"""
+    n = len(x_values)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.unique(np.linspace(0, n - 1, threshold).round().astype(int))
+    if method == "lttb":
+        return lttb_indices(x_values, y_values, threshold)
+    return minmax_indices(y_values, threshold)
+
+def downsample(frame, x, y, max_points, group=None, method="lttb"):
+    """
+    그래프에 보낼 점 수를 max_points 이하로 줄이기
+
+    점 수가 max_points 이하이면 frame을 그대로 반환합니다. 줄일 때는 group 열이 있으면 계열별로
+    값이 있는 점 수에 비례해서 나눠 줄이고(계열이 많으면 계열마다 3개보다 적게, 0개까지 줄어듦),
+    y 값이 없는 점(NaN)은 남긴 두 점 사이의 끊긴 구간마다 한 행만 남겨 그래프의 끊김을 유지합니다.
+    끊김 표시 행도 max_points에 포함합니다.
+
+    Args:
+        frame (pandas.DataFrame): 그래프 데이터
+        x (str): x 열 (datetime 또는 숫자)
+        y (str): y 열
+        max_points (int): 남길 최대 점 수 (전체)
+        group (str, optional): 계열을 나누는 열 (예: 키워드)
+        method (str): 'lttb' 또는 'minmax'
+
+    Returns:
+        pandas.DataFrame: 줄인 데이터 (원래 행 그대로, x 순서)
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"지원하지 않는 다운샘플링 방식입니다: {method} ({', '.join(DOWNSAMPLE_METHODS)} 중 하나)")
+
+    if len(frame) <= max_points:
+        return frame
+
+    if group is not None:
+        series = [part.sort_values(x, kind='stable') for _, part in frame.groupby(group, sort=False)]
+    else:
+        series = [frame.sort_values(x, kind='stable')]
+
+    # 계열별 값이 있는 점의 위치와, 값이 있는 두 점 사이에서 끊긴 구간의 첫 위치
+    found = []
+    gaps = []
+    for part in series:
+        missing = part[y].isna().to_numpy()
+        positions = np.flatnonzero(~missing)
+        starts = np.flatnonzero(missing & ~np.concatenate(([True], missing[:-1])))
+        found.append(positions)
+        if len(positions):
+            gaps.append(starts[(starts > positions[0]) & (starts < positions[-1])])
+        else:
+            gaps.append(starts[:0])
+
+    # 끊김 표시 행은 남긴 점 사이마다 하나 이하이므로, 끊긴 구간이 많으면 값이 있는 점에 절반만 씀
+    total = sum(len(positions) for positions in found)
+    gap_count = sum(len(starts) for starts in gaps)
+    budget = max_points - gap_count if gap_count <= max_points // 2 else max_points // 2
+
+    # 점 수에 비례해서 나누고 남는 점은 나머지가 큰 계열부터 하나씩 (합계가 budget을 넘지 않음)
+    counts = np.array([len(positions) for positions in found], dtype=float)
+    shares = budget * counts / total if total else counts
+    thresholds = np.floor(shares).astype(int)
+    leftover = min(budget - int(thresholds.sum()), len(series))
+    thresholds[np.argsort(thresholds - shares, kind='stable')[:leftover]] += 1
+    parts = []
+
+    for part, positions, starts, threshold in zip(series, found, gaps, thresholds):
+        if threshold == 0 or len(positions) == 0:
+            continue
+
+        values = part.iloc[positions]
+        kept = positions[_select_indices(_as_float(values[x]), _as_float(values[y]), threshold, method)]
+
+        # 남긴 두 점 사이에 끊긴 구간이 있으면 그 사이의 첫 끊김 행만 남김
+        between = np.searchsorted(kept, starts)
+        inner = (between > 0) & (between < len(kept))
+        _, first = np.unique(between[inner], return_index=True)
+        markers = starts[inner][first]
+
+        parts.append(part.iloc[np.sort(np.concatenate((kept, markers)))])
+
+    if not parts:
+        return frame.iloc[:0]
+    return pd.concat(parts).sort_values(x, kind='stable')
@@ -0,0 +1,179 @@
+import os
+import json
+import shutil
+import pandas as pd
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+class ParquetHistoryArchive:
+    """월별로 파티션된 Parquet 검색 기록 보관소 (분석용 읽기 전용 사본)"""
+
+    SCHEMA_FIELDS = [
+        ('id', 'int64'),
+        ('company_id', 'int32'),
+        ('keyword_id', 'int32'),
+        ('rank', 'int32'),
+        ('search_time', 'timestamp[s]'),
+    ]
+
+    def __init__(self, archive_dir):
+        """
+        보관소 초기화
+
+        Args:
+            archive_dir (str): 보관소 디렉토리 경로
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet 보관소를 사용하려면 pyarrow를 설치해야 합니다. (pip install pyarrow)")
+
+        self.archive_dir = archive_dir
+        self.manifest_file = os.path.join(archive_dir, '_manifest.json')
+        self.schema = pa.schema([(name, pa.type_for_alias(alias)) for name, alias in self.SCHEMA_FIELDS])
+        self.partition_schema = pa.schema([('month', pa.string())])
+
+    def exists(self):
+        """보관소가 만들어져 있는지 확인"""
+        return os.path.exists(self.manifest_file)
+
+    def read_manifest(self):
+        """
+        보관소 정보 조회
+
+        Returns:
+            dict: 원본 파일 정보와 마지막 내보내기 시각 (없으면 None)
+        """
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def write(self, results, source_signature=None, months=None):
+        """
+        검색 결과를 월별 Parquet 파티션으로 저장
+
+        Args:
+            results (pandas.DataFrame): id, company_id, keyword_id, rank, search_time 열을 가진 검색 결과
+            source_signature (list, optional): 원본 저장소의 변경 확인용 값 (보관소가 최신인지 판단할 때 사용)
+            months (list, optional): 다시 쓸 월('YYYY-MM') 목록. 없으면 보관소 전체를 다시 씀
+
+        Returns:
+            int: 저장한 행 수
+        """
+        frame = results[[name for name, _ in self.SCHEMA_FIELDS]].copy()
+        frame['search_time'] = pd.to_datetime(frame['search_time'])
+        frame['month'] = frame['search_time'].dt.strftime('%Y-%m')
+
+        if months is None:
+            # 전체를 다시 쓰는 경우 기존 파티션은 모두 정리
+            if os.path.isdir(self.archive_dir):
+                shutil.rmtree(self.archive_dir)
+        else:
+            # 지정한 월의 파티션만 교체 (데이터가 모두 삭제된 월도 정리)
+            for month in months:
+                partition_dir = os.path.join(self.archive_dir, f"month={month}")
+                if os.path.isdir(partition_dir):
+                    shutil.rmtree(partition_dir)
+            frame = frame[frame['month'].isin(months)]
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        if not frame.empty:
+            table = pa.Table.from_pandas(
+                frame,
+                schema=self.schema.append(pa.field('month', pa.string())),
+                preserve_index=False
+            )
+            ds.write_dataset(
+                table,
+                self.archive_dir,
+                format='parquet',
+                partitioning=ds.partitioning(self.partition_schema, flavor='hive'),
+                existing_data_behavior='delete_matching',
+                basename_template='part-{i}.parquet'
+            )
+
+        with open(self.manifest_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'source_signature': list(source_signature) if source_signature is not None else None,
+                'exported_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }, f)
+
+        return len(frame)
+
+    def read(self, company_id=None, keyword_id=None, start_time=None, end_time=None, columns=None):
+        """
+        보관소에서 검색 결과 조회
+
+        기간 조건은 월 파티션 선택에, 업체/키워드 조건은 Parquet 행 그룹 통계에 적용되므로
+        필요한 파티션과 열만 읽습니다.
+
+        Args:
+            company_id (int, optional): 회사 ID 필터
+            keyword_id (int, optional): 키워드 ID 필터
+            start_time (datetime, optional): 이 시각 이후의 결과만 조회
+            end_time (datetime, optional): 이 시각 이전의 결과만 조회
+            columns (list, optional): 읽을 열 목록 (없으면 전체)
+
+        Returns:
+            pandas.DataFrame: 검색 결과 (search_time은 datetime 형식)
+        """
+        if columns is None:
+            columns = [name for name, _ in self.SCHEMA_FIELDS]
+
+        partition_files = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(self.archive_dir)
+            for name in names if name.endswith('.parquet')
+        ]
+        if not partition_files:
+            return self._empty_frame(columns)
+
+        dataset = ds.dataset(
+            self.archive_dir,
+            format='parquet',
+            schema=self.schema.append(pa.field('month', pa.string())),
+            partitioning=ds.partitioning(self.partition_schema, flavor='hive'),
+            exclude_invalid_files=True
+        )
+
+        condition = None
+
+        def add(expression):
+            nonlocal condition
+            condition = expression if condition is None else condition & expression
+
+        if company_id is not None:
+            add(ds.field('company_id') == int(company_id))
+
+        if keyword_id is not None:
+            add(ds.field('keyword_id') == int(keyword_id))
+
+        if start_time is not None:
+            start_time = pd.Timestamp(start_time).to_pydatetime()
+            add(ds.field('month') >= start_time.strftime('%Y-%m'))
+            add(ds.field('search_time') >= pa.scalar(start_time, pa.timestamp('s')))
+
+        if end_time is not None:
+            end_time = pd.Timestamp(end_time).to_pydatetime()
+            add(ds.field('month') <= end_time.strftime('%Y-%m'))
+            add(ds.field('search_time') <= pa.scalar(end_time, pa.timestamp('s')))
+
+        table = dataset.to_table(columns=list(columns), filter=condition)
+        frame = table.to_pandas()
+
+        if 'id' in frame.columns:
+            frame = frame.sort_values('id').reset_index(drop=True)
+
+        return frame
+
+    def _empty_frame(self, columns):
+        dtypes = dict(self.SCHEMA_FIELDS)
+        dtypes['search_time'] = 'datetime64[s]'
+        return pd.DataFrame({name: pd.Series(dtype=dtypes[name]) for name in columns})
@@ -0,0 +1,113 @@
+import pandas as pd
+
+RESULT_COLUMNS = ['id', 'company_id', 'keyword_id', 'rank', 'search_time']
+INTERVAL_COLUMNS = ['company_id', 'keyword_id', 'rank', 'first_seen', 'last_seen', 'first_id']
+CHECK_COLUMNS = ['keyword_id', 'search_time', 'first_id', 'company_ids']
+
+def compact_results(results):
+    """
+    검색 결과를 순위 구간과 검색 기록으로 압축
+
+    - 순위 구간: (업체, 키워드)의 (검색 시각, ID) 순서에서 순위가 바뀌지 않은 연속한 기록을
+      (순위, first_seen, last_seen, 첫 기록 ID) 한 행으로 묶음
+    - 검색 기록: 같은 키워드를 같은 시각에 검색해서 ID가 연속한 결과를 (첫 ID, 업체 ID 목록) 한 행으로 묶음
+
+    두 표로 expand_results()를 호출하면 원래 결과를 ID까지 그대로 복원할 수 있습니다.
+
+    Args:
+        results (pandas.DataFrame): id, company_id, keyword_id, rank, search_time 열을 가진 검색 결과
+
+    Returns:
+        tuple: (순위 구간 DataFrame, 검색 기록 DataFrame)
+    """
+    if results.empty:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS), pd.DataFrame(columns=CHECK_COLUMNS)
+
+    results = results[RESULT_COLUMNS].copy()
+    for column in ('id', 'company_id', 'keyword_id', 'rank'):
+        results[column] = results[column].astype(int)
+    results['search_time'] = results['search_time'].astype(str)
+
+    # 순위 구간: 조합별 시간 순서에서 조합이나 순위가 바뀌는 곳마다 새 구간
+    ordered = results.sort_values(['company_id', 'keyword_id', 'search_time', 'id'], kind='stable')
+    starts = (
+        (ordered['company_id'] != ordered['company_id'].shift())
+        | (ordered['keyword_id'] != ordered['keyword_id'].shift())
+        | (ordered['rank'] != ordered['rank'].shift())
+    )
+    intervals = ordered.groupby(starts.cumsum(), sort=False).agg(
+        company_id=('company_id', 'first'),
+        keyword_id=('keyword_id', 'first'),
+        rank=('rank', 'first'),
+        first_seen=('search_time', 'first'),
+        last_seen=('search_time', 'last'),
+        first_id=('id', 'first')
+    ).reset_index(drop=True)
+
+    # 검색 기록: ID 순서에서 키워드, 검색 시각이 같고 ID가 이어지는 행끼리 묶음
+    ordered = results.sort_values('id', kind='stable')
+    starts = (
+        (ordered['keyword_id'] != ordered['keyword_id'].shift())
+        | (ordered['search_time'] != ordered['search_time'].shift())
+        | (ordered['id'] != ordered['id'].shift() + 1)
+    )
+    groups = starts.cumsum()
+    checks = ordered.groupby(groups, sort=False).agg(
+        keyword_id=('keyword_id', 'first'),
+        search_time=('search_time', 'first'),
+        first_id=('id', 'first')
+    )
+    checks['company_ids'] = ordered['company_id'].astype(str).groupby(groups, sort=False).agg(';'.join)
+
+    return intervals[INTERVAL_COLUMNS], checks.reset_index(drop=True)[CHECK_COLUMNS]
+
+def expand_results(intervals, checks):
+    """
+    순위 구간과 검색 기록을 검색 결과 형태(실행별 한 행)로 복원
+
+    Args:
+        intervals (pandas.DataFrame): compact_results()가 만든 순위 구간
+        checks (pandas.DataFrame): compact_results()가 만든 검색 기록
+
+    Returns:
+        pandas.DataFrame: id 순서의 검색 결과
+    """
+    if checks.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    rows = checks[['keyword_id', 'search_time', 'first_id']].copy()
+    rows['company_id'] = checks['company_ids'].astype(str).str.split(';')
+    rows = rows.explode('company_id', ignore_index=True)
+    rows['company_id'] = rows['company_id'].astype(int)
+    rows['keyword_id'] = rows['keyword_id'].astype(int)
+    rows['id'] = rows['first_id'].astype(int) + rows.groupby('first_id').cumcount()
+    rows['search_time'] = rows['search_time'].astype(str)
+    rows['time'] = pd.to_datetime(rows['search_time'])
+    rows['order_id'] = rows['id']
+    rows['is_span'] = False
+
+    # 조합별 (시각, ID) 순서에서 각 기록에 바로 앞에서 시작한 순위 구간의 순위 붙이기
+    # (같은 시각에 기록이 여러 개여도 ID로 구간을 가름)
+    spans = intervals[['company_id', 'keyword_id', 'rank']].copy()
+    spans['company_id'] = spans['company_id'].astype(int)
+    spans['keyword_id'] = spans['keyword_id'].astype(int)
+    spans['rank'] = spans['rank'].astype(float)
+    spans['time'] = pd.to_datetime(intervals['first_seen'].astype(str))
+    spans['order_id'] = intervals['first_id'].astype(int)
+    spans['is_span'] = True
+
+    keys = ['company_id', 'keyword_id']
+    combined = pd.concat([spans, rows[keys + ['id', 'search_time', 'time', 'order_id', 'is_span']]], ignore_index=True)
+    # 같은 (시각, ID)에서는 구간이 기록보다 먼저 오도록 정렬
+    combined = combined.sort_values(
+        keys + ['time', 'order_id', 'is_span'],
+        ascending=[True, True, True, True, False],
+        kind='stable'
+    )
+    combined['rank'] = combined.groupby(keys)['rank'].ffill()
+
+    expanded = combined[~combined['is_span']].dropna(subset=['rank'])
+    expanded['id'] = expanded['id'].astype(int)
+    expanded['rank'] = expanded['rank'].astype(int)
+
+    return expanded.sort_values('id', kind='stable')[RESULT_COLUMNS].reset_index(drop=True)
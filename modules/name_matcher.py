@@ -0,0 +1,189 @@
+import re
+import difflib
+import unicodedata
+from collections import deque
+
+MATCH_POLICIES = ("exact", "contains", "fuzzy")
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_name(name):
+    """
+    상호명 비교용 정규화 (NFKC, 공백 제거, 대소문자 무시)
+
+    Args:
+        name (str): 상호명
+
+    Returns:
+        str: 정규화한 상호명
+    """
+    return _WHITESPACE.sub("", unicodedata.normalize("NFKC", name or "")).casefold()
+
+class NameMatcher:
+    """
+    여러 업체 상호명을 검색 결과 목록에서 한 번에 찾는 매처
+
+    업체 상호명은 만들 때 한 번만 정규화하고, 정책에 따라 다음 방식으로 찾습니다.
+
+    - exact: 정규화한 상호명이 같은 항목
+    - contains: 검색 결과 상호명이 업체 상호명을 포함하거나 업체 상호명에 포함되는 항목.
+      포함하는 경우는 모든 업체 상호명으로 만든 Aho-Corasick 오토마톤으로 항목마다 한 번만 훑고,
+      포함되는 경우는 업체 상호명의 모든 부분 문자열 색인에서 찾습니다.
+    - fuzzy: contains로 찾지 못한 업체만 유사도(difflib)가 fuzzy_threshold 이상인 항목
+    """
+
+    def __init__(self, shop_names, policy="contains", fuzzy_threshold=0.85):
+        """
+        매처 초기화
+
+        Args:
+            shop_names (list): 찾을 업체 상호명 목록
+            policy (str): 'exact', 'contains' 또는 'fuzzy'
+            fuzzy_threshold (float): fuzzy 정책에서 같은 상호로 볼 최소 유사도 (0~1)
+        """
+        if policy not in MATCH_POLICIES:
+            raise ValueError(f"지원하지 않는 매칭 정책입니다: {policy} ({', '.join(MATCH_POLICIES)} 중 하나)")
+
+        self.policy = policy
+        self.fuzzy_threshold = fuzzy_threshold
+        self.shop_names = list(dict.fromkeys(shop_names))
+
+        # 정규화한 상호명별 업체 목록 (정규화하면 빈 문자열인 상호명은 어떤 항목과도 일치하지 않음)
+        self.normalized = {shop_name: normalize_name(shop_name) for shop_name in self.shop_names}
+        self.by_normalized = {}
+        for shop_name, normalized in self.normalized.items():
+            if normalized:
+                self.by_normalized.setdefault(normalized, []).append(shop_name)
+
+        if policy != "exact":
+            self._build_automaton()
+            self._build_substring_index()
+
+    def _build_automaton(self):
+        """정규화한 업체 상호명으로 Aho-Corasick 오토마톤 생성"""
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for normalized, shop_names in self.by_normalized.items():
+            state = 0
+            for char in normalized:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] = self.output[state] + tuple(shop_names)
+
+        # 너비 우선으로 실패 링크를 만들고, 실패 링크를 따라 도달하는 출력도 합쳐 둠
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def _build_substring_index(self):
+        """정규화한 업체 상호명의 모든 부분 문자열 → 업체 목록 색인 (검색 결과 상호명이 업체 상호명에 포함되는 경우)"""
+        self.substrings = {}
+        for normalized, shop_names in self.by_normalized.items():
+            length = len(normalized)
+            for start in range(length):
+                for end in range(start + 1, length + 1):
+                    self.substrings.setdefault(normalized[start:end], set()).update(shop_names)
+
+    def covers(self, shop_names):
+        """모든 상호명이 이 매처로 찾을 수 있는 업체인지 확인"""
+        return all(shop_name in self.normalized for shop_name in shop_names)
+
+    def _contained_shops(self, text):
+        """정규화한 텍스트에 포함된 업체 상호명 (오토마톤으로 한 번 훑음)"""
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            if self.output[state]:
+                found.update(self.output[state])
+        return found
+
+    def match(self, place_name):
+        """
+        검색 결과 상호명 하나와 일치하는 업체 상호명 (fuzzy 정책의 유사도 비교는 제외)
+
+        Args:
+            place_name (str): 검색 결과 상호명
+
+        Returns:
+            set: 일치하는 업체 상호명 집합
+        """
+        normalized = normalize_name(place_name)
+        if not normalized:
+            return set()
+
+        if self.policy == "exact":
+            return set(self.by_normalized.get(normalized, ()))
+
+        return self._contained_shops(normalized) | self.substrings.get(normalized, set())
+
+    def find_ranks(self, place_names, shop_names=None, offset=0):
+        """
+        검색 결과 목록을 한 번 훑어서 업체별 순위 찾기 (처음 일치한 순위)
+
+        Args:
+            place_names (list): 순위 순서대로의 검색 결과 상호명 목록
+            shop_names (list, optional): 찾을 업체 상호명 (없으면 매처의 모든 업체)
+            offset (int): 목록 첫 항목 앞의 순위 수 (다음 페이지를 찾을 때)
+
+        Returns:
+            dict: 찾은 업체 상호명별 순위
+        """
+        remaining = set(self.shop_names if shop_names is None else shop_names)
+        ranks = {}
+
+        for rank, place_name in enumerate(place_names, start=offset + 1):
+            if not remaining:
+                break
+            if not place_name:
+                continue
+
+            for shop_name in self.match(place_name) & remaining:
+                ranks[shop_name] = rank
+            remaining -= ranks.keys()
+
+        if self.policy == "fuzzy" and remaining:
+            ranks.update(self._find_fuzzy_ranks(place_names, remaining, offset))
+
+        return ranks
+
+    def _find_fuzzy_ranks(self, place_names, shop_names, offset):
+        """포함 관계로 찾지 못한 업체를 유사도로 찾기"""
+        normalized_places = [normalize_name(place_name) for place_name in place_names]
+        ranks = {}
+
+        for shop_name in shop_names:
+            normalized = self.normalized[shop_name]
+            if not normalized:
+                continue
+
+            # 업체마다 비교기를 새로 만듦 (여러 스레드가 같은 매처를 공유하므로)
+            matcher = difflib.SequenceMatcher(None, "", normalized, autojunk=False)
+            for rank, place in enumerate(normalized_places, start=offset + 1):
+                if not place:
+                    continue
+                matcher.set_seq1(place)
+                if (matcher.real_quick_ratio() >= self.fuzzy_threshold
+                        and matcher.quick_ratio() >= self.fuzzy_threshold
+                        and matcher.ratio() >= self.fuzzy_threshold):
+                    ranks[shop_name] = rank
+                    break
+
+        return ranks
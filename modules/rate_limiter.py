@@ -0,0 +1,350 @@
+import time
+import random
+import threading
+import urllib.parse
+
+class TokenBucket:
+    """토큰 버킷 방식의 요청 속도 제한기 (스레드 안전)"""
+
+    def __init__(self, rate, capacity=1):
+        """
+        토큰 버킷 초기화
+
+        Args:
+            rate (float): 초당 채워지는 토큰 수 (초당 허용 요청 수)
+            capacity (int): 버킷 크기 (한 번에 몰아서 보낼 수 있는 최대 요청 수)
+        """
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def set_rate(self, rate):
+        """
+        초당 채워지는 토큰 수 변경 (지금까지 쌓인 토큰은 이전 속도로 계산)
+
+        Args:
+            rate (float): 새 초당 허용 요청 수
+        """
+        with self.lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def acquire(self):
+        """
+        토큰 하나를 얻을 때까지 대기
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        waited = 0.0
+
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+class HostRateLimiter:
+    """호스트별로 별도의 토큰 버킷을 두는 속도 제한기"""
+
+    def __init__(self, rate, capacity=1):
+        """
+        호스트별 속도 제한기 초기화
+
+        Args:
+            rate (float): 호스트별 초당 허용 요청 수
+            capacity (int): 호스트별 버킷 크기
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def get_bucket(self, host):
+        """호스트의 토큰 버킷 조회 (없으면 생성)"""
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self.buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url):
+        """
+        URL의 호스트에 대해 요청 허가를 얻을 때까지 대기
+
+        Args:
+            url (str): 요청할 URL
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        return self.get_bucket(host).acquire()
+
+    def get_stats(self):
+        """
+        호스트별 속도 제한 통계 조회
+
+        Returns:
+            dict: 호스트별 현재 초당 허용 요청 수
+        """
+        with self.lock:
+            return {host: {"rate": bucket.rate} for host, bucket in self.buckets.items()}
+
+class AdaptiveHostRateLimiter(HostRateLimiter):
+    """
+    응답에 따라 호스트별 요청 속도를 조절하는 속도 제한기 (AIMD)
+
+    정상 응답이 이어지면 초당 요청 수를 1초에 increase_step씩 늘리고,
+    429/5xx 응답이나 평소보다 크게 늘어난 응답 시간을 받으면 decrease_factor를 곱해 줄입니다.
+    동시에 보낸 요청들의 실패가 한꺼번에 돌아와도 한 번만 줄이도록, 줄인 뒤 한 요청 간격 동안은 다시 줄이지 않습니다.
+    """
+
+    def __init__(self, rate, capacity=1, min_rate=None, max_rate=None,
+                 increase_step=None, decrease_factor=0.5, latency_factor=2.0):
+        """
+        적응형 속도 제한기 초기화
+
+        Args:
+            rate (float): 호스트별 시작 초당 요청 수
+            capacity (int): 호스트별 버킷 크기
+            min_rate (float, optional): 최소 초당 요청 수 (없으면 시작 값의 1/10)
+            max_rate (float, optional): 최대 초당 요청 수 (없으면 시작 값)
+            increase_step (float, optional): 정상일 때 1초에 늘리는 초당 요청 수 (없으면 시작 값의 1/10)
+            decrease_factor (float): 혼잡 신호를 받았을 때 곱하는 값 (0~1)
+            latency_factor (float): 응답 시간이 평소의 몇 배를 넘으면 혼잡으로 볼지
+        """
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase_step = increase_step if increase_step is not None else rate / 10
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.host_stats = {}
+
+    def _host_stats(self, host):
+        stats = self.host_stats.get(host)
+        if stats is None:
+            stats = {"baseline_latency": None, "last_decrease": 0.0, "increases": 0, "decreases": 0}
+            self.host_stats[host] = stats
+        return stats
+
+    def record(self, url, status_code=None, latency=None):
+        """
+        응답 결과를 반영해서 호스트의 초당 요청 수 조절
+
+        Args:
+            url (str): 요청한 URL
+            status_code (int, optional): 응답 상태 코드 (연결 오류 등으로 응답이 없으면 None)
+            latency (float, optional): 응답 시간 (초)
+
+        Returns:
+            float: 조절한 뒤의 초당 요청 수
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        bucket = self.get_bucket(host)
+
+        with self.lock:
+            stats = self._host_stats(host)
+            baseline = stats["baseline_latency"]
+            slow = baseline is not None and latency is not None and latency > baseline * self.latency_factor
+            congested = status_code is None or status_code == 429 or status_code >= 500 or slow
+
+            if congested:
+                now = time.monotonic()
+                if now - stats["last_decrease"] >= 1 / bucket.rate:
+                    bucket.set_rate(max(bucket.rate * self.decrease_factor, self.min_rate))
+                    stats["last_decrease"] = now
+                    stats["decreases"] += 1
+            else:
+                # 초당 요청 수만큼 성공하면 1초에 increase_step만큼 늘어남
+                if bucket.rate < self.max_rate:
+                    bucket.set_rate(min(bucket.rate + self.increase_step / bucket.rate, self.max_rate))
+                    stats["increases"] += 1
+                if latency is not None:
+                    stats["baseline_latency"] = latency if baseline is None else baseline * 0.9 + latency * 0.1
+
+            return bucket.rate
+
+    def get_stats(self):
+        """
+        호스트별 속도 조절 통계 조회
+
+        Returns:
+            dict: 호스트별 현재 초당 요청 수, 평소 응답 시간, 늘린/줄인 횟수
+        """
+        with self.lock:
+            return {
+                host: {
+                    "rate": bucket.rate,
+                    "baseline_latency": self._host_stats(host)["baseline_latency"],
+                    "increases": self._host_stats(host)["increases"],
+                    "decreases": self._host_stats(host)["decreases"]
+                }
+                for host, bucket in self.buckets.items()
+            }
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 요청을 보내지 않은 경우"""
+
+class CircuitBreaker:
+    """
+    호스트별 회로 차단기
+
+    연속으로 failure_threshold번 실패한 호스트에는 reset_timeout 동안 요청을 보내지 않고,
+    그 뒤 요청 하나를 시험 삼아 보내서 성공하면 다시 정상 상태로 돌아갑니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        """
+        회로 차단기 초기화
+
+        Args:
+            failure_threshold (int): 회로를 여는 연속 실패 횟수
+            reset_timeout (float): 회로를 연 뒤 시험 요청을 보내기까지 기다리는 시간 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def _host_state(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = {"state": self.CLOSED, "failures": 0, "opened_at": 0.0, "trial_in_flight": False, "opens": 0}
+            self.hosts[host] = state
+        return state
+
+    def before_request(self, url):
+        """
+        요청을 보내도 되는지 확인
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 시험 요청이 이미 진행 중인 경우
+        """
+        host = urllib.parse.urlsplit(url).netloc
+
+        with self.lock:
+            state = self._host_state(host)
+
+            if state["state"] == self.OPEN:
+                remaining = state["opened_at"] + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(f"{host} 회로가 열려 있습니다. ({remaining:.0f}초 뒤 다시 시도)")
+                state["state"] = self.HALF_OPEN
+                state["trial_in_flight"] = False
+
+            if state["state"] == self.HALF_OPEN:
+                if state["trial_in_flight"]:
+                    raise CircuitOpenError(f"{host} 회로 시험 요청이 진행 중입니다.")
+                state["trial_in_flight"] = True
+
+    def record(self, url, success):
+        """
+        요청 결과 기록
+
+        Args:
+            url (str): 요청한 URL
+            success (bool): 성공 여부
+        """
+        host = urllib.parse.urlsplit(url).netloc
+
+        with self.lock:
+            state = self._host_state(host)
+            state["trial_in_flight"] = False
+
+            if success:
+                state["state"] = self.CLOSED
+                state["failures"] = 0
+                return
+
+            state["failures"] += 1
+            if state["state"] == self.HALF_OPEN or state["failures"] >= self.failure_threshold:
+                if state["state"] != self.OPEN:
+                    state["opens"] += 1
+                state["state"] = self.OPEN
+                state["opened_at"] = time.monotonic()
+
+    def get_stats(self):
+        """
+        호스트별 회로 상태 조회
+
+        Returns:
+            dict: 호스트별 상태, 연속 실패 횟수, 회로를 연 횟수
+        """
+        with self.lock:
+            return {
+                host: {"state": state["state"], "failures": state["failures"], "opens": state["opens"]}
+                for host, state in self.hosts.items()
+            }
+
+class RetryPolicy:
+    """지수적으로 늘어나는 무작위 대기 시간(full jitter)으로 재시도하는 정책"""
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_retries=3, base_delay=1.0, max_delay=30.0):
+        """
+        재시도 정책 초기화
+
+        Args:
+            max_retries (int): 최대 재시도 횟수 (0이면 재시도하지 않음)
+            base_delay (float): 첫 재시도의 최대 대기 시간 (초)
+            max_delay (float): 대기 시간 상한 (초)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, attempt, status_code=None):
+        """
+        재시도 여부 확인
+
+        Args:
+            attempt (int): 지금까지 재시도한 횟수
+            status_code (int, optional): 응답 상태 코드 (연결 오류 등으로 응답이 없으면 None)
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in self.RETRY_STATUS_CODES
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        재시도 전 대기 시간 계산
+
+        Args:
+            attempt (int): 지금까지 재시도한 횟수
+            retry_after (str, optional): 응답의 Retry-After 헤더 (초 단위일 때만 사용)
+
+        Returns:
+            float: 대기 시간 (초)
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.max_delay))
+            except ValueError:
+                pass
+
+        return delay
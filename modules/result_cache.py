@@ -0,0 +1,130 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+import tempfile
+
+class ResultCache:
+    """키워드별 검색 결과 상호명 목록을 gzip으로 압축해 디스크에 저장하는 TTL 캐시"""
+
+    def __init__(self, cache_dir, ttl=1800):
+        """
+        캐시 초기화
+
+        Args:
+            cache_dir (str): 캐시 파일 디렉토리
+            ttl (float): 캐시를 사용할 최대 경과 시간 (초, 0이면 읽지 않고 저장만 함)
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, keyword, source=None):
+        # 출처(검색 페이지 주소)가 다르면 다른 파일에 저장 (모의 서버 결과가 네이버 결과를 덮어쓰지 않음)
+        key = keyword.strip() if source is None else f"{source}\n{keyword.strip()}"
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json.gz")
+
+    def _read(self, path):
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, EOFError, json.JSONDecodeError):
+            return None
+
+    def get(self, keyword, source=None):
+        """
+        아직 유효한 캐시 조회
+
+        Args:
+            keyword (str): 검색 키워드
+            source (str, optional): 검색 결과를 가져온 곳 (없으면 네이버, 저장할 때와 같아야 사용)
+
+        Returns:
+            tuple: (상호명 목록, 가져온 시각(epoch 초), 가져온 목록 페이지 수, 마지막 페이지까지 가져왔는지 여부).
+                   없거나 만료되었으면 None
+        """
+        entry = self._read(self._path(keyword, source)) if self.ttl > 0 else None
+
+        if (entry is not None and entry.get("keyword") == keyword.strip() and entry.get("source") == source
+                and time.time() - entry["fetched_at"] <= self.ttl):
+            with self.lock:
+                self.hits += 1
+            return entry["place_names"], entry["fetched_at"], entry.get("pages", 1), entry.get("exhausted", False)
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, keyword, place_names, fetched_at=None, pages=1, exhausted=False, source=None):
+        """
+        검색 결과 저장 (임시 파일에 쓴 뒤 교체)
+
+        Args:
+            keyword (str): 검색 키워드
+            place_names (list): 순위 순서대로의 상호명 목록
+            fetched_at (float, optional): 가져온 시각 (epoch 초, 없으면 현재 시각)
+            pages (int): 가져온 목록 페이지 수
+            exhausted (bool): 마지막 페이지까지 가져왔는지 여부
+            source (str, optional): 검색 결과를 가져온 곳 (없으면 네이버)
+        """
+        entry = {
+            "keyword": keyword.strip(),
+            "source": source,
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "place_names": place_names,
+            "pages": pages,
+            "exhausted": exhausted
+        }
+
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+            os.replace(temp_path, self._path(keyword, source))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def prune(self, max_age=None):
+        """
+        오래된 캐시 파일 삭제
+
+        Args:
+            max_age (float, optional): 이보다 오래된 파일 삭제 (초, 없으면 TTL)
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        max_age = self.ttl if max_age is None else max_age
+        cutoff = time.time() - max_age
+        removed = 0
+
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.json.gz') and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+
+        return removed
+
+    def get_stats(self):
+        """
+        캐시 적중 통계 조회
+
+        Returns:
+            dict: hits, misses, hit_rate
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
@@ -0,0 +1,167 @@
+import os
+import json
+import logging
+import tempfile
+
+class RunCheckpoint:
+    """
+    업데이트 실행 중 저장을 마친 (키워드, 업체) 조합을 실행 날짜별로 기록하는 체크포인트
+
+    실행이 중간에 중단되어도 같은 날짜로 다시 실행하면 기록되지 않은 조합만 검색할 수 있습니다.
+    결과를 저장하기 전에 begin()으로 저장할 (업체, 키워드, 검색 시간)을 먼저 기록하므로, 저장과 완료 기록 사이에
+    중단되었으면 다시 실행할 때 resolve_pending()으로 이미 저장된 결과를 완료로 옮겨 같은 결과를 두 번 저장하지 않습니다.
+    """
+
+    def __init__(self, checkpoint_dir, run_date, keep=7, suffix=""):
+        """
+        체크포인트 초기화 (같은 날짜의 체크포인트 파일이 있으면 불러옴)
+
+        Args:
+            checkpoint_dir (str): 체크포인트 파일 디렉토리
+            run_date (str): 실행 날짜 (YYYY-MM-DD)
+            keep (int): 남겨 둘 최근 체크포인트 파일 수
+            suffix (str): 파일 이름에 붙일 구분자 (예: 샤드별 체크포인트)
+        """
+        self.logger = logging.getLogger("RunCheckpoint")
+        self.checkpoint_dir = checkpoint_dir
+        self.run_date = run_date
+        self.keep = keep
+        self.path = os.path.join(checkpoint_dir, f"update_{run_date}{suffix}.json")
+        self.completed = {}
+        self.pending = []
+
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"체크포인트 파일을 읽지 못해 처음부터 실행합니다: {e}")
+            return
+
+        self.completed = {
+            int(keyword_id): set(company_ids)
+            for keyword_id, company_ids in (data.get("completed") or {}).items()
+        }
+        self.pending = [
+            (int(company_id), int(keyword_id), str(search_time))
+            for company_id, keyword_id, search_time in data.get("pending") or []
+        ]
+
+    def remaining_companies(self, keyword_id, company_ids):
+        """
+        키워드에서 아직 저장하지 않은 업체 ID 목록
+
+        Args:
+            keyword_id (int): 키워드 ID
+            company_ids (list): 전체 업체 ID 목록
+
+        Returns:
+            list: 저장하지 않은 업체 ID 목록 (원래 순서 유지)
+        """
+        done = self.completed.get(int(keyword_id), set())
+        return [company_id for company_id in company_ids if int(company_id) not in done]
+
+    def completed_count(self):
+        """저장을 마친 조합 수"""
+        return sum(len(company_ids) for company_ids in self.completed.values())
+
+    def begin(self, records):
+        """
+        저장하기 전에 저장할 검색 결과의 (업체, 키워드, 검색 시간)을 기록
+
+        Args:
+            records (list): company_id, keyword_id, search_time 키를 가진 dict 목록
+        """
+        if not records:
+            return
+
+        self.pending = [
+            (int(record["company_id"]), int(record["keyword_id"]), str(record["search_time"]))
+            for record in records
+        ]
+        self.save()
+
+    def resolve_pending(self, saved_keys):
+        """
+        이전 실행이 저장한 뒤 완료로 기록하지 못한 결과를 완료로 옮김
+
+        Args:
+            saved_keys (set): 저장소에 있는 (업체 ID, 키워드 ID, 검색 시간) 조합
+
+        Returns:
+            int: 완료로 옮긴 결과 수 (저장되지 않은 나머지는 다시 검색)
+        """
+        if not self.pending:
+            return 0
+
+        saved = [key for key in self.pending if key in saved_keys]
+        for company_id, keyword_id, _ in saved:
+            self.completed.setdefault(keyword_id, set()).add(company_id)
+
+        self.pending = []
+        self.save()
+        return len(saved)
+
+    def mark_done(self, records):
+        """
+        저장한 검색 결과의 조합을 완료로 기록하고 체크포인트 파일 갱신
+
+        Args:
+            records (list): company_id, keyword_id 키를 가진 dict 목록
+        """
+        if not records:
+            return
+
+        for record in records:
+            self.completed.setdefault(int(record["keyword_id"]), set()).add(int(record["company_id"]))
+
+        self.pending = []
+        self.save()
+
+    def save(self):
+        """체크포인트 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        data = {
+            "run_date": self.run_date,
+            "completed": {
+                str(keyword_id): sorted(company_ids)
+                for keyword_id, company_ids in sorted(self.completed.items())
+            },
+            "pending": [list(key) for key in self.pending]
+        }
+
+        fd, temp_path = tempfile.mkstemp(dir=self.checkpoint_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def reset(self):
+        """이 날짜의 체크포인트를 비움 (--force)"""
+        self.completed = {}
+        self.pending = []
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def prune(self):
+        """
+        오래된 체크포인트 파일 삭제 (최근 keep개만 남김)
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        names = sorted(
+            name for name in os.listdir(self.checkpoint_dir)
+            if name.startswith("update_") and name.endswith(".json")
+        )
+        removed = 0
+
+        for name in names[:-self.keep] if self.keep > 0 else names:
+            os.remove(os.path.join(self.checkpoint_dir, name))
+            removed += 1
+
+        return removed
@@ -1,189 +1,732 @@
+import os
+import json
 import time
 import logging
 import requests
 import urllib.parse
-from bs4 import BeautifulSoup
+import tempfile
+import threading
+from bs4 import BeautifulSoup, SoupStrainer, FeatureNotFound
+from collections import Counter
+from requests.adapters import HTTPAdapter
+
+from modules.selector_cascade import AdaptiveSelectorCascade
+from modules.rate_limiter import RetryPolicy, CircuitOpenError
+from modules.name_matcher import NameMatcher
+
+# 장소 목록 선택자 (기본 시도 순서)
+LIST_SELECTORS = [
+    "div.Ryr1F#_pcmap_list_scroll_container > ul > li",
+    "li.VLTHu",  # 대체 선택자
+    "li.UEzoS",  # 또 다른 대체 선택자
+    # PyQt 버전에서 참고한 추가 선택자들
+    "ul._3l82D > li",
+    "ul._1s-8x > li",
+    "div.place_section > ul > li",
+    ".api_subject_bx > ul > li",
+    "div._1EKsQ li.YjsMB",
+]
+
+# 광고 표시 선택자 (하나라도 있으면 광고)
+AD_SELECTORS = [".gU6bV._DHlh", ".ad_area", ".ad-badge", ".OErwL", "span.OErwL"]
+
+# 상호명 선택자 (기본 시도 순서)
+NAME_SELECTORS = [
+    ".place_bluelink.tWIhh > span.O_Uah",
+    "span.place_bluelink",
+    "span.TYaxT",
+    "span.LDgIH",
+    "span.OXiLu",
+    "span._3Apve",
+    "span.place_bluelink._3Apve",
+    ".place_bluelink",
+    "a.place_link > span",
+]
+
+# 네이버 지도 검색 페이지와 목록(iframe) 페이지 기본 주소 (부하 테스트용 모의 서버 등으로 바꿀 수 있음)
+MAP_BASE_URL = "https://map.naver.com"
+PLACE_BASE_URL = "https://pcmap.place.naver.com"
+
+# 목록 페이지 URL 형식에서 검색어가 들어갈 자리
+QUERY_PLACEHOLDER = "{query}"
+
+# 목록 다음 페이지를 요청할 때 사용하는 파라미터
+PAGE_PARAM = "page"
+
+# fast 모드에서 파싱할 부분 (검색 페이지는 iframe 태그만, 목록 페이지는 목록 컨테이너만)
+IFRAME_STRAINER = SoupStrainer("iframe")
+LIST_CONTAINER_STRAINER = SoupStrainer(id="_pcmap_list_scroll_container")
+
+class _PooledHTTPAdapter(HTTPAdapter):
+    """실제 소켓 연결 횟수를 호스트별로 세는 HTTPAdapter (커넥션 재사용 확인용)"""
+    
+    def __init__(self, *args, **kwargs):
+        self.connect_counts = Counter()
+        super().__init__(*args, **kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        counts = self.connect_counts
+        
+        def counting_pool_class(pool_class):
+            class CountingConnection(pool_class.ConnectionCls):
+                def connect(self):
+                    counts[self.host] += 1
+                    super().connect()
+            
+            class CountingPool(pool_class):
+                ConnectionCls = CountingConnection
+            
+            return CountingPool
+        
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting_pool_class(pool_class)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
 
 class NaverPlaceSearchEngine:
     """네이버 플레이스 검색 엔진 클래스 (순수 requests/BeautifulSoup 사용)"""
     
-    def __init__(self, headless=True):  # headless 파라미터 유지 (호환성)
-        """검색 엔진 초기화"""
+    def __init__(self, headless=True, pool_connections=4, pool_maxsize=10,
+                 keep_alive=True, connect_timeout=5, read_timeout=10,
+                 rate_limiter=None, parser="lxml", parse_mode="fast",
+                 state_file=None, cache=None, snapshot_store=None,
+                 map_base_url=None, place_base_url=None,
+                 retry_policy=None, circuit_breaker=None, max_pages=5,
+                 match_policy="contains", name_matcher=None):  # headless 파라미터 유지 (호환성)
+        """
+        검색 엔진 초기화
+        
+        Args:
+            headless (bool): 사용하지 않음 (호환성 유지)
+            pool_connections (int): 커넥션 풀을 유지할 호스트 수
+            pool_maxsize (int): 호스트별 최대 유지 커넥션 수
+            keep_alive (bool): 요청 후 커넥션을 재사용할지 여부
+            connect_timeout (float): 연결 타임아웃 (초)
+            read_timeout (float): 응답 읽기 타임아웃 (초)
+            rate_limiter (HostRateLimiter, optional): 요청 전에 호출할 호스트별 속도 제한기
+            parser (str): BeautifulSoup 파서 ('lxml'이 없으면 'html.parser' 사용)
+            parse_mode (str): 'fast'는 필요한 부분만 파싱, 'full'은 문서 전체 파싱
+            state_file (str, optional): 학습한 목록 페이지 URL 형식 등을 실행 간에 유지할 JSON 파일 경로
+            cache (ResultCache, optional): 키워드별 검색 결과 캐시 (유효한 동안 네이버에 요청하지 않음)
+            snapshot_store (SnapshotStore, optional): 가져온 목록 페이지 원본을 보관할 저장소
+            map_base_url (str, optional): 지도 검색 페이지 주소 (없으면 RANK_TRACKER_MAP_BASE_URL 환경 변수 또는 네이버 지도)
+            place_base_url (str, optional): 목록 페이지 주소 (없으면 RANK_TRACKER_PLACE_BASE_URL 환경 변수 또는 네이버 플레이스)
+            retry_policy (RetryPolicy, optional): 429/5xx 응답과 연결 오류의 재시도 정책 (없으면 기본 정책)
+            circuit_breaker (CircuitBreaker, optional): 연속으로 실패하는 호스트에 요청을 멈추는 회로 차단기
+            max_pages (int): 찾지 못한 상호명이 있을 때 가져올 최대 목록 페이지 수
+            match_policy (str): 상호명 일치 정책 ('exact', 'contains', 'fuzzy')
+            name_matcher (NameMatcher, optional): 추적하는 모든 업체로 미리 만든 매처 (없거나 찾을 상호명이 없으면 검색마다 만듦)
+        """
         self.logger = logging.getLogger("NaverPlaceSearchEngine")
+        self.map_base_url = (map_base_url or os.environ.get('RANK_TRACKER_MAP_BASE_URL') or MAP_BASE_URL).rstrip("/")
+        self.place_base_url = (place_base_url or os.environ.get('RANK_TRACKER_PLACE_BASE_URL') or PLACE_BASE_URL).rstrip("/")
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Referer": "https://map.naver.com/"
+            "Referer": f"{self.map_base_url}/",
+            "Connection": "keep-alive" if keep_alive else "close"
+        }
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self._request_stats = Counter()
+        self.cache = cache
+        self.snapshot_store = snapshot_store
+        self.max_pages = max_pages
+        self.match_policy = name_matcher.policy if name_matcher is not None else match_policy
+        self.name_matcher = name_matcher
+        
+        # 파서 설정 (지정한 파서가 설치되어 있지 않으면 내장 파서 사용)
+        self.parser = parser
+        try:
+            BeautifulSoup("", parser)
+        except FeatureNotFound:
+            self.logger.warning(f"'{parser}' 파서를 사용할 수 없어 html.parser를 사용합니다.")
+            self.parser = "html.parser"
+        self.parse_mode = parse_mode
+        self._parse_stats = {}
+        self._lock = threading.Lock()
+        
+        # 선택자 묶음 (마지막으로 성공한 선택자부터 시도)
+        self.selectors = {
+            "list": AdaptiveSelectorCascade(LIST_SELECTORS),
+            "ad": AdaptiveSelectorCascade(AD_SELECTORS),
+            "name": AdaptiveSelectorCascade(NAME_SELECTORS)
         }
+        
+        # 학습한 상태 불러오기
+        self.state_file = state_file
+        state = self._load_state()
+        self.iframe_url_template = state.get("iframe_url_template")
+        if self.iframe_url_template and state.get("map_base_url", MAP_BASE_URL) != self.map_base_url:
+            # 다른 주소(예: 모의 서버 ↔ 실제 네이버)에서 알아낸 URL 형식은 사용하지 않음
+            self.logger.info(f"검색 페이지 주소가 달라 저장된 URL 형식을 사용하지 않습니다: {self.iframe_url_template}")
+            self.iframe_url_template = None
+        for name, cascade in self.selectors.items():
+            cascade.load((state.get("selector_stats") or {}).get(name))
+        
+        # 모든 검색이 재사용하는 세션 (TCP/TLS 핸드셰이크를 검색마다 반복하지 않음)
+        self.adapter = _PooledHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """학습한 상태를 저장하고 세션과 커넥션 풀 정리"""
+        self._save_state()
+        self.session.close()
+    
+    def get_connection_stats(self):
+        """
+        커넥션 재사용 통계 조회
+        
+        Returns:
+            dict: 요청 수, 새로 맺은 커넥션 수, 재사용된 요청 수 (호스트별 포함)
+        """
+        stats = {"requests": 0, "new_connections": 0, "reused_connections": 0, "hosts": {}}
+        
+        for key in list(self.adapter.poolmanager.pools.keys()):
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            
+            new_connections = self.adapter.connect_counts.get(key.key_host, 0)
+            host_stats = {
+                "requests": pool.num_requests,
+                "new_connections": new_connections,
+                "reused_connections": max(pool.num_requests - new_connections, 0)
+            }
+            stats["hosts"][f"{key.key_scheme}://{key.key_host}"] = host_stats
+            
+            for name in ("requests", "new_connections", "reused_connections"):
+                stats[name] += host_stats[name]
+        
+        return stats
+    
+    def get_request_stats(self):
+        """
+        재시도/회로 차단 통계 조회
+        
+        Returns:
+            dict: 시도한 요청 수, 재시도 수, 회로가 열려 보내지 않은 요청 수, 상태 코드별 응답 수 등
+        """
+        with self._lock:
+            return dict(self._request_stats)
+    
+    def _count(self, name):
+        with self._lock:
+            self._request_stats[name] += 1
+    
+    def _get(self, url):
+        """
+        공유 세션으로 GET 요청
+        
+        회로 차단기가 열려 있으면 요청하지 않고, 속도 제한기가 있으면 허가를 받은 뒤 요청합니다.
+        429/5xx 응답이나 연결 오류는 재시도 정책에 따라 기다렸다가 다시 요청하고,
+        응답 결과와 응답 시간은 속도 제한기(적응형인 경우)와 회로 차단기에 알립니다.
+        
+        Raises:
+            CircuitOpenError: 호스트의 회로가 열려 있는 경우
+            requests.RequestException: 재시도한 뒤에도 연결 오류 등으로 응답을 받지 못한 경우
+        """
+        attempt = 0
+        
+        while True:
+            if self.circuit_breaker is not None:
+                try:
+                    self.circuit_breaker.before_request(url)
+                except CircuitOpenError:
+                    self._count("circuit_open")
+                    raise
+            
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            
+            self._count("attempts")
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                status_code = response.status_code
+                error = None
+            except requests.RequestException as e:
+                # 연결 오류, 타임아웃뿐 아니라 응답을 읽다가 난 오류(ChunkedEncodingError 등)도 실패로 기록하고 재시도
+                response, status_code, error = None, None, e
+            except BaseException:
+                # 그 밖의 예외도 회로 차단기에 알려서 시험 요청이 진행 중인 상태로 남지 않게 함
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record(url, False)
+                raise
+            latency = time.perf_counter() - started
+            
+            self._count(f"status_{status_code}" if status_code is not None else "connection_errors")
+            if hasattr(self.rate_limiter, "record"):
+                self.rate_limiter.record(url, status_code, latency)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(url, status_code is not None and status_code not in RetryPolicy.RETRY_STATUS_CODES)
+            
+            if not self.retry_policy.should_retry(attempt, status_code):
+                if error is not None:
+                    raise error
+                return response
+            
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            delay = self.retry_policy.get_delay(attempt, retry_after)
+            attempt += 1
+            self._count("retries")
+            self.logger.warning(
+                f"요청 재시도 {attempt}/{self.retry_policy.max_retries} ({status_code or type(error).__name__}), "
+                f"{delay:.1f}초 후: {url}"
+            )
+            time.sleep(delay)
     
     def build_url(self, keyword) :
         """검색어를 기반으로 네이버 지도 검색 URL을 생성"""
         encoded_keyword = urllib.parse.quote(keyword)
-        return f"https://map.naver.com/p/search/{encoded_keyword}?searchType=place"
+        return f"{self.map_base_url}/p/search/{encoded_keyword}?searchType=place"
     
-    def search(self, keyword, shop_name, max_scrolls=50) :
+    def search(self, keyword, shop_name, max_scrolls=None) :
         """
         키워드로 검색하여 특정 상호명의 순위를 찾음
         
         Args:
             keyword (str): 검색 키워드
             shop_name (str): 찾을 상호명
-            max_scrolls (int): 사용하지 않음 (호환성 유지)
+            max_scrolls (int, optional): 최대 목록 페이지 수 (없으면 엔진의 max_pages)
             
         Returns:
             dict: 검색 결과 (순위, 성공 여부, 메시지 등)
         """
-        result = {
-            "keyword": keyword,
-            "shop_name": shop_name,
-            "rank": -1,
-            "success": False,
-            "message": "",
-            "search_time": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
+        return self.search_many(keyword, [shop_name], max_scrolls=max_scrolls)[shop_name]
+    
+    def _cache_source(self):
+        """캐시 항목을 구분할 출처 (네이버 주소를 쓰면 None, 모의 서버 등으로 바꿨으면 두 주소)"""
+        if self.map_base_url == MAP_BASE_URL and self.place_base_url == PLACE_BASE_URL:
+            return None
+        return f"{self.map_base_url} {self.place_base_url}"
+    
+    def search_many(self, keyword, shop_names, max_scrolls=None) :
+        """
+        키워드 검색 결과를 한 번만 가져와서 여러 상호명의 순위를 한꺼번에 찾음
         
-        try:
-            # 검색 URL 생성
-            url = self.build_url(keyword)
-            self.logger.info(f"검색 URL: {url}")
-            
-            # 세션 사용으로 변경
-            session = requests.Session()
-            session.headers.update(self.headers)
-            
-            # 페이지 요청
-            response = session.get(url, timeout=10)
+        목록 페이지는 한 페이지씩 가져오며, 모든 상호명을 찾았거나 최대 페이지 수에 이르면 멈춥니다.
+        
+        Args:
+            keyword (str): 검색 키워드
+            shop_names (list): 찾을 상호명 목록
+            max_scrolls (int, optional): 최대 목록 페이지 수 (없으면 엔진의 max_pages)
             
-            if response.status_code != 200:
-                result["message"] = f"페이지 요청 실패: 상태 코드 {response.status_code}"
-                self.logger.error(result["message"])
-                return result
+        Returns:
+            dict: 상호명별 검색 결과 (search()와 같은 형식, 캐시에서 가져온 경우 "cached": True,
+                  검색 결과 페이지를 가져오지 못한 경우 "fetch_failed": True)
+        """
+        max_pages = max(max_scrolls if max_scrolls is not None else self.max_pages, 1)
+        search_time = time.strftime("%Y-%m-%d %H:%M:%S")
+        results = {}
+        for shop_name in shop_names:
+            results[shop_name] = {
+                "keyword": keyword,
+                "shop_name": shop_name,
+                "rank": -1,
+                "success": False,
+                "message": "",
+                "search_time": search_time,
+                "fetch_failed": False
+            }
+        
+        if not results:
+            return results
+        
+        # 캐시에 아직 유효한 검색 결과가 있으면 그대로 사용 (검색 시간은 실제로 가져온 시각)
+        # 찾지 못한 상호명이 있는데 캐시가 이번 검색보다 얕게 가져온 결과라면 다시 가져옴
+        matcher = self._get_name_matcher(list(results))
+        ranks = {}
+        cached = self.cache.get(keyword, source=self._cache_source()) if self.cache is not None else None
+        
+        if cached is not None:
+            place_names, fetched_at, cached_pages, exhausted = cached
+            ranks = matcher.find_ranks(place_names, list(results))
+            if len(ranks) < len(results) and not exhausted and cached_pages < max_pages:
+                cached = None
+                ranks = {}
+        
+        if cached is not None:
+            error_message = None
+            search_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(fetched_at))
+            for result in results.values():
+                result["search_time"] = search_time
+                result["cached"] = True
+            self.logger.info(f"캐시된 검색 결과 사용: '{keyword}' ({search_time})")
+        else:
+            place_names = []
             
-            # HTML 파싱 (iframe 내용 직접 요청)
-            soup = BeautifulSoup(response.text, "html.parser")
+            def on_page(page_names):
+                # 이번 페이지에서 아직 찾지 못한 상호명만 찾고, 모두 찾았으면 멈춤
+                offset = len(place_names)
+                place_names.extend(page_names)
+                ranks.update(matcher.find_ranks(page_names, [name for name in results if name not in ranks], offset))
+                return len(ranks) == len(results)
             
-            # iframe URL 추출 시도
-            iframe_src = None
-            for iframe in soup.find_all("iframe"):
-                if iframe.get("id") == "searchIframe":
-                    iframe_src = iframe.get("src")
-                    break
+            try:
+                pages, exhausted, error_message = self._fetch_pages(keyword, max_pages, on_page)
+            except Exception as e:
+                pages, exhausted, error_message = 0, False, f"오류 발생: {type(e).__name__} - {e}"
             
-            if not iframe_src:
-                # iframe URL을 찾을 수 없는 경우 추정
-                iframe_src = f"https://pcmap.place.naver.com/place/list?query={urllib.parse.quote(keyword) }"
+            if error_message is not None:
+                place_names = None
+            elif self.cache is not None:
+                self.cache.put(keyword, place_names, pages=pages, exhausted=exhausted, source=self._cache_source())
+        
+        if place_names is None:
+            self.logger.error(error_message)
+            for result in results.values():
+                result["message"] = error_message
+                result["fetch_failed"] = True
+            return results
+        
+        # 광고를 제외한 순서가 곧 순위
+        for shop_name, rank in ranks.items():
+            result = results[shop_name]
+            result["rank"] = rank
+            result["success"] = True
+            result["message"] = f"'{shop_name}'은(는) '{keyword}' 검색 결과에서 {rank}위입니다."
+            self.logger.info(result["message"])
+        
+        remaining = [shop_name for shop_name in results if shop_name not in ranks]
+        if remaining:
+            # 로깅: 찾은 상점 목록 출력 (디버깅 도움)
+            found_shops = [name for name in place_names if name]
+            if found_shops:
+                self.logger.info(f"검색 결과 상점 목록: {', '.join(found_shops[:10])}" + (", ..." if len(found_shops) > 10 else ""))
             
-            # iframe 내용 요청
-            iframe_response = session.get(iframe_src, timeout=10)
+            # 찾지 못한 경우
+            for shop_name in remaining:
+                result = results[shop_name]
+                result["message"] = f"'{shop_name}'을(를) 찾을 수 없습니다."
+                self.logger.warning(result["message"])
+        
+        return results
+    
+    def _get_name_matcher(self, shop_names):
+        """미리 만든 매처가 모든 상호명을 찾을 수 있으면 그대로 쓰고, 아니면 이번 검색용 매처 생성"""
+        if self.name_matcher is not None and self.name_matcher.covers(shop_names):
+            return self.name_matcher
+        return NameMatcher(shop_names, policy=self.match_policy)
+    
+    def fetch_place_names(self, keyword, max_pages=1):
+        """
+        키워드 검색 결과를 최대 max_pages 페이지까지 가져와서 광고를 제외한 상호명 목록을 순위 순서대로 반환
+        
+        Args:
+            keyword (str): 검색 키워드
+            max_pages (int): 가져올 최대 목록 페이지 수
             
-            if iframe_response.status_code != 200:
-                result["message"] = f"iframe 요청 실패: 상태 코드 {iframe_response.status_code}"
-                self.logger.error(result["message"])
-                return result
+        Returns:
+            tuple: (상호명 목록, 오류 메시지). 실패 시 상호명 목록은 None
+        """
+        place_names = []
+        _, _, error_message = self._fetch_pages(keyword, max_pages, place_names.extend)
+        return (place_names if error_message is None else None), error_message
+    
+    def _fetch_pages(self, keyword, max_pages, on_page):
+        """
+        목록 페이지를 한 페이지씩 가져와서 상호명 목록을 on_page에 넘김
+        
+        on_page가 True를 반환하거나, 최대 페이지 수에 이르거나, 장소가 없는 페이지나
+        앞 페이지들에 없던 상호명이 하나도 없는 페이지(페이지 파라미터를 무시하는 서버)가 나오면 멈춥니다.
+        두 번째 페이지부터는 요청에 실패해도 그때까지 가져온 결과를 사용합니다.
+        
+        Args:
+            keyword (str): 검색 키워드
+            max_pages (int): 가져올 최대 목록 페이지 수
+            on_page (callable): 페이지별 상호명 목록을 받아 더 가져올 필요가 없으면 True를 반환하는 함수
             
-            # iframe 내용 파싱
-            iframe_soup = BeautifulSoup(iframe_response.text, "html.parser")
+        Returns:
+            tuple: (가져온 페이지 수, 마지막 페이지까지 가져왔는지 여부, 첫 페이지 오류 메시지)
+        """
+        place_names, error_message, list_url = self._fetch_first_page(keyword)
+        if place_names is None:
+            return 0, False, error_message
+        
+        pages = 1
+        seen_names = set(place_names)
+        if on_page(place_names):
+            return pages, False, None
+        
+        while pages < max_pages:
+            page_url = self._build_page_url(list_url, pages + 1)
+            self.logger.info(f"목록 {pages + 1}페이지 URL: {page_url}")
             
-            # 장소 목록 찾기 (여러 선택자 시도) - 두 번째 문서의 선택자 추가
-            place_items = iframe_soup.select("div.Ryr1F#_pcmap_list_scroll_container > ul > li")
+            try:
+                response = self._get(page_url)
+            except (requests.RequestException, CircuitOpenError) as e:
+                self.logger.warning(f"목록 {pages + 1}페이지 요청 오류 ({type(e).__name__}), {pages}페이지까지의 결과를 사용합니다.")
+                return pages, False, None
             
-            if not place_items:
-                place_items = iframe_soup.select("li.VLTHu")  # 대체 선택자
+            if response.status_code != 200:
+                self.logger.warning(f"목록 {pages + 1}페이지 요청 실패 (상태 코드 {response.status_code}), {pages}페이지까지의 결과를 사용합니다.")
+                return pages, False, None
             
+            self._save_snapshot(keyword, page_url, response.text)
+            place_items = self._select_place_items(response.text)
             if not place_items:
-                place_items = iframe_soup.select("li.UEzoS")  # 또 다른 대체 선택자
-                
-            # PyQt 버전에서 참고한 추가 선택자들
-            if not place_items:
-                place_items = iframe_soup.select("ul._3l82D > li")
-                
-            if not place_items:
-                place_items = iframe_soup.select("ul._1s-8x > li")
-                
-            if not place_items:
-                place_items = iframe_soup.select("div.place_section > ul > li")
-                
-            if not place_items:
-                place_items = iframe_soup.select(".api_subject_bx > ul > li")
-                
-            if not place_items:
-                place_items = iframe_soup.select("div._1EKsQ li.YjsMB")
+                # 더 이상 결과가 없음
+                return pages, True, None
             
-            if not place_items:
-                result["message"] = "장소 목록을 찾을 수 없습니다."
-                self.logger.error(result["message"])
-                return result
-            
-            # 장소 순위 찾기
-            rank = 0
-            found_shops = []  # 디버깅용 - 찾은 상점 목록
-            
-            for item in place_items:
-                # 광고 건너뛰기 - 여러 선택자 시도
-                ad_selectors = [".gU6bV._DHlh", ".ad_area", ".ad-badge", ".OErwL", "span.OErwL"]
-                is_ad = False
-                
-                for ad_selector in ad_selectors:
-                    ad_element = item.select_one(ad_selector)
-                    if ad_element:
-                        is_ad = True
-                        break
-                
-                if is_ad:
-                    continue
-                
-                rank += 1
-                
-                # 상점명 찾기 (여러 선택자 시도) - 두 번째 문서 참고하여 추가
-                shop_name_element = item.select_one(".place_bluelink.tWIhh > span.O_Uah")
-                
-                if not shop_name_element:
-                    shop_name_element = item.select_one("span.place_bluelink")
-                
-                if not shop_name_element:
-                    shop_name_element = item.select_one("span.TYaxT")
-                    
-                # 추가 선택자들
-                if not shop_name_element:
-                    shop_name_element = item.select_one("span.LDgIH")
-                    
-                if not shop_name_element:
-                    shop_name_element = item.select_one("span.OXiLu")
-                    
-                if not shop_name_element:
-                    shop_name_element = item.select_one("span._3Apve")
-                    
-                if not shop_name_element:
-                    shop_name_element = item.select_one("span.place_bluelink._3Apve")
-                    
-                if not shop_name_element:
-                    shop_name_element = item.select_one(".place_bluelink")
-                    
-                if not shop_name_element:
-                    shop_name_element = item.select_one("a.place_link > span")
-                
-                if shop_name_element:
-                    current_shop_name = shop_name_element.get_text().strip()
-                    found_shops.append(current_shop_name)  # 디버깅용
-                    
-                    # 부분 일치 검색으로 변경 (대소문자 구분 없이)
-                    if shop_name.lower() in current_shop_name.lower() or current_shop_name.lower() in shop_name.lower():
-                        result["rank"] = rank
-                        result["success"] = True
-                        result["message"] = f"'{shop_name}'은(는) '{keyword}' 검색 결과에서 {rank}위입니다."
-                        self.logger.info(result["message"])
-                        return result
+            page_names = self._extract_place_names(place_items)
+            if seen_names.issuperset(page_names):
+                # 같은 목록이 반복됨 (페이지 파라미터를 무시하는 서버), 중복 결과를 넣지 않고 멈춤
+                self.logger.warning(f"목록 {pages + 1}페이지에 새 상호명이 없어 {pages}페이지까지의 결과를 사용합니다.")
+                return pages, True, None
             
-            # 로깅: 찾은 상점 목록 출력 (디버깅 도움)
-            if found_shops:
-                self.logger.info(f"검색 결과 상점 목록: {', '.join(found_shops[:10])}" + (", ..." if len(found_shops) > 10 else ""))
+            pages += 1
+            seen_names.update(page_names)
+            if on_page(page_names):
+                break
+        
+        return pages, False, None
+    
+    def _build_page_url(self, list_url, page):
+        """목록 페이지 URL의 페이지 파라미터를 바꿔 다음 페이지 URL 생성"""
+        parts = urllib.parse.urlsplit(list_url)
+        params = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True) if name != PAGE_PARAM]
+        params.append((PAGE_PARAM, str(page)))
+        return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(params, quote_via=urllib.parse.quote)))
+    
+    def _fetch_first_page(self, keyword):
+        """
+        키워드 검색 결과 첫 목록 페이지를 가져와서 광고를 제외한 상호명 목록을 순위 순서대로 반환
+        
+        이전 검색에서 알아낸 목록 페이지(iframe) URL 형식이 있으면 목록 페이지를 바로 요청하고,
+        실패했을 때만 네이버 지도 검색 페이지에서 iframe URL을 다시 찾습니다.
+        
+        Args:
+            keyword (str): 검색 키워드
             
-            # 찾지 못한 경우
-            result["message"] = f"'{shop_name}'을(를) 찾을 수 없습니다."
-            self.logger.warning(result["message"])
+        Returns:
+            tuple: (상호명 목록, 오류 메시지, 목록 페이지 URL). 실패 시 상호명 목록은 None
+        """
+        template = self.iframe_url_template
+        
+        if template:
+            list_url = self._build_list_url(template, keyword)
+            self.logger.info(f"목록 URL: {list_url}")
             
+            try:
+                list_response = self._get(list_url)
+                if list_response.status_code == 200:
+                    self._save_snapshot(keyword, list_url, list_response.text)
+                    place_items = self._select_place_items(list_response.text)
+                    if place_items:
+                        return self._extract_place_names(place_items), None, list_url
+                    
+                    self.logger.warning("목록 페이지에서 장소 목록을 찾지 못해 검색 페이지에서 iframe URL을 다시 찾습니다.")
+                else:
+                    self.logger.warning(f"목록 페이지 요청 실패 (상태 코드 {list_response.status_code}), 검색 페이지에서 iframe URL을 다시 찾습니다.")
+            except requests.RequestException as e:
+                self.logger.warning(f"목록 페이지 요청 오류 ({type(e).__name__}), 검색 페이지에서 iframe URL을 다시 찾습니다.")
+        
+        # 검색 URL 생성
+        url = self.build_url(keyword)
+        self.logger.info(f"검색 URL: {url}")
+        
+        # 페이지 요청
+        response = self._get(url)
+        
+        if response.status_code != 200:
+            return None, f"페이지 요청 실패: 상태 코드 {response.status_code}", None
+        
+        # iframe URL 추출 시도 (iframe 태그만 파싱)
+        iframe_src = self._find_iframe_src(response.text)
+        
+        if iframe_src:
+            iframe_src = urllib.parse.urljoin(url, iframe_src)
+        else:
+            # iframe URL을 찾을 수 없는 경우 추정
+            iframe_src = f"{self.place_base_url}/place/list?query={urllib.parse.quote(keyword) }"
+        
+        # iframe 내용 요청
+        iframe_response = self._get(iframe_src)
+        
+        if iframe_response.status_code != 200:
+            return None, f"iframe 요청 실패: 상태 코드 {iframe_response.status_code}", None
+        
+        self._save_snapshot(keyword, iframe_src, iframe_response.text)
+        
+        # 장소 목록 찾기
+        place_items = self._select_place_items(iframe_response.text)
+        
+        if not place_items:
+            return None, "장소 목록을 찾을 수 없습니다.", None
+        
+        # 다음 검색부터 목록 페이지를 바로 요청할 수 있도록 URL 형식 기억
+        self._learn_iframe_url_template(iframe_src, keyword)
+        
+        return self._extract_place_names(place_items), None, iframe_src
+    
+    def _save_snapshot(self, keyword, url, html):
+        """스냅샷 저장소가 있으면 목록 페이지 원본 저장 (실패해도 검색은 계속)"""
+        if self.snapshot_store is None:
+            return
+        
+        try:
+            self.snapshot_store.save(keyword, url, html)
         except Exception as e:
-            result["message"] = f"오류 발생: {type(e).__name__} - {e}"
-            self.logger.error(result["message"])
+            self.logger.warning(f"스냅샷 저장 실패: {type(e).__name__} - {e}")
+    
+    def _build_list_url(self, template, keyword):
+        """URL 형식의 검색어 자리에 인코딩한 키워드를 넣어 목록 페이지 URL 생성"""
+        return template.replace(QUERY_PLACEHOLDER, urllib.parse.quote(keyword, safe=""))
+    
+    def _learn_iframe_url_template(self, iframe_src, keyword):
+        """
+        iframe URL에서 검색어 파라미터를 자리 표시자로 바꿔 URL 형식으로 저장
+        
+        Returns:
+            str: 알아낸 URL 형식 (검색어 파라미터를 찾지 못하면 None)
+        """
+        parts = urllib.parse.urlsplit(iframe_src)
+        params = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        
+        if not any(value == keyword for _, value in params):
+            self.logger.debug(f"iframe URL에서 검색어 파라미터를 찾지 못했습니다: {iframe_src}")
+            return None
+        
+        query = "&".join(
+            f"{urllib.parse.quote(name, safe='')}="
+            + (QUERY_PLACEHOLDER if value == keyword else urllib.parse.quote(value, safe=""))
+            for name, value in params
+        )
+        template = urllib.parse.urlunsplit(parts._replace(query=query))
+        
+        if template != self.iframe_url_template:
+            self.iframe_url_template = template
+            self.logger.info(f"목록 페이지 URL 형식 저장: {template}")
+            self._save_state()
+        
+        return template
+    
+    def _load_state(self):
+        """저장된 엔진 상태 (학습한 URL 형식 등) 불러오기"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"검색 엔진 상태 파일을 읽지 못했습니다: {e}")
+            return {}
+    
+    def _save_state(self):
+        """엔진 상태를 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.state_file:
+            return
+        
+        state = {
+            "map_base_url": self.map_base_url,
+            "iframe_url_template": self.iframe_url_template,
+            "selector_stats": {name: cascade.to_dict() for name, cascade in self.selectors.items()}
+        }
+        
+        with self._lock:
+            # 같은 상태 파일을 쓰는 다른 프로세스(샤드 등)와 임시 파일이 겹치지 않도록 고유한 이름 사용
+            state_dir = os.path.dirname(os.path.abspath(self.state_file))
+            os.makedirs(state_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=state_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.state_file)
+    
+    def get_parse_stats(self):
+        """
+        페이지 종류별 파싱 시간 통계 조회
         
-        return result
+        Returns:
+            dict: 페이지 종류('outer', 'list', 'list_full')별 파싱 횟수, 총/평균/최대 시간(초)
+        """
+        with self._lock:
+            stats = {}
+            for kind, (count, total, maximum) in self._parse_stats.items():
+                stats[kind] = {
+                    "pages": count,
+                    "total_time": total,
+                    "avg_time": total / count if count else 0.0,
+                    "max_time": maximum
+                }
+            return stats
+    
+    def _parse(self, html, kind, parse_only=None):
+        """HTML 파싱 후 페이지 종류별 파싱 시간 기록"""
+        started = time.perf_counter()
+        soup = BeautifulSoup(html, self.parser, parse_only=parse_only)
+        elapsed = time.perf_counter() - started
+        
+        with self._lock:
+            count, total, maximum = self._parse_stats.get(kind, (0, 0.0, 0.0))
+            self._parse_stats[kind] = (count + 1, total + elapsed, max(maximum, elapsed))
+        
+        self.logger.debug(f"파싱 시간 ({kind}, {self.parser}): {elapsed * 1000:.1f}ms")
+        return soup
+    
+    def _find_iframe_src(self, html):
+        """검색 페이지에서 검색 결과 iframe(searchIframe)의 URL 추출"""
+        parse_only = IFRAME_STRAINER if self.parse_mode == "fast" else None
+        soup = self._parse(html, "outer", parse_only)
+        
+        iframe = soup.find("iframe", id="searchIframe")
+        return iframe.get("src") if iframe else None
+    
+    def _select_place_items(self, html):
+        """
+        iframe 페이지에서 장소 목록 항목 찾기
+        
+        fast 모드에서는 목록 컨테이너 부분만 파싱해서 찾아보고,
+        없으면 (예전 레이아웃 등) 전체 문서를 파싱해서 선택자를 차례로 시도합니다.
+        """
+        if self.parse_mode == "fast":
+            soup = self._parse(html, "list", LIST_CONTAINER_STRAINER)
+            place_items = self._select_with_cascade(soup)
+            if place_items:
+                return place_items
+        
+        soup = self._parse(html, "list_full")
+        return self._select_with_cascade(soup)
+    
+    def _select_with_cascade(self, soup):
+        """장소 목록 선택자를 차례로 시도해서 처음으로 찾은 항목 반환"""
+        return self.selectors["list"].select(soup)
+    
+    def _extract_place_names(self, place_items):
+        """광고를 제외한 장소 항목의 상호명 목록 (상호명을 찾지 못한 항목은 빈 문자열)"""
+        place_names = []
+        
+        for item in place_items:
+            # 광고 건너뛰기
+            if self.selectors["ad"].matches_any(item):
+                continue
+            
+            # 상점명 찾기 (마지막으로 성공한 선택자부터 시도)
+            shop_name_element = self.selectors["name"].select_one(item)
+            
+            # 상점명을 찾지 못한 항목도 순위는 차지함 (기존 동작 유지)
+            place_names.append(shop_name_element.get_text().strip() if shop_name_element else "")
+        
+        return place_names
+    
+    def get_selector_stats(self):
+        """
+        선택자 묶음별 시도/적중 통계 조회
+        
+        Returns:
+            dict: 묶음 이름('list', 'ad', 'name')별 선택자 통계 목록 (현재 시도 순서)
+        """
+        return {name: cascade.get_stats() for name, cascade in self.selectors.items()}
@@ -0,0 +1,156 @@
+import threading
+import soupsieve
+
+class AdaptiveSelectorCascade:
+    """
+    CSS 선택자 목록을 차례로 시도하되, 마지막으로 성공한 선택자를 먼저 시도하는 선택자 묶음
+
+    선택자별 시도/적중 횟수를 기록해서 어떤 선택자가 더 이상 맞지 않는지 확인할 수 있고,
+    통계는 to_dict()/load()로 실행 간에 유지할 수 있습니다.
+    """
+
+    def __init__(self, selectors):
+        """
+        선택자 묶음 초기화
+
+        Args:
+            selectors (list): CSS 선택자 문자열 목록 (기본 시도 순서)
+        """
+        self.selectors = list(selectors)
+        self.compiled = {selector: soupsieve.compile(selector) for selector in self.selectors}
+        self.any_selector = soupsieve.compile(", ".join(self.selectors))
+        self.stats = {selector: {"tries": 0, "hits": 0} for selector in self.selectors}
+        self.last_success = None
+        self.order = list(self.selectors)
+        self.lock = threading.Lock()
+
+    def _record(self, tried, hit):
+        """시도/적중 횟수를 기록하고, 적중한 선택자가 바뀌었으면 시도 순서를 다시 계산"""
+        with self.lock:
+            for selector in tried:
+                self.stats[selector]["tries"] += 1
+
+            if hit is None:
+                return
+
+            self.stats[hit]["hits"] += 1
+            if hit != self.last_success:
+                self.last_success = hit
+                self._reorder()
+
+    def _reorder(self):
+        # 마지막으로 성공한 선택자 → 적중 횟수가 많은 순 → 원래 순서
+        default_index = {selector: index for index, selector in enumerate(self.selectors)}
+        self.order = sorted(
+            self.selectors,
+            key=lambda selector: (
+                selector != self.last_success,
+                -self.stats[selector]["hits"],
+                default_index[selector]
+            )
+        )
+
+    def select(self, tag):
+        """
+        선택자를 차례로 시도해서 처음으로 결과가 있는 선택자의 모든 일치 요소 반환
+
+        Returns:
+            list: 일치한 요소 목록 (모두 실패하면 빈 목록)
+        """
+        tried = []
+        for selector in self.order:
+            tried.append(selector)
+            elements = self.compiled[selector].select(tag)
+            if elements:
+                self._record(tried, selector)
+                return elements
+
+        self._record(tried, None)
+        return []
+
+    def select_one(self, tag):
+        """
+        선택자를 차례로 시도해서 처음으로 일치한 요소 반환
+
+        Returns:
+            Tag: 일치한 요소 (모두 실패하면 None)
+        """
+        tried = []
+        for selector in self.order:
+            tried.append(selector)
+            element = self.compiled[selector].select_one(tag)
+            if element is not None:
+                self._record(tried, selector)
+                return element
+
+        self._record(tried, None)
+        return None
+
+    def matches_any(self, tag):
+        """
+        선택자 중 하나라도 일치하는 요소가 있는지 확인
+
+        일치하지 않는 경우가 대부분이므로 모든 선택자를 합친 선택자로 한 번에 확인하고,
+        일치한 경우에만 어떤 선택자가 맞았는지 찾아 기록합니다.
+
+        Returns:
+            bool: 일치 여부
+        """
+        if self.any_selector.select_one(tag) is None:
+            self._record(self.selectors, None)
+            return False
+
+        for selector in self.order:
+            if self.compiled[selector].select_one(tag) is not None:
+                self._record(self.selectors, selector)
+                return True
+
+        self._record(self.selectors, None)
+        return False
+
+    def get_stats(self):
+        """
+        선택자별 통계 조회 (현재 시도 순서대로)
+
+        Returns:
+            list: selector, tries, hits, hit_rate 키를 가진 dict 목록
+        """
+        with self.lock:
+            return [
+                {
+                    "selector": selector,
+                    "tries": self.stats[selector]["tries"],
+                    "hits": self.stats[selector]["hits"],
+                    "hit_rate": self.stats[selector]["hits"] / self.stats[selector]["tries"] if self.stats[selector]["tries"] else 0.0
+                }
+                for selector in self.order
+            ]
+
+    def to_dict(self):
+        """저장용 통계"""
+        with self.lock:
+            return {
+                "last_success": self.last_success,
+                "stats": {selector: dict(stats) for selector, stats in self.stats.items()}
+            }
+
+    def load(self, data):
+        """
+        저장된 통계 불러오기 (현재 선택자 목록에 없는 선택자의 통계는 무시)
+
+        Args:
+            data (dict): to_dict()로 저장한 통계
+        """
+        if not data:
+            return
+
+        with self.lock:
+            for selector, stats in (data.get("stats") or {}).items():
+                if selector in self.stats:
+                    self.stats[selector]["tries"] = int(stats.get("tries", 0))
+                    self.stats[selector]["hits"] = int(stats.get("hits", 0))
+
+            if data.get("last_success") in self.stats:
+                self.last_success = data["last_success"]
+
+            self._reorder()
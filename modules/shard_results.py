@@ -0,0 +1,173 @@
+import os
+import csv
+import glob
+import shutil
+import hashlib
+import logging
+
+import pandas as pd
+
+SHARD_COLUMNS = ['company_id', 'keyword_id', 'rank', 'search_time']
+
+logger = logging.getLogger("ShardResults")
+
+def parse_shard(value):
+    """
+    '--shard i/N' 값 해석
+
+    Args:
+        value (str): 'i/N' 형식 (1 ≤ i ≤ N)
+
+    Returns:
+        tuple: (샤드 번호 i, 전체 샤드 수 N)
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"샤드는 'i/N' 형식이어야 합니다: {value}")
+
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"샤드 번호는 1부터 {count} 사이여야 합니다: {value}")
+
+    return index, count
+
+def shard_of(keyword_text, count):
+    """
+    키워드가 속한 샤드 번호 (키워드 텍스트의 해시로 정하므로 실행, 프로세스, 머신과 관계없이 같음)
+
+    Args:
+        keyword_text (str): 키워드
+        count (int): 전체 샤드 수
+
+    Returns:
+        int: 샤드 번호 (1부터 count)
+    """
+    digest = hashlib.sha1(keyword_text.strip().encode('utf-8')).hexdigest()
+    return int(digest, 16) % count + 1
+
+class ShardResultWriter:
+    """샤드 실행의 검색 결과를 샤드별 CSV 파일에 추가하는 기록기 (ID는 병합할 때 부여)"""
+
+    def __init__(self, shard_dir, run_date, index, count):
+        """
+        기록기 초기화
+
+        Args:
+            shard_dir (str): 샤드 결과 디렉토리
+            run_date (str): 실행 날짜 (YYYY-MM-DD)
+            index (int): 샤드 번호
+            count (int): 전체 샤드 수
+        """
+        self.path = os.path.join(shard_dir, run_date, f"shard_{index}of{count}.csv")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def append(self, records):
+        """
+        검색 결과 추가 (파일 끝에 덧붙인 뒤 디스크에 기록될 때까지 대기)
+
+        Args:
+            records (list): company_id, keyword_id, rank, search_time 키를 가진 dict 목록
+        """
+        if not records:
+            return
+
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(SHARD_COLUMNS)
+            writer.writerows([record[column] for column in SHARD_COLUMNS] for record in records)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def saved_keys(self):
+        """이 샤드 파일에 저장한 (업체 ID, 키워드 ID, 검색 시간) 조합"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return set()
+
+        saved = pd.read_csv(self.path, dtype={'search_time': str})
+        return set(zip(saved['company_id'].astype(int), saved['keyword_id'].astype(int), saved['search_time']))
+
+def find_shard_files(shard_dir):
+    """병합하지 않은 샤드 결과 파일 목록"""
+    return sorted(
+        path for path in glob.glob(os.path.join(shard_dir, '*', 'shard_*.csv'))
+        if os.path.basename(os.path.dirname(path)) != 'merged'
+    )
+
+def merge_shard_results(data_manager, shard_dir):
+    """
+    샤드 결과 파일을 데이터 관리자에 한 번에 병합
+
+    모든 샤드의 결과를 한 배치로 추가하므로 ID가 겹치지 않고,
+    이미 저장된 (업체, 키워드, 검색 시간) 조합은 다시 추가하지 않아 병합을 다시 실행해도 안전합니다.
+    병합한 파일은 shard_dir/merged/ 아래로 옮깁니다.
+
+    Args:
+        data_manager (DataManager): 데이터 관리자
+        shard_dir (str): 샤드 결과 디렉토리
+
+    Returns:
+        dict: 병합한 파일 수(files), 추가한 행 수(added), 건너뛴 중복 행 수(duplicates),
+              추가한 행의 가장 이른 검색 시간(first_time, 추가한 행이 없으면 None)
+    """
+    paths = find_shard_files(shard_dir)
+    if not paths:
+        return {"files": 0, "added": 0, "duplicates": 0, "first_time": None}
+
+    frames = [pd.read_csv(path, dtype={'search_time': str}) for path in paths]
+    shard_results = pd.concat(frames, ignore_index=True)[SHARD_COLUMNS]
+    total = len(shard_results)
+
+    key_columns = ['company_id', 'keyword_id', 'search_time']
+    shard_results = shard_results.drop_duplicates(subset=key_columns)
+
+    # 이미 저장된 기록과 겹치는 행 제외 (병합 도중 중단된 뒤 다시 병합하는 경우)
+    if not shard_results.empty:
+        existing = data_manager.get_search_results(
+            start_time=shard_results['search_time'].min(),
+            end_time=shard_results['search_time'].max()
+        )
+        if not existing.empty:
+            existing_keys = set(zip(
+                existing['company_id'].astype(int),
+                existing['keyword_id'].astype(int),
+                existing['search_time'].astype(str)
+            ))
+            is_new = [
+                key not in existing_keys
+                for key in zip(shard_results['company_id'].astype(int), shard_results['keyword_id'].astype(int), shard_results['search_time'])
+            ]
+            shard_results = shard_results[is_new]
+
+    records = [
+        {
+            "company_id": int(row.company_id),
+            "keyword_id": int(row.keyword_id),
+            "rank": int(row.rank),
+            "search_time": row.search_time
+        }
+        for row in shard_results.sort_values('search_time', kind='stable').itertuples(index=False)
+    ]
+    data_manager.add_search_results(records)
+
+    for path in paths:
+        target_dir = os.path.join(shard_dir, 'merged', os.path.basename(os.path.dirname(path)))
+        os.makedirs(target_dir, exist_ok=True)
+        name, extension = os.path.splitext(os.path.basename(path))
+        target = os.path.join(target_dir, name + extension)
+        suffix = 1
+        while os.path.exists(target):
+            # 같은 날짜의 같은 샤드를 다시 실행해서 병합한 경우
+            suffix += 1
+            target = os.path.join(target_dir, f"{name}.{suffix}{extension}")
+        shutil.move(path, target)
+
+    stats = {
+        "files": len(paths),
+        "added": len(records),
+        "duplicates": total - len(records),
+        "first_time": records[0]["search_time"] if records else None
+    }
+    logger.info(f"샤드 결과 병합: {stats}")
+    return stats
@@ -0,0 +1,265 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 등 fcntl이 없는 환경에서는 같은 프로세스 안에서만 잠금
+    fcntl = None
+
+# 보관 정책을 적용할 때 이보다 최근에 만든 임시 파일은 다른 프로세스가 쓰는 중일 수 있으므로 지우지 않음 (초)
+TEMP_FILE_GRACE_SECONDS = 3600
+
+class SnapshotStore:
+    """
+    검색 결과 원본 HTML을 압축해서 보관하는 저장소
+
+    같은 내용의 페이지는 내용 해시(sha256)로 한 번만 저장하고,
+    키워드와 가져온 시각은 index.jsonl에 기록합니다.
+    보관 기간과 전체 크기 제한을 넘는 오래된 스냅샷은 apply_retention()에서 정리합니다.
+    여러 프로세스(샤드 실행 등)가 같은 디렉토리를 써도 되도록 색인과 파일을 바꿀 때는 .lock 파일로 잠급니다.
+    """
+
+    def __init__(self, store_dir, max_bytes=None, max_age_days=None, compression=None):
+        """
+        스냅샷 저장소 초기화
+
+        Args:
+            store_dir (str): 저장소 디렉토리
+            max_bytes (int, optional): 압축된 스냅샷 파일 전체 크기 제한 (바이트)
+            max_age_days (float, optional): 스냅샷 보관 기간 (일)
+            compression (str, optional): 'zstd' 또는 'gzip' (없으면 zstandard가 있으면 zstd, 아니면 gzip)
+        """
+        self.logger = logging.getLogger("SnapshotStore")
+        self.store_dir = store_dir
+        self.objects_dir = os.path.join(store_dir, 'objects')
+        self.index_file = os.path.join(store_dir, 'index.jsonl')
+        self.lock_file = os.path.join(store_dir, '.lock')
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+
+        if compression is None:
+            compression = 'zstd' if ZSTD_AVAILABLE else 'gzip'
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            raise ImportError("zstd 압축을 사용하려면 zstandard를 설치해야 합니다. (pip install zstandard)")
+        self.compression = compression
+
+        self.lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    @contextmanager
+    def _locked(self):
+        """스레드와 프로세스 간 잠금 (색인과 파일을 바꾸는 동안 유지)"""
+        with self.lock:
+            if fcntl is None:
+                yield
+                return
+
+            with open(self.lock_file, 'a') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _object_path(self, digest, compression):
+        extension = 'zst' if compression == 'zstd' else 'gz'
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.{extension}")
+
+    def _compress(self, data):
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=9)
+
+    def save(self, keyword, url, html, fetched_at=None):
+        """
+        페이지 원본 저장
+
+        Args:
+            keyword (str): 검색 키워드
+            url (str): 페이지 URL
+            html (str): 페이지 HTML
+            fetched_at (float, optional): 가져온 시각 (epoch 초, 없으면 현재 시각)
+
+        Returns:
+            dict: 색인 항목 (digest, keyword, url, fetched_at, size, stored_size, compression)
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._locked():
+            # 이미 같은 내용이 저장되어 있으면 색인만 추가
+            path = None
+            for compression in ('zstd', 'gzip'):
+                candidate = self._object_path(digest, compression)
+                if os.path.exists(candidate):
+                    path = candidate
+                    break
+
+            if path is None:
+                compression = self.compression
+                path = self._object_path(digest, compression)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(self._compress(data))
+                os.replace(temp_path, path)
+
+            entry = {
+                "digest": digest,
+                "keyword": keyword,
+                "url": url,
+                "fetched_at": fetched_at if fetched_at is not None else time.time(),
+                "size": len(data),
+                "stored_size": os.path.getsize(path),
+                "compression": compression
+            }
+
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        return entry
+
+    def _read_index(self):
+        entries = []
+        if not os.path.exists(self.index_file):
+            return entries
+
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 중간에 끊긴 마지막 줄 등은 무시
+                    continue
+        return entries
+
+    def find(self, keyword=None, start_time=None, end_time=None):
+        """
+        스냅샷 색인 조회
+
+        Args:
+            keyword (str, optional): 검색 키워드 필터
+            start_time (float, optional): 이 시각(epoch 초) 이후에 가져온 스냅샷만
+            end_time (float, optional): 이 시각(epoch 초) 이전에 가져온 스냅샷만
+
+        Returns:
+            list: 가져온 시각 순서의 색인 항목 목록
+        """
+        entries = []
+        for entry in self._read_index():
+            if keyword is not None and entry["keyword"] != keyword:
+                continue
+            if start_time is not None and entry["fetched_at"] < start_time:
+                continue
+            if end_time is not None and entry["fetched_at"] > end_time:
+                continue
+            entries.append(entry)
+
+        return sorted(entries, key=lambda entry: entry["fetched_at"])
+
+    def load(self, digest):
+        """
+        내용 해시로 페이지 원본 조회
+
+        Args:
+            digest (str): sha256 해시
+
+        Returns:
+            str: 페이지 HTML (없으면 None)
+        """
+        for compression in ('zstd', 'gzip'):
+            path = self._object_path(digest, compression)
+            if not os.path.exists(path):
+                continue
+
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            if compression == 'zstd':
+                if not ZSTD_AVAILABLE:
+                    raise ImportError("zstd로 압축된 스냅샷을 읽으려면 zstandard를 설치해야 합니다. (pip install zstandard)")
+                data = zstandard.ZstdDecompressor().decompress(data)
+            else:
+                data = gzip.decompress(data)
+
+            return data.decode('utf-8')
+
+        return None
+
+    def apply_retention(self):
+        """
+        보관 정책 적용 (보관 기간이 지난 항목 정리 후, 크기 제한을 넘으면 오래된 항목부터 정리)
+
+        Returns:
+            dict: 정리한 색인 항목 수, 삭제한 파일 수, 남은 파일 전체 크기
+        """
+        with self._locked():
+            entries = sorted(self._read_index(), key=lambda entry: entry["fetched_at"])
+            before = len(entries)
+
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                entries = [entry for entry in entries if entry["fetched_at"] >= cutoff]
+
+            # 내용 해시별로 마지막으로 참조된 시각과 파일 크기
+            last_seen = {}
+            sizes = {}
+            for entry in entries:
+                last_seen[entry["digest"]] = entry["fetched_at"]
+                sizes[entry["digest"]] = entry["stored_size"]
+
+            total = sum(sizes.values())
+            if self.max_bytes is not None and total > self.max_bytes:
+                # 가장 최근에 참조된 시각이 오래된 내용부터 제거
+                for digest in sorted(last_seen, key=last_seen.get):
+                    if total <= self.max_bytes:
+                        break
+                    total -= sizes.pop(digest)
+                entries = [entry for entry in entries if entry["digest"] in sizes]
+
+            # 색인 교체 후 참조되지 않는 파일 삭제
+            fd, temp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            os.replace(temp_path, self.index_file)
+
+            removed_files = 0
+            temp_cutoff = time.time() - TEMP_FILE_GRACE_SECONDS
+            for root, _, names in os.walk(self.objects_dir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    if name.endswith('.tmp'):
+                        # 중단된 저장에서 남은 오래된 임시 파일만 삭제
+                        if os.path.getmtime(path) >= temp_cutoff:
+                            continue
+                    elif name.split('.', 1)[0] in sizes:
+                        continue
+                    os.remove(path)
+                    removed_files += 1
+
+        stats = {
+            "removed_entries": before - len(entries),
+            "removed_files": removed_files,
+            "total_bytes": total
+        }
+        self.logger.info(f"스냅샷 보관 정책 적용: {stats}")
+        return stats
@@ -0,0 +1,390 @@
+import os
+import sqlite3
+import logging
+import pandas as pd
+from contextlib import closing
+from datetime import datetime
+
+from modules.data_manager import DataManager
+from modules.daily_rollups import ROLLUP_COLUMNS, normalize_rollups
+
+class SQLiteDataManager(DataManager):
+    """SQLite 저장소를 사용하는 데이터 관리 클래스 (DataManager와 같은 인터페이스)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS companies (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            created_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS keywords (
+            id INTEGER PRIMARY KEY,
+            text TEXT NOT NULL UNIQUE,
+            created_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS search_results (
+            id INTEGER PRIMARY KEY,
+            company_id INTEGER NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+            keyword_id INTEGER NOT NULL REFERENCES keywords(id) ON DELETE CASCADE,
+            rank INTEGER NOT NULL,
+            search_time TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_search_results_company_keyword_time
+            ON search_results (company_id, keyword_id, search_time);
+        CREATE INDEX IF NOT EXISTS idx_search_results_keyword_time
+            ON search_results (keyword_id, search_time);
+        CREATE TABLE IF NOT EXISTS daily_rollups (
+            company_id INTEGER NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+            keyword_id INTEGER NOT NULL REFERENCES keywords(id) ON DELETE CASCADE,
+            day TEXT NOT NULL,
+            samples INTEGER NOT NULL,
+            found INTEGER NOT NULL,
+            best_rank REAL,
+            worst_rank REAL,
+            rank_sum REAL NOT NULL,
+            last_rank INTEGER NOT NULL,
+            last_time TEXT NOT NULL,
+            last_id INTEGER NOT NULL,
+            PRIMARY KEY (company_id, keyword_id, day)
+        );
+        CREATE INDEX IF NOT EXISTS idx_daily_rollups_last_id
+            ON daily_rollups (last_id);
+    """
+
+    # 검색 결과 한 행(?1 id, ?2 company_id, ?3 keyword_id, ?4 rank, ?5 search_time)을 일별 집계에 더함
+    ROLLUP_UPSERT = """
+        INSERT INTO daily_rollups (company_id, keyword_id, day, samples, found, best_rank, worst_rank,
+                                   rank_sum, last_rank, last_time, last_id)
+        VALUES (?2, ?3, substr(?5, 1, 10), 1, ?4 > 0, CASE WHEN ?4 > 0 THEN ?4 END, CASE WHEN ?4 > 0 THEN ?4 END,
+                CASE WHEN ?4 > 0 THEN ?4 ELSE 0 END, ?4, ?5, ?1)
+        ON CONFLICT (company_id, keyword_id, day) DO UPDATE SET
+            samples = samples + 1,
+            found = found + excluded.found,
+            best_rank = coalesce(min(best_rank, excluded.best_rank), best_rank, excluded.best_rank),
+            worst_rank = coalesce(max(worst_rank, excluded.worst_rank), worst_rank, excluded.worst_rank),
+            rank_sum = rank_sum + excluded.rank_sum,
+            last_rank = CASE WHEN (excluded.last_time, excluded.last_id) >= (last_time, last_id)
+                             THEN excluded.last_rank ELSE last_rank END,
+            last_time = max(last_time, excluded.last_time),
+            last_id = max(last_id, excluded.last_id)
+    """
+
+    def __init__(self, data_dir, db_file='rank_tracker.db'):
+        """
+        SQLite 데이터 관리자 초기화
+
+        Args:
+            data_dir (str): 데이터 디렉토리 경로
+            db_file (str): 데이터베이스 파일명 (data_dir 기준)
+        """
+        self.logger = logging.getLogger("SQLiteDataManager")
+        self.db_path = os.path.join(data_dir, db_file)
+        super().__init__(data_dir)
+
+    def _initialize_data_files(self):
+        """데이터베이스 스키마 초기화 (처음 생성할 때는 기존 CSV 데이터를 가져옴)"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        is_new = not os.path.exists(self.db_path)
+
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(self.SCHEMA)
+
+        if is_new:
+            self.migrate_from_csv()
+
+    def _connect(self):
+        """외래 키 제약을 켠 새 연결 생성 (호출마다 새 연결을 열어 스레드 간에 공유하지 않음)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _query(self, sql, params=()):
+        """SELECT 결과 조회 (데이터베이스 파일이 바뀌지 않았으면 이전 결과의 복사본 반환)"""
+        def load():
+            with closing(self._connect()) as conn:
+                return pd.read_sql_query(sql, conn, params=params)
+
+        return self._memoize(('sql', sql, tuple(params)), self._file_signature(self.db_path), load).copy()
+
+    def _execute(self, sql, params=()):
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(sql, params)
+
+    def migrate_from_csv(self):
+        """
+        기존 CSV 파일의 데이터를 ID를 유지한 채 데이터베이스로 가져옴
+
+        이미 데이터가 있는 테이블은 건너뜁니다.
+
+        Returns:
+            dict: 테이블별로 가져온 행 수
+        """
+        migrated = {"companies": 0, "keywords": 0, "search_results": 0}
+
+        # CSV 파일이 없으면 가져올 데이터도 없음
+        companies = DataManager.get_companies(self) if os.path.exists(self.companies_file) else pd.DataFrame()
+        keywords = DataManager.get_keywords(self) if os.path.exists(self.keywords_file) else pd.DataFrame()
+        results = DataManager.get_search_results(self) if os.path.exists(self.results_file) else pd.DataFrame()
+
+        with closing(self._connect()) as conn, conn:
+            if conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 0 and not companies.empty:
+                rows = companies[['id', 'name', 'created_at']].itertuples(index=False)
+                conn.executemany(
+                    "INSERT INTO companies (id, name, created_at) VALUES (?, ?, ?)",
+                    [(int(row[0]), row[1], row[2]) for row in rows]
+                )
+                migrated["companies"] = len(companies)
+
+            if conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0] == 0 and not keywords.empty:
+                rows = keywords[['id', 'text', 'created_at']].itertuples(index=False)
+                conn.executemany(
+                    "INSERT INTO keywords (id, text, created_at) VALUES (?, ?, ?)",
+                    [(int(row[0]), row[1], row[2]) for row in rows]
+                )
+                migrated["keywords"] = len(keywords)
+
+            if conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0] == 0 and not results.empty:
+                company_ids = {row[0] for row in conn.execute("SELECT id FROM companies")}
+                keyword_ids = {row[0] for row in conn.execute("SELECT id FROM keywords")}
+
+                # 삭제된 업체/키워드를 가리키는 결과는 외래 키를 만족하지 않으므로 제외
+                valid = results['company_id'].isin(company_ids) & results['keyword_id'].isin(keyword_ids)
+                if not valid.all():
+                    self.logger.warning(f"업체 또는 키워드가 없는 검색 결과 {int((~valid).sum())}건은 가져오지 않습니다.")
+
+                rows = results[valid][self.RESULT_COLUMNS].itertuples(index=False)
+                conn.executemany(
+                    "INSERT INTO search_results (id, company_id, keyword_id, rank, search_time) VALUES (?, ?, ?, ?, ?)",
+                    [(int(row[0]), int(row[1]), int(row[2]), int(row[3]), row[4]) for row in rows]
+                )
+                migrated["search_results"] = int(valid.sum())
+
+        if any(migrated.values()):
+            self.logger.info(f"CSV 데이터 가져오기 완료: {migrated}")
+
+        return migrated
+
+    def _history_signature(self):
+        """검색 기록 저장소의 변경 확인용 값"""
+        return self._file_signature(self.db_path)
+
+    def compact_history(self):
+        """SQLite 저장소는 (업체, 키워드, 검색 시간) 인덱스로 조회하므로 구간 압축을 지원하지 않음"""
+        raise NotImplementedError("검색 기록 압축은 CSV 저장소에서만 지원합니다.")
+
+    def _names_signature(self):
+        """업체/키워드 저장소의 변경 확인용 값"""
+        return self._file_signature(self.db_path)
+
+    def get_companies(self):
+        """
+        모든 회사 정보 조회
+
+        Returns:
+            pandas.DataFrame: 회사 정보
+        """
+        return self._query("SELECT id, name, created_at FROM companies ORDER BY id")
+
+    def get_keywords(self):
+        """
+        모든 키워드 정보 조회
+
+        Returns:
+            pandas.DataFrame: 키워드 정보
+        """
+        return self._query("SELECT id, text, created_at FROM keywords ORDER BY id")
+
+    def get_search_results(self, company_id=None, keyword_id=None, start_time=None, end_time=None):
+        """
+        검색 결과 조회 (필터는 (company_id, keyword_id, search_time) 인덱스로 처리)
+
+        Args:
+            company_id (int, optional): 회사 ID 필터
+            keyword_id (int, optional): 키워드 ID 필터
+            start_time (str or datetime, optional): 이 시각 이후의 결과만 조회
+            end_time (str or datetime, optional): 이 시각 이전의 결과만 조회
+
+        Returns:
+            pandas.DataFrame: 검색 결과
+        """
+        conditions = []
+        params = []
+
+        if company_id is not None:
+            conditions.append("company_id = ?")
+            params.append(int(company_id))
+
+        if keyword_id is not None:
+            conditions.append("keyword_id = ?")
+            params.append(int(keyword_id))
+
+        if start_time is not None:
+            conditions.append("search_time >= ?")
+            params.append(self._format_time(start_time))
+
+        if end_time is not None:
+            conditions.append("search_time <= ?")
+            params.append(self._format_time(end_time))
+
+        sql = "SELECT id, company_id, keyword_id, rank, search_time FROM search_results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY id"
+
+        return self._query(sql, params)
+
+    def add_company(self, name):
+        """
+        회사 추가
+
+        Args:
+            name (str): 회사명
+
+        Returns:
+            int: 생성된 회사 ID (이미 있으면 기존 ID)
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO companies (name, created_at) VALUES (?, ?)",
+                (name, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            new_id = conn.execute("SELECT id FROM companies WHERE name = ?", (name,)).fetchone()[0]
+
+        self._invalidate_name_cache()
+        return new_id
+
+    def add_keyword(self, text):
+        """
+        키워드 추가
+
+        Args:
+            text (str): 키워드 텍스트
+
+        Returns:
+            int: 생성된 키워드 ID (이미 있으면 기존 ID)
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO keywords (text, created_at) VALUES (?, ?)",
+                (text, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            new_id = conn.execute("SELECT id FROM keywords WHERE text = ?", (text,)).fetchone()[0]
+
+        self._invalidate_name_cache()
+        return new_id
+
+    def add_search_result(self, company_id, keyword_id, rank, search_time=None):
+        """
+        검색 결과 추가
+
+        Args:
+            company_id (int): 회사 ID
+            keyword_id (int): 키워드 ID
+            rank (int): 검색 순위
+            search_time (str, optional): 검색 시간
+
+        Returns:
+            int: 생성된 결과 ID
+        """
+        return self.add_search_results([{
+            'company_id': company_id,
+            'keyword_id': keyword_id,
+            'rank': rank,
+            'search_time': search_time
+        }])[0]
+
+    def add_search_results(self, records):
+        """
+        검색 결과 여러 건을 하나의 트랜잭션으로 추가
+
+        Args:
+            records (list): company_id, keyword_id, rank, search_time(선택) 키를 가진 dict 목록
+
+        Returns:
+            list: 생성된 결과 ID 목록
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        new_ids = []
+
+        with closing(self._connect()) as conn, conn:
+            for record in records:
+                cursor = conn.execute(
+                    "INSERT INTO search_results (company_id, keyword_id, rank, search_time) VALUES (?, ?, ?, ?)",
+                    (int(record['company_id']), int(record['keyword_id']), int(record['rank']),
+                     record.get('search_time') or now)
+                )
+                new_ids.append(cursor.lastrowid)
+
+            # 일별 집계도 같은 트랜잭션에서 추가한 행의 (업체, 키워드, 날짜)만 갱신
+            self._catch_up_rollups(conn)
+
+        return new_ids
+
+    def refresh_daily_rollups(self):
+        """
+        집계에 반영되지 않은 검색 결과를 일별 집계에 반영
+
+        Returns:
+            int: 반영한 검색 결과 수
+        """
+        with closing(self._connect()) as conn, conn:
+            return self._catch_up_rollups(conn)
+
+    def _catch_up_rollups(self, conn):
+        """
+        집계에 반영한 마지막 결과 ID보다 큰 ID의 결과만 일별 집계에 더함
+
+        검색 결과의 마지막 ID가 그보다 작아졌으면 처음부터 다시 집계합니다.
+
+        Args:
+            conn (sqlite3.Connection): 트랜잭션 중인 연결
+
+        Returns:
+            int: 반영한 검색 결과 수
+        """
+        last_id = conn.execute("SELECT coalesce(MAX(last_id), 0) FROM daily_rollups").fetchone()[0]
+        max_id = conn.execute("SELECT coalesce(MAX(id), 0) FROM search_results").fetchone()[0]
+        if max_id == last_id:
+            return 0
+
+        if max_id < last_id:
+            conn.execute("DELETE FROM daily_rollups")
+            last_id = 0
+
+        rows = conn.execute(
+            "SELECT id, company_id, keyword_id, rank, search_time FROM search_results WHERE id > ?", (last_id,)
+        ).fetchall()
+        conn.executemany(self.ROLLUP_UPSERT, rows)
+        return len(rows)
+
+    def _load_rollups(self):
+        """저장된 일별 집계"""
+        return normalize_rollups(self._query(f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM daily_rollups"))
+
+    def delete_company(self, company_id):
+        """
+        회사 삭제 (관련 검색 결과는 외래 키 CASCADE로 함께 삭제)
+
+        Args:
+            company_id (int): 삭제할 회사 ID
+
+        Returns:
+            bool: 삭제 성공 여부
+        """
+        deleted = self._execute("DELETE FROM companies WHERE id = ?", (int(company_id),)).rowcount > 0
+        self._invalidate_name_cache()
+        return deleted
+
+    def delete_keyword(self, keyword_id):
+        """
+        키워드 삭제 (관련 검색 결과는 외래 키 CASCADE로 함께 삭제)
+
+        Args:
+            keyword_id (int): 삭제할 키워드 ID
+
+        Returns:
+            bool: 삭제 성공 여부
+        """
+        deleted = self._execute("DELETE FROM keywords WHERE id = ?", (int(keyword_id),)).rowcount > 0
+        self._invalidate_name_cache()
+        return deleted
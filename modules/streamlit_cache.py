@@ -0,0 +1,41 @@
+import os
+import streamlit as st
+
+from modules.data_manager import create_data_manager
+from modules.result_cache import ResultCache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+@st.cache_resource(show_spinner=False)
+def get_data_manager(data_dir=DATA_DIR, backend=None):
+    """
+    Streamlit 세션과 재실행 사이에서 공유하는 데이터 관리자
+
+    데이터 관리자는 원본 파일의 크기/수정 시각이 바뀔 때까지 읽은 데이터를 재사용하므로,
+    위젯을 조작해서 페이지가 다시 실행될 때 디스크를 다시 읽지 않습니다.
+
+    Args:
+        data_dir (str): 데이터 디렉토리 경로
+        backend (str, optional): 'csv' 또는 'sqlite' (없으면 RANK_TRACKER_BACKEND 환경 변수)
+
+    Returns:
+        DataManager: 데이터 관리자
+    """
+    return create_data_manager(data_dir, backend)
+
+# 실시간 검색에서 캐시된 검색 결과를 사용할 최대 경과 시간 (초)
+RESULT_CACHE_TTL = float(os.environ.get('RANK_TRACKER_CACHE_TTL', 1800))
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache(data_dir=DATA_DIR, ttl=RESULT_CACHE_TTL):
+    """
+    실시간 검색과 자동 업데이트가 함께 쓰는 검색 결과 캐시 (적중 통계는 세션 간에 공유)
+
+    Args:
+        data_dir (str): 데이터 디렉토리 경로
+        ttl (float): 캐시를 사용할 최대 경과 시간 (초)
+
+    Returns:
+        ResultCache: 검색 결과 캐시
+    """
+    return ResultCache(os.path.join(data_dir, 'cache', 'results'), ttl=ttl)
@@ -0,0 +1,191 @@
+import os
+import math
+import logging
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+PRIORITIES = ("high", "normal", "low")
+
+# 우선순위별로 변동성에서 정한 확인 간격에 곱하는 값
+PRIORITY_FACTORS = {"high": 0.5, "normal": 1.0, "low": 2.0}
+
+class UpdateScheduler:
+    """
+    (업체, 키워드) 조합마다 최근 순위 변동성과 우선순위로 확인 간격(일)을 정하고,
+    이번 실행에서 확인할 때가 된 조합만 골라 주는 스케줄러
+
+    확인 간격은 max_interval / (1 + 변동성 / volatility_scale)에 우선순위 값을 곱한 뒤
+    min_interval 이상으로 맞춥니다. 변동성은 최근 history_days 동안 연속한 두 기록의 평균 순위 변화이고,
+    순위를 찾지 못한 기록(-1)은 missing_rank위로 봅니다. 기록이 두 개보다 적은 조합은 매번 확인합니다.
+    """
+
+    def __init__(self, min_interval=1, max_interval=7, history_days=None, volatility_scale=1.0,
+                 missing_rank=300, priorities=None):
+        """
+        스케줄러 초기화
+
+        Args:
+            min_interval (int): 가장 짧은 확인 간격 (일)
+            max_interval (int): 순위가 변하지 않는 보통 우선순위 조합의 확인 간격 (일, 낮은 우선순위는 2배까지)
+            history_days (int, optional): 변동성을 계산할 최근 기록 기간 (일, 없으면 max_interval의 4배)
+            volatility_scale (float): 확인 간격을 절반으로 줄이는 평균 순위 변화
+            missing_rank (int): 순위를 찾지 못한 기록을 볼 순위
+            priorities (dict, optional): load_priorities로 읽은 (업체 ID, 키워드 ID 또는 None) → 우선순위
+        """
+        if min_interval < 1 or max_interval < min_interval:
+            raise ValueError("확인 간격은 1 ≤ min_interval ≤ max_interval이어야 합니다.")
+
+        self.logger = logging.getLogger("UpdateScheduler")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.history_days = history_days if history_days is not None else max_interval * 4
+        self.volatility_scale = volatility_scale
+        self.missing_rank = missing_rank
+        self.priorities = priorities or {}
+
+    @staticmethod
+    def load_priorities(path):
+        """
+        우선순위 CSV 파일 읽기
+
+        company_id, keyword_id, priority 열을 가진 파일이며, keyword_id가 비어 있으면 그 업체의 모든 키워드에 적용합니다.
+        파일이 없으면 모든 조합이 보통 우선순위입니다.
+
+        Args:
+            path (str): 우선순위 CSV 파일 경로
+
+        Returns:
+            dict: (업체 ID, 키워드 ID 또는 None) → 우선순위 ('high', 'normal', 'low')
+        """
+        if not path or not os.path.exists(path):
+            return {}
+
+        frame = pd.read_csv(path, dtype=str).fillna("")
+        missing = {"company_id", "priority"} - set(frame.columns)
+        if missing:
+            raise ValueError(f"우선순위 파일에 {', '.join(sorted(missing))} 열이 없습니다: {path}")
+
+        priorities = {}
+        for row in frame.to_dict('records'):
+            priority = row["priority"].strip().lower()
+            if priority not in PRIORITIES:
+                raise ValueError(f"지원하지 않는 우선순위입니다: {row['priority']} ({', '.join(PRIORITIES)} 중 하나)")
+            keyword_id = row.get("keyword_id", "").strip()
+            priorities[(int(row["company_id"]), int(keyword_id) if keyword_id else None)] = priority
+
+        return priorities
+
+    def priority_of(self, company_id, keyword_id):
+        """조합의 우선순위 (키워드를 지정한 항목 → 업체 전체 항목 → 'normal' 순)"""
+        return self.priorities.get(
+            (int(company_id), int(keyword_id)),
+            self.priorities.get((int(company_id), None), "normal")
+        )
+
+    def history_start(self, run_date):
+        """
+        변동성 계산에 필요한 기록의 시작 시각
+
+        Args:
+            run_date (str): 실행 날짜 (YYYY-MM-DD)
+
+        Returns:
+            datetime: 조회 시작 시각
+        """
+        return datetime.strptime(run_date, '%Y-%m-%d') - timedelta(days=self.history_days)
+
+    def interval_for(self, volatility, observations, priority="normal"):
+        """
+        확인 간격 계산
+
+        Args:
+            volatility (float): 평균 순위 변화
+            observations (int): 최근 기록 수
+            priority (str): 우선순위
+
+        Returns:
+            int: 확인 간격 (일)
+        """
+        if observations < 2:
+            return self.min_interval
+
+        factor = PRIORITY_FACTORS[priority]
+        interval = self.max_interval / (1 + volatility / self.volatility_scale) * factor
+        upper = self.max_interval * max(factor, 1.0)
+        return int(min(max(math.floor(interval), self.min_interval), upper))
+
+    def _summarize(self, history):
+        """조합별 기록 수, 평균 순위 변화, 마지막 확인 날짜"""
+        if history.empty:
+            return {}
+
+        history = history[['company_id', 'keyword_id', 'rank', 'search_time']].copy()
+        history['company_id'] = history['company_id'].astype(int)
+        history['keyword_id'] = history['keyword_id'].astype(int)
+        history['search_time'] = history['search_time'].astype(str)
+        rank = history['rank'].astype(int)
+        history['rank'] = rank.where(rank > 0, self.missing_rank)
+        history = history.sort_values(['company_id', 'keyword_id', 'search_time'], kind='stable')
+
+        keys = ['company_id', 'keyword_id']
+        history['change'] = history.groupby(keys)['rank'].diff().abs()
+        summary = history.groupby(keys).agg(
+            observations=('rank', 'size'),
+            volatility=('change', 'mean'),
+            last_checked=('search_time', 'max')
+        )
+
+        return {
+            key: (int(row.observations), 0.0 if pd.isna(row.volatility) else float(row.volatility), row.last_checked[:10])
+            for key, row in zip(summary.index, summary.itertuples(index=False))
+        }
+
+    def plan(self, history, company_ids, keyword_ids, run_date):
+        """
+        이번 실행에서 확인할 조합 고르기
+
+        Args:
+            history (pandas.DataFrame): history_start 이후의 검색 결과
+            company_ids (list): 업체 ID 목록
+            keyword_ids (list): 키워드 ID 목록
+            run_date (str): 실행 날짜 (YYYY-MM-DD)
+
+        Returns:
+            list: 확인할 때가 된 조합 (급한 순서). 항목은 company_id, keyword_id, priority, volatility,
+                  interval, days_since (확인한 적 없으면 None), urgency (지난 일수 / 확인 간격) 키를 가진 dict
+        """
+        summary = self._summarize(history)
+        today = datetime.strptime(run_date, '%Y-%m-%d').date()
+        due = []
+
+        for keyword_id in keyword_ids:
+            for company_id in company_ids:
+                key = (int(company_id), int(keyword_id))
+                observations, volatility, last_checked = summary.get(key, (0, 0.0, None))
+                priority = self.priority_of(*key)
+                interval = self.interval_for(volatility, observations, priority)
+
+                if last_checked is None:
+                    days_since = None
+                    urgency = math.inf
+                else:
+                    days_since = (today - datetime.strptime(last_checked, '%Y-%m-%d').date()).days
+                    if days_since < interval:
+                        continue
+                    urgency = days_since / interval
+
+                due.append({
+                    "company_id": key[0],
+                    "keyword_id": key[1],
+                    "priority": priority,
+                    "volatility": volatility,
+                    "interval": interval,
+                    "days_since": days_since,
+                    "urgency": urgency
+                })
+
+        # 급한 조합 → 높은 우선순위 → 변동성이 큰 조합 순
+        due.sort(key=lambda entry: (-entry["urgency"], PRIORITIES.index(entry["priority"]), -entry["volatility"]))
+        self.logger.info(f"확인할 조합: {len(due)}/{len(company_ids) * len(keyword_ids)}개")
+        return due
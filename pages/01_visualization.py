@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -8,11 +7,20 @@ import sys
 
 # 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from modules.data_manager import DataManager
+from modules.streamlit_cache import get_data_manager
+from modules.downsampling import downsample
 
-# 데이터 관리자 초기화
-data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
-data_manager = DataManager(data_dir)
+# 데이터 관리자 (재실행 사이에 공유, 파일이 바뀔 때만 다시 읽음)
+data_manager = get_data_manager()
+
+# 이보다 긴 기간은 원본 기록 대신 (업체, 키워드, 날짜)별 집계로 표시
+DAILY_ROLLUP_MIN_DAYS = 14
+
+# 순위 변화 그래프에 보낼 최대 점 수 (넘으면 LTTB로 모양을 유지하며 줄임)
+CHART_MAX_POINTS = 2000
+
+# 조회 기간 슬라이더의 최대 일수
+MAX_DAYS = 365 * 3
 
 def main():
     st.title("검색 결과 시각화")
@@ -42,49 +50,68 @@ def main():
     # 기간 선택
     col1, col2 = st.columns(2)
     with col1:
-        days = st.slider("조회 기간 (일)", 1, 30, 7)
+        days = st.slider("조회 기간 (일)", 1, MAX_DAYS, 7)
     
     with col2:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         st.write(f"기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
     
-    # 검색 결과 조회
-    results = data_manager.get_search_results(company_id=company_id)
-    
-    if results.empty:
-        st.info(f"'{selected_company}'의 검색 결과가 없습니다.")
-        return
-    
-    # 키워드 필터링
+    # 검색 결과 조회 (업체/키워드/기간 필터는 저장소에서 처리)
+    keyword_id = None
     if selected_keyword != "모든 키워드":
         keyword_id = keywords[keywords['text'] == selected_keyword]['id'].iloc[0]
-        results = results[results['keyword_id'] == keyword_id]
     
-    if results.empty:
-        st.info(f"선택한 키워드에 대한 검색 결과가 없습니다.")
-        return
-    
-    # 키워드 텍스트 추가
-    results['keyword_text'] = results['keyword_id'].apply(data_manager.get_keyword_text)
-    
-    # 날짜 형식 변환
-    results['search_date'] = pd.to_datetime(results['search_time'])
+    daily = data_manager.get_daily_rollups(
+        company_id=company_id,
+        keyword_id=keyword_id,
+        start_time=start_date,
+        end_time=end_date
+    )
     
-    # 기간 필터링
-    results = results[(results['search_date'] >= start_date) & (results['search_date'] <= end_date)]
-    
-    if results.empty:
-        st.info(f"선택한 기간에 대한 검색 결과가 없습니다.")
+    if daily.empty:
+        st.info(f"선택한 조건에 대한 검색 결과가 없습니다.")
         return
     
+    daily['keyword_text'] = daily['keyword_id'].map(data_manager.get_keyword_texts())
+    
+    if days > DAILY_ROLLUP_MIN_DAYS:
+        show_daily_charts(daily, selected_company, selected_keyword)
+    else:
+        results = data_manager.get_history(
+            company_id=company_id,
+            keyword_id=keyword_id,
+            start_time=start_date,
+            end_time=end_date,
+            columns=['keyword_id', 'rank', 'search_time']
+        )
+        
+        # 키워드 텍스트 추가
+        results['keyword_text'] = results['keyword_id'].map(data_manager.get_keyword_texts())
+        
+        # 검색 시간은 이미 datetime 형식으로 조회됨
+        results['search_date'] = results['search_time']
+        
+        # 기간 필터링
+        results = results[(results['search_date'] >= start_date) & (results['search_date'] <= end_date)]
+        
+        if results.empty:
+            st.info(f"선택한 기간에 대한 검색 결과가 없습니다.")
+            return
+        
+        show_charts(results, daily, selected_company, selected_keyword)
+
+def show_charts(results, daily, selected_company, selected_keyword):
+    """원본 검색 기록으로 순위 변화, 순위 분포, 원본 데이터 표시"""
     # 시각화 1: 시간에 따른 순위 변화 (선 그래프)
     st.subheader("시간에 따른 순위 변화")
     
+    chart_results = downsample(results, 'search_date', 'rank', CHART_MAX_POINTS, group='keyword_id')
+    
     if selected_keyword == "모든 키워드":
         # 키워드별로 그룹화하여 시각화
         fig = px.line(
-            results, 
+            chart_results, 
             x='search_date', 
             y='rank', 
             color='keyword_text',
@@ -100,7 +127,7 @@ def main():
     else:
         # 단일 키워드 시각화
         fig = px.line(
-            results, 
+            chart_results, 
             x='search_date', 
             y='rank',
             markers=True,
@@ -113,20 +140,109 @@ def main():
         
         st.plotly_chart(fig, use_container_width=True)
     
+    if len(chart_results) < len(results):
+        st.caption(f"검색 기록 {len(results)}개 중 {len(chart_results)}개 점으로 줄여서 표시했습니다.")
+    
+    show_latest_ranks(daily)
+    
+    # 시각화 3: 순위 분포 (히스토그램)
+    if len(results) > 5:  # 데이터가 충분할 때만 표시
+        st.subheader("순위 분포")
+        
+        fig = px.histogram(
+            results, 
+            x='rank',
+            nbins=20,
+            title=f"{selected_company}의 순위 분포",
+            labels={'rank': '순위', 'count': '빈도'}
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # 원본 데이터 표시
+    with st.expander("원본 데이터 보기"):
+        display_results = results[['search_time', 'keyword_text', 'rank']]
+        display_results.columns = ['검색 시간', '키워드', '순위']
+        st.dataframe(display_results.sort_values('검색 시간', ascending=False))
+
+def show_daily_charts(daily, selected_company, selected_keyword):
+    """일별 집계로 순위 변화, 순위 분포, 일별 데이터 표시 (긴 기간)"""
+    # 시각화 1: 날짜별 평균 순위 변화 (순위를 찾지 못한 날은 비워 둠)
+    st.subheader("날짜별 순위 변화")
+    
+    chart_daily = downsample(daily, 'day', 'mean_rank', CHART_MAX_POINTS, group='keyword_id')
+    
+    hover_data = {'best_rank': True, 'worst_rank': True, 'samples': True}
+    labels = {
+        'day': '날짜', 'mean_rank': '평균 순위', 'keyword_text': '키워드',
+        'best_rank': '최고 순위', 'worst_rank': '최저 순위', 'samples': '검색 횟수'
+    }
+    
+    if selected_keyword == "모든 키워드":
+        fig = px.line(
+            chart_daily,
+            x='day',
+            y='mean_rank',
+            color='keyword_text',
+            markers=True,
+            hover_data=hover_data,
+            title=f"{selected_company}의 날짜별 평균 순위 변화",
+            labels=labels
+        )
+    else:
+        fig = px.line(
+            chart_daily,
+            x='day',
+            y='mean_rank',
+            markers=True,
+            hover_data=hover_data,
+            title=f"{selected_company}의 '{selected_keyword}' 키워드 날짜별 평균 순위 변화",
+            labels=labels
+        )
+    
+    # Y축 역순으로 표시 (1위가 위에 오도록)
+    fig.update_layout(yaxis=dict(autorange="reversed"))
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    if len(chart_daily) < len(daily):
+        st.caption(f"일별 기록 {len(daily)}개 중 {len(chart_daily)}개 점으로 줄여서 표시했습니다.")
+    
+    show_latest_ranks(daily)
+    
+    # 시각화 3: 날짜별 평균 순위 분포 (히스토그램)
+    if daily['mean_rank'].notna().sum() > 5:  # 데이터가 충분할 때만 표시
+        st.subheader("순위 분포")
+        
+        fig = px.histogram(
+            daily.dropna(subset=['mean_rank']),
+            x='mean_rank',
+            nbins=20,
+            title=f"{selected_company}의 날짜별 평균 순위 분포",
+            labels={'mean_rank': '평균 순위', 'count': '빈도'}
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # 일별 데이터 표시
+    with st.expander("일별 데이터 보기"):
+        display_daily = daily[['day', 'keyword_text', 'mean_rank', 'best_rank', 'worst_rank', 'last_rank', 'samples']]
+        display_daily.columns = ['날짜', '키워드', '평균 순위', '최고 순위', '최저 순위', '마지막 순위', '검색 횟수']
+        st.dataframe(display_daily.sort_values('날짜', ascending=False))
+
+def show_latest_ranks(daily):
+    """키워드별 최근 순위 게이지 표시 (일별 집계의 마지막 검색 결과)"""
     # 시각화 2: 최근 순위 현황 (게이지 차트)
     st.subheader("최근 순위 현황")
     
-    # 키워드별 최신 데이터 추출
-    latest_results = results.sort_values('search_date').groupby('keyword_id').last().reset_index()
-    
-    # 키워드 텍스트 추가
-    latest_results['keyword_text'] = latest_results['keyword_id'].apply(data_manager.get_keyword_text)
+    # 키워드별 최신 데이터
+    latest_results = daily.sort_values('last_time').groupby('keyword_id').last().reset_index()
     
     # 게이지 차트 생성
     for _, row in latest_results.iterrows():
         keyword_text = row['keyword_text']
-        rank = row['rank']
-        search_time = row['search_time']
+        rank = row['last_rank']
+        search_time = row['last_time']
         
         # 순위에 따른 색상 설정
         if rank <= 3:
@@ -159,26 +275,6 @@ def main():
         fig.update_layout(height=250)
         st.plotly_chart(fig, use_container_width=True)
         st.caption(f"마지막 업데이트: {search_time}")
-    
-    # 시각화 3: 순위 분포 (히스토그램)
-    if len(results) > 5:  # 데이터가 충분할 때만 표시
-        st.subheader("순위 분포")
-        
-        fig = px.histogram(
-            results, 
-            x='rank',
-            nbins=20,
-            title=f"{selected_company}의 순위 분포",
-            labels={'rank': '순위', 'count': '빈도'}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # 원본 데이터 표시
-    with st.expander("원본 데이터 보기"):
-        display_results = results[['search_time', 'keyword_text', 'rank']]
-        display_results.columns = ['검색 시간', '키워드', '순위']
-        st.dataframe(display_results.sort_values('검색 시간', ascending=False))
 
 if __name__ == "__main__":
     main()
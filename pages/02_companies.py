@@ -5,11 +5,10 @@ import sys
 
 # 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from modules.data_manager import DataManager
+from modules.streamlit_cache import get_data_manager
 
-# 데이터 관리자 초기화
-data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
-data_manager = DataManager(data_dir)
+# 데이터 관리자 (재실행 사이에 공유, 파일이 바뀔 때만 다시 읽음)
+data_manager = get_data_manager()
 
 def main():
     st.title("업체 관리")
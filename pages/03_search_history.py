@@ -5,11 +5,10 @@ import sys
 
 # 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from modules.data_manager import DataManager
+from modules.streamlit_cache import get_data_manager
 
-# 데이터 관리자 초기화
-data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
-data_manager = DataManager(data_dir)
+# 데이터 관리자 (재실행 사이에 공유, 파일이 바뀔 때만 다시 읽음)
+data_manager = get_data_manager()
 
 def main():
     st.title("검색 기록")
@@ -26,25 +25,25 @@ def main():
     
     selected_company = st.selectbox("업체 선택", company_options)
     
+    company_id = None
     if selected_company == "모든 업체":
-        results = data_manager.get_search_results()
+        results = data_manager.get_history()
     else:
         company_id = companies[companies['name'] == selected_company]['id'].iloc[0]
-        results = data_manager.get_search_results(company_id=company_id)
+        results = data_manager.get_history(company_id=company_id)
     
     if results.empty:
         st.info("검색 결과가 없습니다.")
         return
     
     # 회사명과 키워드 텍스트 추가
-    results['company_name'] = results['company_id'].apply(data_manager.get_company_name)
-    results['keyword_text'] = results['keyword_id'].apply(data_manager.get_keyword_text)
+    results = data_manager.enrich_results(results)
     
     # 날짜 필터링 옵션
     st.subheader("날짜 필터링")
     
-    # 날짜 형식 변환
-    results['search_date'] = pd.to_datetime(results['search_time'])
+    # 검색 시간은 이미 datetime 형식으로 조회됨
+    results['search_date'] = results['search_time']
     
     # 날짜 범위 계산
     min_date = results['search_date'].min().date()
@@ -99,20 +98,23 @@ def main():
         mime="text/csv",
     )
     
-    # 통계 정보
+    # 통계 정보 (날짜 단위로 고르므로 같은 기간의 일별 집계로 계산)
     st.subheader("통계 정보")
     
+    daily = data_manager.get_daily_rollups(company_id=company_id, start_time=start_date, end_time=end_date)
+    found = daily['found'].sum()
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("총 검색 횟수", len(display_results))
+        st.metric("총 검색 횟수", int(daily['samples'].sum()))
     
     with col2:
-        avg_rank = display_results[display_results['순위'] > 0]['순위'].mean()
+        avg_rank = (daily['mean_rank'] * daily['found']).sum() / found if found else float('nan')
         st.metric("평균 순위", f"{avg_rank:.1f}" if not pd.isna(avg_rank) else "N/A")
     
     with col3:
-        best_rank = display_results[display_results['순위'] > 0]['순위'].min()
+        best_rank = daily['best_rank'].min()
         st.metric("최고 순위", int(best_rank) if not pd.isna(best_rank) else "N/A")
 
 if __name__ == "__main__":
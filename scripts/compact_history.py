@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+검색 기록 압축 스크립트
+search_results.csv의 기록을 순위가 바뀐 구간 단위(search_intervals.csv)와 키워드 검색 기록(search_checks.csv)으로 압축합니다.
+압축한 뒤에도 새 기록은 search_results.csv에 추가되며, 페이지에서는 실행별 기록과 같은 형태로 조회됩니다.
+
+    python scripts/compact_history.py --data-dir data
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+# 모듈 경로 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from modules.data_manager import create_data_manager
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="검색 기록을 순위가 바뀐 구간 단위로 압축합니다. (CSV 저장소)")
+    parser.add_argument("--data-dir", default=os.path.join(parent_dir, 'data'),
+                        help="데이터 디렉토리 (기본값: 저장소의 data 폴더)")
+    return parser.parse_args(argv)
+
+def file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+def main(argv=None):
+    args = parse_args(argv)
+    data_manager = create_data_manager(args.data_dir, 'csv')
+    paths = (data_manager.results_file, data_manager.intervals_file, data_manager.checks_file)
+
+    before = sum(file_size(path) for path in paths)
+    start_time = time.time()
+    stats = data_manager.compact_history()
+    after = sum(file_size(path) for path in paths)
+
+    logger.info(
+        f"검색 기록 압축 완료: 기록 {stats['rows']}행 → 순위 구간 {stats['intervals']}행, 검색 {stats['checks']}행 "
+        f"({before / 1024:.1f}KB → {after / 1024:.1f}KB, {time.time() - start_time:.1f}초 소요)"
+    )
+
+if __name__ == "__main__":
+    main()
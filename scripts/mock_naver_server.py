@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+네이버 모의 서버
+업데이트 스크립트의 동시 실행 수와 요청 속도를 네이버 대신 로컬에서 시험하기 위한 HTTP 서버입니다.
+지도 검색 페이지(/p/search/<키워드>)와 목록 페이지(/place/list?query=<키워드>&page=<페이지>)를 벤치마크 픽스처와
+같은 구조로 만들어 응답하며, 지연 시간, 오류 비율, 429 응답, 결과 수와 페이지 크기를 설정할 수 있습니다.
+
+    python scripts/mock_naver_server.py --port 8765 --latency-ms 200 --rate-429 0.05
+    RANK_TRACKER_MAP_BASE_URL=http://127.0.0.1:8765 RANK_TRACKER_PLACE_BASE_URL=http://127.0.0.1:8765 \\
+        python scripts/update_search_results.py --data-dir /tmp/rank_tracker_data --concurrency 8 --rps 20
+
+GET /stats 는 지금까지의 요청 통계를 JSON으로 반환합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+import urllib.parse
+from collections import Counter, deque
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 모듈 경로 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from benchmarks.fixtures import (
+    sample_place_names, build_place_list_html, build_map_search_html, default_iframe_src
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("MockNaverServer")
+
+class MockNaverServer(ThreadingHTTPServer):
+    """설정과 요청 통계를 가진 모의 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0, latency_jitter_ms=0, error_rate=0.0, rate_429=0.0,
+                 max_rps=None, result_size=300, page_size=50, ad_every=6, seed=0):
+        """
+        모의 서버 초기화
+
+        Args:
+            address (tuple): (host, port)
+            latency_ms (float): 응답 전 평균 지연 시간 (밀리초)
+            latency_jitter_ms (float): 지연 시간의 무작위 변동 폭 (밀리초, ±)
+            error_rate (float): 503 응답 비율 (0~1)
+            rate_429 (float): 429 응답 비율 (0~1)
+            max_rps (float, optional): 최근 1초 동안 이보다 많이 요청하면 429 응답
+            result_size (int): 키워드별 전체 장소 수 (광고 제외)
+            page_size (int): 목록 페이지 하나의 장소 수 (광고 제외)
+            ad_every (int): 광고 항목을 끼워 넣는 간격 (0이면 광고 없음)
+            seed (int): 난수 시드
+        """
+        super().__init__(address, MockNaverRequestHandler)
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.max_rps = max_rps
+        self.result_size = result_size
+        self.page_size = page_size
+        self.ad_every = ad_every
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.recent_requests = deque()
+        self.started_at = time.time()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def decide_status(self):
+        """
+        이번 요청에 보낼 상태 코드 결정 (속도 초과 → 429 비율 → 오류 비율 순)
+
+        Returns:
+            int: 200, 429 또는 503
+        """
+        now = time.monotonic()
+        with self.lock:
+            self.recent_requests.append(now)
+            while self.recent_requests and now - self.recent_requests[0] > 1.0:
+                self.recent_requests.popleft()
+
+            if self.max_rps is not None and len(self.recent_requests) > self.max_rps:
+                return 429
+            roll = self.rng.random()
+            if roll < self.rate_429:
+                return 429
+            if roll < self.rate_429 + self.error_rate:
+                return 503
+            return 200
+
+    def delay(self):
+        """설정한 지연 시간만큼 대기"""
+        with self.lock:
+            jitter = self.rng.uniform(-self.latency_jitter_ms, self.latency_jitter_ms) if self.latency_jitter_ms else 0
+        seconds = max(self.latency_ms + jitter, 0) / 1000
+        if seconds:
+            time.sleep(seconds)
+
+    def record(self, path_kind, status):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats[f"{path_kind}_requests"] += 1
+            self.stats[f"status_{status}"] += 1
+
+    def get_stats(self):
+        """
+        요청 통계 조회
+
+        Returns:
+            dict: 요청 수, 페이지 종류별 요청 수, 상태 코드별 응답 수, 평균 초당 요청 수
+        """
+        with self.lock:
+            stats = dict(self.stats)
+        elapsed = time.time() - self.started_at
+        stats["uptime"] = elapsed
+        stats["avg_rps"] = stats.get("requests", 0) / elapsed if elapsed else 0.0
+        return stats
+
+@lru_cache(maxsize=1024)
+def _place_list_html(keyword, page, result_size, page_size, ad_every):
+    # 키워드마다 같은 결과 (같은 키워드를 다시 검색하면 같은 순위)
+    seed = sum(keyword.encode('utf-8'))
+    place_names = sample_place_names(result_size, seed=seed)[(page - 1) * page_size:page * page_size]
+    return build_place_list_html(place_names, ad_every=ad_every, seed=seed + page)
+
+class MockNaverRequestHandler(BaseHTTPRequestHandler):
+    """지도 검색 페이지, 목록 페이지, 통계 요청 처리"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+
+        if parts.path == "/stats":
+            self._send(200, json.dumps(self.server.get_stats(), ensure_ascii=False), "application/json")
+            return
+
+        if parts.path.startswith("/p/search/"):
+            kind = "search"
+            keyword = urllib.parse.unquote(parts.path[len("/p/search/"):])
+        elif parts.path == "/place/list":
+            kind = "list"
+            params = dict(urllib.parse.parse_qsl(parts.query))
+            keyword = params.get("query", "")
+            try:
+                page = max(int(params.get("page", 1)), 1)
+            except ValueError:
+                page = 1
+        else:
+            self.server.record("other", 404)
+            self._send(404, "Not Found")
+            return
+
+        self.server.delay()
+        status = self.server.decide_status()
+        self.server.record(kind, status)
+
+        if status == 429:
+            self._send(429, "Too Many Requests", headers={"Retry-After": "1"})
+        elif status != 200:
+            self._send(status, "Service Unavailable")
+        elif kind == "search":
+            self._send(200, build_map_search_html(default_iframe_src(keyword, base_url=self.server.base_url)))
+        else:
+            self._send(200, _place_list_html(keyword, page, self.server.result_size, self.server.page_size, self.server.ad_every))
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="업데이트 스크립트 부하 테스트용 네이버 모의 서버를 실행합니다.")
+    parser.add_argument("--host", default="127.0.0.1", help="접속을 받을 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="포트 (기본값: 8765)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="응답 전 평균 지연 시간 (밀리초, 기본값: 0)")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0, help="지연 시간 변동 폭 (밀리초, 기본값: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1, 기본값: 0)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="429 응답 비율 (0~1, 기본값: 0)")
+    parser.add_argument("--max-rps", type=float, default=None, help="최근 1초 동안 이보다 많이 요청하면 429 응답 (기본값: 제한 없음)")
+    parser.add_argument("--result-size", type=int, default=300, help="키워드별 전체 장소 수 (기본값: 300)")
+    parser.add_argument("--page-size", type=int, default=50, help="목록 페이지 하나의 장소 수 (기본값: 50)")
+    parser.add_argument("--ad-every", type=int, default=6, help="광고 항목 간격 (0이면 광고 없음, 기본값: 6)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (기본값: 0)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = MockNaverServer(
+        (args.host, args.port),
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        max_rps=args.max_rps,
+        result_size=args.result_size,
+        page_size=args.page_size,
+        ad_every=args.ad_every,
+        seed=args.seed
+    )
+    logger.info(f"네이버 모의 서버 시작: {server.base_url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"요청 통계: {server.get_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ import os
 import sys
 import logging
 import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # 모듈 경로 추가
@@ -17,7 +19,14 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from modules.search_engine import NaverPlaceSearchEngine
-from modules.data_manager import DataManager
+from modules.data_manager import create_data_manager
+from modules.rate_limiter import HostRateLimiter, AdaptiveHostRateLimiter, CircuitBreaker, RetryPolicy
+from modules.result_cache import ResultCache
+from modules.snapshot_store import SnapshotStore
+from modules.run_checkpoint import RunCheckpoint
+from modules.name_matcher import NameMatcher, MATCH_POLICIES
+from modules.shard_results import parse_shard, shard_of, ShardResultWriter, merge_shard_results
+from modules.update_scheduler import UpdateScheduler
 
 # 로깅 설정
 logging.basicConfig(
@@ -30,16 +39,133 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="등록된 업체와 키워드 조합의 순위를 검색하여 저장합니다.")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="동시에 실행할 키워드 검색 수 (기본값: 1)")
+    parser.add_argument("--rps", type=float, default=1 / 3,
+                        help="호스트별 초당 최대 요청 수 (기본값: 3초에 1회)")
+    parser.add_argument("--burst", type=int, default=1,
+                        help="호스트별로 몰아서 보낼 수 있는 최대 요청 수 (기본값: 1)")
+    parser.add_argument("--max-rps", type=float, default=None,
+                        help="응답이 정상일 때 늘릴 수 있는 호스트별 최대 초당 요청 수 (기본값: --rps)")
+    parser.add_argument("--min-rps", type=float, default=None,
+                        help="429/5xx 응답이나 느린 응답에 줄일 수 있는 최소 초당 요청 수 (기본값: --rps의 1/10)")
+    parser.add_argument("--fixed-rate", action="store_true",
+                        help="응답에 따라 요청 속도를 조절하지 않고 --rps로 고정")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="429/5xx 응답이나 연결 오류를 재시도할 최대 횟수 (기본값: 3)")
+    parser.add_argument("--breaker-threshold", type=int, default=5,
+                        help="호스트 요청을 잠시 멈추는 연속 실패 횟수 (기본값: 5)")
+    parser.add_argument("--breaker-reset", type=float, default=60,
+                        help="요청을 멈춘 호스트에 다시 시험 요청을 보내기까지의 시간 (초, 기본값: 60)")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default=None,
+                        help="저장소 종류 (기본값: RANK_TRACKER_BACKEND 환경 변수 또는 csv)")
+    parser.add_argument("--export-archive", action="store_true",
+                        help="실행이 끝나면 검색 기록을 월별 Parquet 보관소로 내보냄 (pyarrow 필요)")
+    parser.add_argument("--compact-history", action="store_true",
+                        help="실행이 끝나면 검색 기록을 순위가 바뀐 구간 단위로 압축 (CSV 저장소)")
+    parser.add_argument("--cache-ttl", type=float, default=0,
+                        help="이 시간(초) 안에 가져온 검색 결과가 캐시에 있으면 다시 요청하지 않음 (기본값: 0, 항상 새로 요청)")
+    parser.add_argument("--snapshots", action="store_true",
+                        help="가져온 목록 페이지 원본을 data/snapshots에 압축해서 보관")
+    parser.add_argument("--snapshot-max-mb", type=float, default=500,
+                        help="스냅샷 전체 크기 제한 (MB, 기본값: 500)")
+    parser.add_argument("--snapshot-max-days", type=float, default=30,
+                        help="스냅샷 보관 기간 (일, 기본값: 30)")
+    parser.add_argument("--flush-every", type=int, default=10,
+                        help="키워드 N개를 검색할 때마다 결과를 저장하고 체크포인트 갱신 (기본값: 10, 0이면 실행이 끝날 때 한 번에 저장)")
+    parser.add_argument("--run-date", default=None,
+                        help="체크포인트를 구분할 실행 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    parser.add_argument("--force", action="store_true",
+                        help="체크포인트를 무시하고 모든 조합을 다시 검색")
+    parser.add_argument("--max-pages", type=int, default=5,
+                        help="찾지 못한 업체가 있을 때 가져올 최대 목록 페이지 수 (기본값: 5)")
+    parser.add_argument("--match-policy", choices=MATCH_POLICIES, default="contains",
+                        help="상호명 일치 정책 (공백/대소문자/유니코드 표기를 정규화한 뒤 비교, 기본값: contains)")
+    parser.add_argument("--schedule", action="store_true",
+                        help="최근 순위 변동성과 우선순위로 정한 확인 간격이 지난 조합만 검색")
+    parser.add_argument("--min-interval", type=int, default=1,
+                        help="--schedule에서 가장 짧은 확인 간격 (일, 기본값: 1)")
+    parser.add_argument("--max-interval", type=int, default=7,
+                        help="--schedule에서 순위가 변하지 않는 조합의 확인 간격 (일, 기본값: 7)")
+    parser.add_argument("--priorities", default=None,
+                        help="company_id, keyword_id, priority(high/normal/low) 열을 가진 우선순위 CSV (기본값: 데이터 디렉토리의 priorities.csv)")
+    parser.add_argument("--budget", type=int, default=None,
+                        help="이번 실행에서 보낼 최대 요청 수 (키워드를 시작하기 전에만 확인하므로 진행 중인 검색 때문에 "
+                             "최대 동시 실행 × (최대 페이지 + 2) × (재시도 + 1)회까지 넘을 수 있음, 기본값: 제한 없음)")
+    parser.add_argument("--shard", default=None,
+                        help="키워드를 N개로 나눠 i번째만 검색하고 결과는 data/shards/에 따로 저장 (i/N 형식, 예: 2/4)")
+    parser.add_argument("--merge-shards", action="store_true",
+                        help="검색하지 않고 data/shards/의 샤드 결과를 저장소에 병합")
+    parser.add_argument("--data-dir", default=os.path.join(parent_dir, 'data'),
+                        help="데이터 디렉토리 (기본값: 저장소의 data 폴더)")
+    parser.add_argument("--map-base-url", default=None,
+                        help="지도 검색 페이지 주소 (기본값: RANK_TRACKER_MAP_BASE_URL 환경 변수 또는 네이버 지도)")
+    parser.add_argument("--place-base-url", default=None,
+                        help="목록 페이지 주소 (기본값: RANK_TRACKER_PLACE_BASE_URL 환경 변수 또는 네이버 플레이스)")
+    args = parser.parse_args(argv)
+    
+    if args.shard is not None:
+        try:
+            args.shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    return args
+
+def saved_result_keys(data_manager, shard_writer, pending):
+    """체크포인트의 저장 대기 결과 중 저장소에 이미 있는 (업체 ID, 키워드 ID, 검색 시간) 조합"""
+    if shard_writer is not None:
+        return shard_writer.saved_keys()
+    
+    search_times = [search_time for _, _, search_time in pending]
+    saved = data_manager.get_search_results(start_time=min(search_times), end_time=max(search_times))
+    return set(zip(saved['company_id'].astype(int), saved['keyword_id'].astype(int), saved['search_time'].astype(str)))
+
+def compact_history(data_manager):
+    """검색 기록 압축 (지원하지 않는 저장소면 경고만 남김)"""
+    try:
+        stats = data_manager.compact_history()
+    except NotImplementedError as e:
+        logger.warning(str(e))
+        return
+    logger.info(f"검색 기록 압축 완료: 기록 {stats['rows']}행 → 순위 구간 {stats['intervals']}행, 검색 {stats['checks']}행")
+
+def main(argv=None):
     """
     모든 등록된 업체와 키워드 조합에 대해 검색을 실행하고 결과를 저장합니다.
     """
+    args = parse_args(argv)
+    
     logger.info("자동 업데이트 시작")
     start_time = time.time()
     
     # 데이터 관리자 초기화
-    data_dir = os.path.join(parent_dir, 'data')
-    data_manager = DataManager(data_dir)
+    data_dir = args.data_dir
+    data_manager = create_data_manager(data_dir, args.backend)
+    shard_dir = os.path.join(data_dir, 'shards')
+    
+    if args.merge_shards:
+        run_started_at = datetime.now()
+        archive_was_fresh = args.export_archive and data_manager.is_history_archive_fresh()
+        stats = merge_shard_results(data_manager, shard_dir)
+        logger.info(f"샤드 결과 병합 완료: 파일 {stats['files']}개, 추가 {stats['added']}행, 중복 제외 {stats['duplicates']}행")
+        if args.compact_history:
+            compact_history(data_manager)
+        if args.export_archive:
+            # 샤드 결과는 병합하기 전 날짜(예: 지난달)에 검색한 것일 수 있으므로 가장 이른 검색 시간의 달부터 다시 내보냄
+            since = run_started_at.strftime('%Y-%m-%d %H:%M:%S')
+            if stats["first_time"] is not None:
+                since = min(since, stats["first_time"])
+            exported = data_manager.export_history_archive(since=since if archive_was_fresh else None)
+            logger.info(f"Parquet 보관소 내보내기 완료: {exported}행")
+        return
+    
+    # 보관소가 지금 최신이면 이번 실행에서 추가되는 달만 다시 내보내면 됨
+    run_started_at = datetime.now()
+    archive_was_fresh = args.export_archive and data_manager.is_history_archive_fresh()
     
     # 업체 및 키워드 목록 조회
     companies = data_manager.get_companies()
@@ -53,62 +179,230 @@ def main():
         logger.warning("등록된 키워드가 없습니다.")
         return
     
-    # 검색 엔진 초기화
-    search_engine = NaverPlaceSearchEngine(headless=True)
+    # 샤드 실행이면 이 샤드에 속한 키워드만 검색하고 결과는 샤드 파일에 저장
+    run_date = args.run_date or datetime.now().strftime('%Y-%m-%d')
+    shard_writer = None
+    if args.shard is not None:
+        shard_index, shard_count = args.shard
+        keywords = keywords[[shard_of(text, shard_count) == shard_index for text in keywords['text']]]
+        shard_writer = ShardResultWriter(shard_dir, run_date, shard_index, shard_count)
+        logger.info(f"샤드 {shard_index}/{shard_count}: 키워드 {len(keywords)}개, 결과 파일 {shard_writer.path}")
+        
+        if keywords.empty:
+            logger.warning("이 샤드에 속한 키워드가 없습니다.")
+            return
     
-    # 모든 조합에 대해 검색 실행
-    total_combinations = len(companies) * len(keywords)
+    # 확인할 조합 결정 (스케줄을 쓰면 확인 간격이 지난 조합이 있는 키워드만, 급한 키워드부터)
+    company_ids = companies['id'].tolist()
+    companies_by_id = companies.set_index('id')
+    if args.schedule:
+        scheduler = UpdateScheduler(
+            min_interval=args.min_interval,
+            max_interval=args.max_interval,
+            priorities=UpdateScheduler.load_priorities(args.priorities or os.path.join(data_dir, 'priorities.csv'))
+        )
+        history = data_manager.get_search_results(start_time=scheduler.history_start(run_date))
+        due = scheduler.plan(history, company_ids, keywords['id'].tolist(), run_date)
+        # 요청은 키워드 단위이므로 검색하는 키워드는 추가 요청 없이 모든 업체의 순위를 함께 기록
+        due_keyword_ids = list(dict.fromkeys(entry["keyword_id"] for entry in due))
+        keywords_by_id = keywords.set_index('id', drop=False)
+        scheduled = [(keywords_by_id.loc[keyword_id], company_ids) for keyword_id in due_keyword_ids]
+        if due:
+            logger.info(f"확인할 때가 된 조합 {len(due)}개가 있는 키워드 {len(scheduled)}개를 검색해서 조합 {len(scheduled) * len(company_ids)}개를 기록합니다.")
+    else:
+        scheduled = [(keyword, company_ids) for _, keyword in keywords.iterrows()]
+    
+    # 키워드별로 한 번만 검색하여 해당 업체들의 순위 확인
+    total_combinations = sum(len(ids) for _, ids in scheduled)
     completed = 0
     success = 0
     failed = 0
+    deferred = 0
+    
+    if total_combinations == 0:
+        logger.info("확인할 때가 된 조합이 없습니다.")
+        return
+    
+    # 검색 엔진 초기화 (네이버 서버 부하 방지를 위해 호스트별 요청 속도 제한)
+    concurrency = max(args.concurrency, 1)
+    if args.fixed_rate:
+        rate_limiter = HostRateLimiter(args.rps, args.burst)
+    else:
+        rate_limiter = AdaptiveHostRateLimiter(args.rps, args.burst, min_rate=args.min_rps, max_rate=args.max_rps)
+    search_engine = NaverPlaceSearchEngine(
+        headless=True,
+        pool_maxsize=max(10, concurrency),
+        rate_limiter=rate_limiter,
+        state_file=os.path.join(data_dir, 'search_engine_state.json'),
+        cache=ResultCache(os.path.join(data_dir, 'cache', 'results'), ttl=args.cache_ttl),
+        snapshot_store=SnapshotStore(
+            os.path.join(data_dir, 'snapshots'),
+            max_bytes=int(args.snapshot_max_mb * 1024 * 1024),
+            max_age_days=args.snapshot_max_days
+        ) if args.snapshots else None,
+        map_base_url=args.map_base_url,
+        place_base_url=args.place_base_url,
+        retry_policy=RetryPolicy(max_retries=args.retries),
+        circuit_breaker=CircuitBreaker(args.breaker_threshold, args.breaker_reset),
+        max_pages=args.max_pages,
+        name_matcher=NameMatcher(companies['name'].tolist(), policy=args.match_policy)
+    )
+    
+    logger.info(f"총 {total_combinations}개의 검색 조합이 있습니다. (키워드 {len(scheduled)}개 검색, 동시 실행 {concurrency}, 호스트별 초당 {args.rps:.2f}회)")
+    if args.budget is not None:
+        # 예산은 키워드를 시작하기 전에만 확인하므로 동시에 진행 중인 검색만큼 넘을 수 있음
+        overshoot = concurrency * (args.max_pages + 2) * (args.retries + 1)
+        logger.info(f"요청 예산: {args.budget}회 (진행 중인 검색 때문에 최대 {overshoot}회까지 넘을 수 있음)")
+    
+    # 같은 날짜에 이미 저장한 조합은 건너뜀 (중단된 실행 재개)
+    checkpoint = RunCheckpoint(
+        os.path.join(data_dir, 'checkpoints'),
+        run_date,
+        keep=7 * args.shard[1] if args.shard else 7,
+        suffix=f"_shard{args.shard[0]}of{args.shard[1]}" if args.shard else ""
+    )
+    if args.force:
+        checkpoint.reset()
+    else:
+        if checkpoint.pending:
+            # 저장한 뒤 완료로 기록하기 전에 중단된 결과는 다시 검색하지 않음
+            recovered = checkpoint.resolve_pending(saved_result_keys(data_manager, shard_writer, checkpoint.pending))
+            logger.info(f"체크포인트의 저장 대기 결과 중 {recovered}건은 이미 저장되어 완료로 기록했습니다.")
+        if checkpoint.completed_count():
+            logger.info(f"체크포인트({checkpoint.run_date})에서 재개: 이미 저장한 조합 {checkpoint.completed_count()}개 건너뜀")
     
-    logger.info(f"총 {total_combinations}개의 검색 조합이 있습니다.")
+    work = []
+    for keyword, ids in scheduled:
+        remaining_ids = checkpoint.remaining_companies(keyword['id'], ids)
+        completed += len(ids) - len(remaining_ids)
+        if remaining_ids:
+            work.append((keyword, remaining_ids))
     
-    for _, company in companies.iterrows():
-        company_id = company['id']
-        company_name = company['name']
+    # 결과는 버퍼에 모아 두었다가 저장하고, 저장한 조합만 체크포인트에 기록
+    pending_records = []
+    searched_keywords = 0
+    
+    def flush_results():
+        if pending_records:
+            # 저장할 결과를 먼저 체크포인트에 기록해서, 저장한 뒤 완료로 기록하기 전에 중단되어도 다시 저장하지 않게 함
+            checkpoint.begin(pending_records)
+            if shard_writer is not None:
+                shard_writer.append(pending_records)
+            else:
+                data_manager.add_search_results(pending_records)
+            checkpoint.mark_done(pending_records)
+            logger.info(f"검색 결과 {len(pending_records)}건 저장")
+            pending_records.clear()
+    
+    def search_keyword(keyword_text, shop_names):
+        # 요청 예산을 다 쓰면 남은 키워드는 검색하지 않음 (이미 시작한 검색은 끝까지 진행)
+        if args.budget is not None and search_engine.get_request_stats().get("attempts", 0) >= args.budget:
+            return None
+        logger.info(f"검색 중: '{keyword_text}'에서 업체 {len(shop_names)}개")
+        return search_engine.search_many(keyword_text, shop_names)
+    
+    # 검색은 스레드 풀에서 동시에 실행하고, 결과 저장은 메인 스레드에서만 수행
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(
+                search_keyword,
+                keyword['text'],
+                companies_by_id.loc[remaining_ids, 'name'].tolist()
+            ): (keyword, remaining_ids)
+            for keyword, remaining_ids in work
+        }
         
-        for _, keyword in keywords.iterrows():
+        for future in as_completed(futures):
+            keyword, remaining_ids = futures[future]
             keyword_id = keyword['id']
-            keyword_text = keyword['text']
-            
-            logger.info(f"검색 중: '{keyword_text}'에서 '{company_name}'")
             
             try:
-                # 검색 실행
-                result = search_engine.search(keyword_text, company_name)
+                results = future.result()
+            except Exception as e:
+                logger.error(f"오류 발생: {type(e).__name__} - {e}")
+                failed += len(remaining_ids)
+                completed += len(remaining_ids)
+                continue
+            
+            if results is None:
+                deferred += len(remaining_ids)
+                continue
+            
+            for company_id in remaining_ids:
+                company = companies_by_id.loc[company_id]
+                result = results[company['name']]
                 
-                # 검색 결과 저장
+                # 검색 결과 버퍼에 추가
                 if result["success"]:
-                    data_manager.add_search_result(
-                        company_id=company_id,
-                        keyword_id=keyword_id,
-                        rank=result["rank"],
-                        search_time=result["search_time"]
-                    )
+                    pending_records.append({
+                        "company_id": company_id,
+                        "keyword_id": keyword_id,
+                        "rank": result["rank"],
+                        "search_time": result["search_time"]
+                    })
                     logger.info(f"검색 성공: {result['message']}")
                     success += 1
+                elif result["fetch_failed"]:
+                    # 검색 결과 페이지를 가져오지 못한 경우는 순위 기록으로 남기지 않음
+                    logger.warning(f"검색 실패 (저장하지 않음): {result['message']}")
+                    failed += 1
                 else:
                     logger.warning(f"검색 실패: {result['message']}")
                     # 순위를 찾지 못한 경우에도 결과 저장 (-1로 표시)
-                    data_manager.add_search_result(
-                        company_id=company_id,
-                        keyword_id=keyword_id,
-                        rank=-1,
-                        search_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    )
+                    pending_records.append({
+                        "company_id": company_id,
+                        "keyword_id": keyword_id,
+                        "rank": -1,
+                        "search_time": result["search_time"]
+                    })
                     failed += 1
                 
-            except Exception as e:
-                logger.error(f"오류 발생: {type(e).__name__} - {e}")
-                failed += 1
+                # 진행 상황 업데이트
+                completed += 1
             
-            # 진행 상황 업데이트
-            completed += 1
             logger.info(f"진행 상황: {completed}/{total_combinations} ({completed/total_combinations*100:.1f}%)")
             
-            # 네이버 서버 부하 방지를 위한 딜레이
-            time.sleep(3)
+            searched_keywords += 1
+            if args.flush_every > 0 and searched_keywords % args.flush_every == 0:
+                flush_results()
+    
+    flush_results()
+    checkpoint.prune()
+    
+    if deferred:
+        logger.info(f"요청 예산({args.budget}회)을 넘어 {deferred}개 조합을 다음 실행으로 미뤘습니다.")
+    
+    if args.compact_history and shard_writer is None:
+        compact_history(data_manager)
+    
+    if args.export_archive and shard_writer is not None:
+        logger.info("샤드 실행에서는 Parquet 보관소를 내보내지 않습니다. (--merge-shards --export-archive로 병합 후 내보내기)")
+    elif args.export_archive:
+        exported = data_manager.export_history_archive(since=run_started_at if archive_was_fresh else None)
+        logger.info(f"Parquet 보관소 내보내기 완료: {exported}행")
+    
+    if search_engine.snapshot_store is not None:
+        search_engine.snapshot_store.apply_retention()
+    
+    # 커넥션 재사용 통계
+    connection_stats = search_engine.get_connection_stats()
+    selector_stats = search_engine.get_selector_stats()
+    search_engine.close()
+    logger.info(f"HTTP 요청: {connection_stats['requests']}, 새 연결: {connection_stats['new_connections']}, 재사용: {connection_stats['reused_connections']}")
+    request_stats = search_engine.get_request_stats()
+    logger.info(f"재시도: {request_stats.get('retries', 0)}, 회로 차단으로 보내지 않은 요청: {request_stats.get('circuit_open', 0)}, 429 응답: {request_stats.get('status_429', 0)}")
+    for host, stats in rate_limiter.get_stats().items():
+        logger.info(f"요청 속도 ({host}): 초당 {stats['rate']:.2f}회" + (f" (늘림 {stats['increases']}, 줄임 {stats['decreases']})" if 'decreases' in stats else ""))
+    for host, stats in search_engine.circuit_breaker.get_stats().items():
+        if stats['opens']:
+            logger.info(f"회로 차단 ({host}): {stats['opens']}회, 현재 {stats['state']}")
+    for kind, stats in search_engine.get_parse_stats().items():
+        logger.info(f"파싱 ({kind}): {stats['pages']}페이지, 평균 {stats['avg_time'] * 1000:.1f}ms, 최대 {stats['max_time'] * 1000:.1f}ms")
+    cache_stats = search_engine.cache.get_stats()
+    logger.info(f"검색 결과 캐시: 적중 {cache_stats['hits']}, 미스 {cache_stats['misses']}")
+    for name, stats in selector_stats.items():
+        dead = [stat['selector'] for stat in stats if stat['tries'] > 0 and stat['hits'] == 0]
+        logger.info(f"선택자 ({name}): 우선 '{stats[0]['selector']}', 적중 없음 {len(dead)}/{len(stats)}개")
     
     # 결과 요약
     elapsed_time = time.time() - start_time
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pandas as pd
+
+# 모듈 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.history_compaction import compact_results, expand_results, RESULT_COLUMNS
+
+def make_results(rows):
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+def assert_round_trip(results):
+    intervals, checks = compact_results(results)
+    expanded = expand_results(intervals, checks)
+    expected = results.sort_values('id', kind='stable').reset_index(drop=True)
+    pd.testing.assert_frame_equal(expanded, expected, check_dtype=False)
+    return intervals, checks
+
+def test_round_trip_merges_unchanged_ranks():
+    results = make_results([
+        (1, 1, 1, 3, '2024-01-01 09:00:00'),
+        (2, 2, 1, -1, '2024-01-01 09:00:00'),
+        (3, 1, 1, 3, '2024-01-02 09:00:00'),
+        (4, 2, 1, 7, '2024-01-02 09:00:00'),
+        (5, 1, 2, 1, '2024-01-02 09:05:00'),
+        (6, 1, 1, 3, '2024-01-03 09:00:00'),
+        (7, 2, 1, 7, '2024-01-03 09:00:00'),
+        (8, 1, 1, 4, '2024-01-04 09:00:00'),
+    ])
+
+    intervals, checks = assert_round_trip(results)
+
+    assert len(intervals) == 5
+    assert len(checks) == 5
+
+def test_round_trip_same_search_time_keeps_each_rank():
+    # 같은 조합을 같은 시각에 두 번 검색해서 순위가 다른 경우
+    results = make_results([
+        (1, 1, 1, 5, '2024-01-01 09:00:00'),
+        (2, 1, 1, 9, '2024-01-01 09:00:00'),
+        (3, 1, 1, 5, '2024-01-01 09:00:00'),
+        (4, 1, 1, 9, '2024-01-02 09:00:00'),
+    ])
+
+    assert_round_trip(results)
+
+def test_round_trip_ids_out_of_time_order():
+    # 샤드 병합 등으로 ID 순서와 검색 시각 순서가 다른 경우
+    results = make_results([
+        (1, 1, 1, 2, '2024-01-02 09:00:00'),
+        (2, 1, 1, 8, '2024-01-01 09:00:00'),
+        (3, 1, 1, 2, '2024-01-03 09:00:00'),
+        (4, 1, 1, 8, '2024-01-02 09:00:00'),
+    ])
+
+    assert_round_trip(results)
+
+def test_empty_results():
+    intervals, checks = compact_results(make_results([]))
+
+    assert expand_results(intervals, checks).empty